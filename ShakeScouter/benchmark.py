@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import cv2 as cv
+import numpy as np
+
+from argparse import ArgumentParser
+from time import perf_counter
+from timeit import repeat
+from typing import Any, Awaitable, Callable
+
+from ShakeScouter.utils import forceCwd
+from ShakeScouter.utils.images import detectBbox
+
+# Set current working directory.
+forceCwd(__file__)
+
+def measure(name: str, fn: Callable[[], Any], number: int) -> float:
+	# Take best of 5 to reduce noise
+	elapsed = min(repeat(fn, number=number, repeat=5)) / number
+	print(f'{name:<40} {1000000 * elapsed:10.2f} us')
+	return elapsed
+
+def measureAsync(name: str, fn: Callable[[], Awaitable[Any]], number: int) -> float:
+	from anyio import run
+
+	async def loop() -> float:
+		start = perf_counter()
+		for _ in range(number):
+			await fn()
+		return perf_counter() - start
+
+	# Take best of 5 to reduce noise
+	elapsed = min(run(loop) for _ in range(5)) / number
+	print(f'{name:<40} {1000000 * elapsed:10.2f} us')
+	return elapsed
+
+def createDigitImages() -> list[np.ndarray]:
+	images: list[np.ndarray] = []
+	for value in [0, 7, 42, 88, 100, 256, 999]:
+		image = np.zeros((60, 120), dtype=np.uint8)
+		cv.putText(image, str(value), (4, 52), cv.FONT_HERSHEY_SIMPLEX, 1.8, 255, 5)
+		images.append(image)
+	return images
+
+def benchBbox(args):
+	images = createDigitImages()
+
+	def contours():
+		for image in images:
+			detectBbox(image, 36)
+
+	print(f'detectBbox ({len(images)} images)')
+	measure('findContours', contours, args.number)
+
+def benchNormalize(args):
+	import torch
+
+	from ShakeScouter.recognizers.digit.normalize import DigitNormalizer, normalizeDigitImage
+
+	images = createDigitImages()
+	items = [(image, detectBbox(image, 36)) for image in images]
+	normalizer = DigitNormalizer()
+
+	def each():
+		torch.stack([
+			normalizeDigitImage(image[y:y + height, x:x + width]).unsqueeze(0)
+			for image, bboxes in items
+			for x, y, width, height in bboxes
+		])
+
+	def batch():
+		normalizer.normalize(items)
+
+	print(f'Digit normalization ({sum(len(b) for _, b in items)} glyphs)')
+	measure('normalizeDigitImage + torch.stack', each, args.number)
+	measure('DigitNormalizer', batch, args.number)
+
+def benchScript(args):
+	import torch
+
+	from io import BytesIO
+
+	from ShakeScouter.constants import env
+	from ShakeScouter.recognizers.digit.cnn import DigitCNN
+	from ShakeScouter.recognizers.digit.script import loadScript, saveScript
+
+	def loadEager():
+		model = DigitCNN()
+		model.load_state_dict(torch.load(env.DIGIT_MODEL_PATH, map_location='cpu'))
+		model.eval()
+		return model
+
+	buffer = BytesIO()
+	model = loadEager()
+	saveScript(model, buffer)
+
+	def loadScripted():
+		buffer.seek(0)
+		return loadScript(buffer)
+
+	scripted = loadScripted()
+
+	print('Digit model load')
+	measure('DigitCNN + load_state_dict', loadEager, max(1, args.number // 100))
+	measure('torch.jit.load (frozen)', loadScripted, max(1, args.number // 100))
+
+	for batchSize in [1, 3]:
+		inputs = torch.zeros(batchSize, 1, env.DIGIT_HEIGHT, env.DIGIT_WIDTH)
+		print(f'Digit model forward ({batchSize} glyphs)')
+		with torch.no_grad():
+			measure('eager', lambda: model(inputs), args.number)
+			measure('frozen', lambda: scripted(inputs), args.number)
+
+def benchParallel(args):
+	import torch
+
+	from os import cpu_count
+
+	from ShakeScouter.constants import assets, screen
+	from ShakeScouter.recognizers.digit import DigitReader
+	from ShakeScouter.scenes import Scene, SceneStatus
+	from ShakeScouter.scenes.contexttest import TestSceneContext
+	from ShakeScouter.scenes.utils import Parallel
+	from ShakeScouter.utils.executor import analysisExecutor, runAnalysis
+	from ShakeScouter.utils.images import errorMAE, Frame, getMinErrorKey
+
+	class WorkScene(Scene):
+		def __init__(self, fn: Callable[[Frame], Any]) -> None:
+			self.__fn = fn
+
+		async def analysis(self, context, data, frame):
+			await runAnalysis(self.__fn, frame)
+			return SceneStatus.FALSE
+
+	# Random 1080p frame with blank templates
+	rng = np.random.default_rng(0)
+	frame = Frame(raw=rng.integers(0, 256, (1080, 1920, 3), dtype=np.uint8))
+	reader = DigitReader(torch.device('cpu'))
+	digitImage = createDigitImages()[-1]
+	kingTemplates = {
+		key: np.zeros_like(frame.apply(screen.KING_NAME_PART))
+		for key in assets.kingKeys
+	}
+	unstableTemplate = np.zeros_like(frame.apply(screen.UNSTABLE_PART))
+
+	def wave(frame: Frame):
+		# Similar to the per-frame work of WaveScene
+		reader.read(digitImage)
+		frame.apply(screen.PLAYERS_PART)
+		errorMAE(frame.apply(screen.UNSTABLE_PART), unstableTemplate)
+
+	def king(frame: Frame):
+		getMinErrorKey(frame.apply(screen.KING_NAME_PART), kingTemplates, 0.1)
+
+	context = TestSceneContext()
+	print(f'Parallel (wave + king, {cpu_count()} cores, {analysisExecutor.workers} workers)')
+	for concurrent in [False, True]:
+		scene = Parallel([WorkScene(wave), WorkScene(king)], concurrent=concurrent)
+		data = scene.setup()
+		measureAsync('concurrent' if concurrent else 'sequential', lambda: scene.analysis(context, data, frame), args.number)
+
+def benchScenes(args):
+	from ShakeScouter.scenes import Scene, SceneStatus
+	from ShakeScouter.scenes.contexttest import ReplaySceneContext
+	from ShakeScouter.scenes.utils import Drop, Parallel, PriorityParallel, Root, Sequential
+	from ShakeScouter.scenes.utils.test import TestScene
+
+	def leaf() -> Scene:
+		return TestScene(SceneStatus.FALSE)
+
+	def pipeline() -> Scene:
+		# Same shape as getDefaultPipeline
+		return Root(Sequential([
+			Drop(TestScene(SceneStatus.DONE), rate=2),
+			PriorityParallel([
+				(0, Drop(leaf(), rate=2)),
+				(1, Parallel([Drop(leaf(), rate=2), Drop(leaf(), rate=0.5)])),
+				(2, Drop(Parallel([leaf(), leaf()], anyDone=True), rate=1)),
+			]),
+		]))
+
+	def deep(depth: int) -> Scene:
+		# 6^depth leaves, all of them run on every frame at 60 fps
+		if depth == 0:
+			return leaf()
+		return PriorityParallel([
+			(p, Parallel([Drop(deep(depth - 1), rate=60), Sequential([deep(depth - 1)])]))
+			for p in range(3)
+		])
+
+	def tiers(count: int) -> Scene:
+		# Lower tiers are done after the first frame
+		return PriorityParallel([
+			*[(p, TestScene(SceneStatus.DONE)) for p in range(count - 1)],
+			(count - 1, leaf()),
+		])
+
+	print('Scene combinators per frame (no-op leaves)')
+	for name, factory in [
+		('default pipeline', pipeline),
+		('deep tree (216 leaves)', lambda: Root(deep(3))),
+		('priority tiers (32 tiers)', lambda: tiers(32)),
+	]:
+		scene = factory()
+		context = ReplaySceneContext()
+		data = scene.setup()
+		measureAsync(name, lambda: scene.analysis(context, data, None), args.number)
+
+def benchSchedule(args):
+	from anyio import run
+	from ShakeScouter.scenes import Scene, SceneStatus
+	from ShakeScouter.scenes.contexttest import ReplaySceneContext
+	from ShakeScouter.scenes.utils import Drop, DropScheduler, Parallel, PriorityParallel, Root
+
+	class Clock:
+		now = 0.0
+
+		def __call__(self) -> float:
+			return self.now
+
+	class CostScene(Scene):
+		def __init__(self, clock: Clock, cost: float) -> None:
+			self.__clock = clock
+			self.__cost  = cost
+
+		async def analysis(self, context, data, frame):
+			self.__clock.now += self.__cost
+			return SceneStatus.FALSE
+
+	def core(clock: Clock, slow: float) -> Scene:
+		# Same rates as getCorePipeline with simulated costs
+		return PriorityParallel([
+			(0, Drop(CostScene(clock, 0.002 * slow), rate=2)),
+			(1, Parallel([Drop(CostScene(clock, 0.008 * slow), rate=2), Drop(CostScene(clock, 0.004 * slow), rate=0.5)])),
+			(2, Drop(Parallel([CostScene(clock, 0.003 * slow), CostScene(clock, 0.001 * slow)], anyDone=True), rate=1)),
+		])
+
+	print('Simulated work per frame (30 fps, 10 minutes)')
+	for name, factory in [
+		('drop', lambda clock: Root(core(clock, 1))),
+		('scheduler', lambda clock: Root(DropScheduler(core(clock, 1), budget=0.008, clock=clock))),
+		('drop, 20x slower', lambda clock: Root(core(clock, 20))),
+		('scheduler, 20x slower', lambda clock: Root(DropScheduler(core(clock, 20), budget=0.008, maxLoad=0.25, clock=clock))),
+	]:
+		clock = Clock()
+		scene = factory(clock)
+		context = ReplaySceneContext(interval=1 / 30)
+		data = scene.setup()
+
+		async def loop() -> list[float]:
+			costs: list[float] = []
+			for _ in range(30 * 600):
+				start = clock.now
+				await scene.analysis(context, data, None)
+				costs.append(clock.now - start)
+			return costs
+
+		costs = np.array(run(loop))
+		busy = costs[costs > 0]
+		print(f'{name:<24} max {1000 * costs.max():6.1f} ms, p99 {1000 * np.percentile(costs, 99):6.1f} ms, mean {1000 * costs.mean():6.2f} ms, busy frames {len(busy) / len(costs):6.1%}, load {30 * costs.mean():6.1%}')
+
+BENCHMARKS: dict[str, Callable[[Any], None]] = {
+	'bbox': benchBbox,
+	'normalize': benchNormalize,
+	'parallel': benchParallel,
+	'scenes': benchScenes,
+	'schedule': benchSchedule,
+	'script': benchScript,
+}
+
+def main(args):
+	for target in args.targets or BENCHMARKS.keys():
+		BENCHMARKS[target](args)
+		print()
+
+if __name__ == '__main__':
+	parser = ArgumentParser()
+	parser.add_argument('targets', type=str, metavar='TARGET', nargs='*', help=f'Specify the benchmarks to run. Available options are {", ".join(BENCHMARKS.keys())}. All benchmarks run by default.')
+	parser.add_argument('-n', '--number', type=int, default=1000, metavar='NUMBER', help='Specify the number of iterations.')
+
+	args = parser.parse_args()
+
+	# Check targets
+	for target in args.targets:
+		if target not in BENCHMARKS:
+			parser.error(f'invalid target: {target}')
+
+	main(args)
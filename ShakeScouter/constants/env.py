@@ -8,7 +8,10 @@ TELEMETRY_PATH = str(Path(__file__).resolve().parents[2] / '.telemetry' / '{}.js
 
 PACKAGE_ROOT = Path(__file__).resolve().parent.parent
 TEMPLATE_DIR = PACKAGE_ROOT / 'templates'
+TEMPLATE_BUNDLE_PATH = TEMPLATE_DIR / 'templates.bin'
+TEMPLATE_MANIFEST_PATH = TEMPLATE_DIR / 'manifest.json'
 MODELS_DIR = PACKAGE_ROOT / 'models'
+PIPELINES_DIR = PACKAGE_ROOT / 'pipelines'
 
 
 def template_path(name: str) -> Path:
@@ -18,8 +21,14 @@ def template_path(name: str) -> Path:
 DIGIT_WIDTH      = 16
 DIGIT_HEIGHT     = 20
 DIGIT_MODEL_PATH = MODELS_DIR / 'digit-64-9873.pth'
+DIGIT_QUANT_MODEL_PATH = MODELS_DIR / 'digit-64-9873-int8.pth'
+
+# Pipeline Environment Values
+DEFAULT_PIPELINE_PATH    = PIPELINES_DIR / 'default.json'
+WAVE_DEBUG_PIPELINE_PATH = PIPELINES_DIR / 'wave_debug.json'
 
 # Development Environment Values
 DEV_ASSET_PATH       = '../.dev/{}.png'
 DEV_DIGIT_DATA_PATH  = MODELS_DIR / 'dataset.json'
 DEV_DIGIT_MODEL_PATH = MODELS_DIR / 'digit-dev.pth'
+DEV_DIGIT_CACHE_DIR  = PACKAGE_ROOT.parent / '.cache' / 'digits'
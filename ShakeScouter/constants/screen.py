@@ -99,7 +99,9 @@ WAVE_PART = PartInfo(
 )
 
 def removeNumberAreaFromWaveImage(waveImage: NDArray[np.uint8]) -> NDArray[np.uint8]:
-	return waveImage[:, :-72]
+	# The number area is 72px of 200px at 1080p
+	numberWidth = round(72 * waveImage.shape[1] / 200)
+	return waveImage[:, :-numberWidth]
 
 # Timer Counter in Game
 TIMER_PART = PartInfo(
@@ -274,3 +276,23 @@ ERROR_PART = PartInfo(
 		),
 	],
 )
+
+# All parts analyzed in scenes
+ALL_PARTS = [
+	MESSAGE_PART,
+	LOGO_PART,
+	STAGE_NAME_PART,
+	KING_NAME_PART,
+	WAVE_PART,
+	TIMER_PART,
+	AMOUNT_PART,
+	QUOTA_PART,
+	PLAYERS_PART,
+	SIGNAL_PART,
+	GEGG_PART,
+	PEGG_PART,
+	WAVE1_PART,
+	GRIZZ_PART,
+	UNSTABLE_PART,
+	ERROR_PART,
+]
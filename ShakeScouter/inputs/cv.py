@@ -2,51 +2,147 @@
 # Licensed under the GPLv3 license.
 
 import cv2 as cv
+import numpy as np
 
-from anyio import sleep
+from anyio import create_memory_object_stream, create_task_group, sleep, to_thread
+from anyio.streams.memory import MemoryObjectSendStream
 from logging import getLogger
-from typing import Awaitable, Callable
+from numpy.typing import NDArray
+from time import perf_counter
+from typing import Awaitable, Callable, Optional
 
+from ShakeScouter.constants import screen
 from ShakeScouter.inputs.input import Input
-from ShakeScouter.utils.images import Frame
+from ShakeScouter.utils.executor import runAnalysis
+from ShakeScouter.utils.images import Frame, FrameCropper
+from ShakeScouter.utils.images.yuv import YUVCropper, YUVFormat, YUVFrame
 
 # Set up logger
 logger = getLogger(__name__)
 
 class CVInput(Input):
+	REPORT_INTERVAL = 300
+
 	def __init__(self, args) -> None:
 		self.__device = args.input
 		self.__width  = args.width
 		self.__height = args.height
+		self.__crop   = args.crop
+		self.__yuv    = None if args.yuv is None else YUVFormat(args.yuv)
+		self.__dev    = args.development
+		self.__videoCapture: Optional[cv.VideoCapture] = None
 
-	async def run(self, callback: Callable[[Frame], Awaitable[bool]]) -> None:
+	@staticmethod
+	async def __capture(
+		device: cv.VideoCapture,
+		cropper: Optional[FrameCropper | YUVCropper],
+		stream: MemoryObjectSendStream[tuple[Frame, NDArray[np.uint8]]],
+	) -> None:
+		buffer = None
+
+		def read() -> tuple[Optional[Frame], NDArray[np.uint8]]:
+			nonlocal buffer
+			if cropper is None:
+				ret, image = device.read()
+			else:
+				# Reuse decode buffer (tiles are copied by cropper)
+				ret, buffer = device.read(buffer)
+				image = buffer
+			if not ret:
+				return None, image
+
+			frame = Frame(raw=image) if cropper is None else cropper.crop(image)
+			return frame, image
+
+		with stream:
+			while device.isOpened():
+				# Decode off the event loop (VideoCapture releases the GIL)
+				frame, image = await runAnalysis(read)
+				if frame is None:
+					break
+				await stream.send((frame, image))
+
+	def __open(self) -> cv.VideoCapture:
 		device = cv.VideoCapture(self.__device)
+		if not device.isOpened():
+			return device
+
+		device.set(cv.CAP_PROP_FRAME_WIDTH,  self.__width)
+		device.set(cv.CAP_PROP_FRAME_HEIGHT, self.__height)
+
+		# Keep raw YUV buffer instead of converting whole frame to BGR
+		if self.__yuv is not None:
+			device.set(cv.CAP_PROP_FOURCC, self.__yuv.fourcc)
+			device.set(cv.CAP_PROP_CONVERT_RGB, 0)
+		return device
+
+	async def open(self) -> None:
+		# Open device off the event loop while other startup tasks run
+		self.__videoCapture = await to_thread.run_sync(self.__open)
+
+	async def run(self, callback: Callable[[Frame], Awaitable[bool]]) -> None:
+		device = self.__open() if self.__videoCapture is None else self.__videoCapture
+		self.__videoCapture = None
 
 		if not device.isOpened():
 			logger.warn('Could not open video capture device.')
 			return
 
-		device.set(cv.CAP_PROP_FRAME_WIDTH,  self.__width)
-		device.set(cv.CAP_PROP_FRAME_HEIGHT, self.__height)
+		width  = int(device.get(cv.CAP_PROP_FRAME_WIDTH))
+		height = int(device.get(cv.CAP_PROP_FRAME_HEIGHT))
+
+		# Crop HUD regions only right after decode
+		cropper: Optional[FrameCropper | YUVCropper] = None
+		if self.__yuv is not None:
+			# Always per-part tiles, or the first color read converts the whole frame
+			cropper = YUVCropper(screen.ALL_PARTS, width, height, self.__yuv)
+			logger.info(f'Keep {len(cropper.rects)} YUV tiles')
+		elif self.__crop:
+			cropper = FrameCropper(screen.ALL_PARTS, width, height)
+			logger.info(f'Crop {len(cropper.rects)} tiles ({100 * cropper.area / (width * height):.1f}% of frame)')
+
+		# Conversion time of whole frame (YUV only)
+		fullElapsed: Optional[float] = None
+		totalElapsed = 0.0
+		yuvFrames    = 0
 
 		try:
-			# frameCount = 0
-			# startTime = cv.getTickCount()
-			while device.isOpened():
-				ret, image = device.read()
-				if ret:
-					frame = Frame(raw=image)
-					result = await callback(frame)
-					if result:
-						break
-					await sleep(0)
-				else:
-					break
+			# Capture frame N + 1 while frame N is being analyzed
+			sendStream, receiveStream = create_memory_object_stream[tuple[Frame, NDArray[np.uint8]]]()
+			async with create_task_group() as tg:
+				tg.start_soon(CVInput.__capture, device, cropper, sendStream)
+
+				# frameCount = 0
+				# startTime = cv.getTickCount()
+				with receiveStream:
+					async for frame, image in receiveStream:
+						result = await callback(frame)
+
+						# Report conversion time saved per frame
+						if self.__dev and isinstance(frame, YUVFrame) and isinstance(cropper, YUVCropper):
+							if fullElapsed is None:
+								start = perf_counter()
+								cropper.convert(image)
+								fullElapsed = perf_counter() - start
+
+							yuvFrames    += 1
+							totalElapsed += frame.elapsed
+							if yuvFrames >= CVInput.REPORT_INTERVAL:
+								elapsed = totalElapsed / yuvFrames
+								logger.info(f'YUV conversion: {1000 * elapsed:.3f} ms/frame (full frame: {1000 * fullElapsed:.3f} ms, saved: {1000 * (fullElapsed - elapsed):.3f} ms)')
+								totalElapsed = 0.0
+								yuvFrames    = 0
+
+						if result:
+							# Stop capture before closing the stream
+							tg.cancel_scope.cancel()
+							break
+						await sleep(0)
 
-				# frameCount += 1
-				# currentTime = cv.getTickCount()
-				# elapsedTime = (currentTime - startTime) / cv.getTickFrequency()
-				# framerate = frameCount / elapsedTime
-				# print('FPS:', framerate)
+						# frameCount += 1
+						# currentTime = cv.getTickCount()
+						# elapsedTime = (currentTime - startTime) / cv.getTickFrequency()
+						# framerate = frameCount / elapsedTime
+						# print('FPS:', framerate)
 		finally:
 			device.release()
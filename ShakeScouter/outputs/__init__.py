@@ -1,13 +1,25 @@
 # Copyright (C) 2024 mntone
 # Licensed under the GPLv3 license.
 
+from importlib import import_module
+from typing import Any
+
 from ShakeScouter.outputs.base import Output
-from ShakeScouter.outputs.console import ConsoleOutput
-from ShakeScouter.outputs.json import JsonOutput
-from ShakeScouter.outputs.websocket import WebSocketOutput
 
 OUTPUT_PLUGINS_KEYLIST = {
 	'console': 'ConsoleOutput',
 	'json': 'JsonOutput',
 	'websocket': 'WebSocketOutput',
 }
+
+# Import plugins on the first use (websockets is slow to import)
+OUTPUT_PLUGIN_MODULES = {
+	'ConsoleOutput': 'ShakeScouter.outputs.console',
+	'JsonOutput': 'ShakeScouter.outputs.json',
+	'WebSocketOutput': 'ShakeScouter.outputs.websocket',
+}
+
+def __getattr__(name: str) -> Any:
+	if name not in OUTPUT_PLUGIN_MODULES:
+		raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+	return getattr(import_module(OUTPUT_PLUGIN_MODULES[name]), name)
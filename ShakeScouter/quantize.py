@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import torch
+
+from argparse import ArgumentParser
+from os.path import exists
+from timeit import repeat
+from torch import nn
+from typing import Optional
+
+from ShakeScouter.constants import env
+
+from ShakeScouter.recognizers import selectDevice, Trainer
+from ShakeScouter.recognizers.digit.cnn import DigitCNN
+from ShakeScouter.recognizers.digit.dataset import buildDataset, createLoader, GlyphCache
+from ShakeScouter.recognizers.digit.model import DatasetRoot
+from ShakeScouter.recognizers.digit.quantization import quantizeDynamic, quantizeStatic
+
+from ShakeScouter.utils import forceCwd
+
+# Set current working directory.
+forceCwd(__file__)
+
+def measure(model: nn.Module, batchSize: int, number: int) -> float:
+	inputs = torch.zeros(batchSize, 1, env.DIGIT_HEIGHT, env.DIGIT_WIDTH)
+	with torch.no_grad():
+		elapsed = min(repeat(lambda: model(inputs), number=number, repeat=5)) / number
+	return elapsed
+
+def fileExists(filename: str):
+	if exists(filename):
+		response = input('Quantized model file exists. Overwrite? [y/N]: ').strip().lower()
+		if response not in ['y', 'yes']:
+			exit(0)
+
+def main(args):
+	if not args.force:
+		fileExists(args.output)
+
+	# Load assets
+	json: Optional[DatasetRoot] = None
+	with open(args.input, 'r') as fh:
+		json = DatasetRoot.from_json(fh.read())
+	cache = None if args.no_cache else GlyphCache()
+	trainDataset, testDataset = buildDataset(json, cache, args.jobs)
+
+	# Init loaders (calibration uses train dataset)
+	trainLoader = createLoader(trainDataset, args.batch_size)
+	testLoader  = createLoader(testDataset, args.batch_size)
+
+	# Quantize model
+	device = selectDevice('cpu')
+	models: dict[str, nn.Module] = {}
+	for mode in ['float', 'dynamic', 'static']:
+		model = DigitCNN()
+		model.load_state_dict(torch.load(args.filename, map_location=device))
+		model.eval()
+		match mode:
+			case 'dynamic':
+				model = quantizeDynamic(model)
+			case 'static':
+				model = quantizeStatic(model, trainLoader)
+		models[mode] = model
+
+	# Eval and measure models
+	print(f'{"Mode":<8} {"Accuracy":>8} {"1 digit":>10} {"3 digits":>10}')
+	for mode, model in models.items():
+		accuracy = Trainer(device, DigitCNN, instance=model).eval(testLoader)
+		latency1 = measure(model, 1, args.number)
+		latency3 = measure(model, 3, args.number)
+		print(f'{mode:<8} {accuracy:>8.4f} {1000000 * latency1:>7.1f} us {1000000 * latency3:>7.1f} us')
+
+	# Save static model
+	torch.save(models['static'].state_dict(), args.output)
+	print(f'Save quantized model: {args.output}')
+
+if __name__ == '__main__':
+	parser = ArgumentParser()
+	parser.add_argument('-b', '--batch_size', type=int, default=16, choices=[2, 4, 8, 16, 32, 64])
+	parser.add_argument('-i', '--input', type=str, metavar='INPUT')
+	parser.add_argument('--filename', type=str, metavar='FILE')
+	parser.add_argument('-o', '--output', type=str, metavar='FILE')
+	parser.add_argument('-n', '--number', type=int, default=1000, metavar='NUMBER')
+	parser.add_argument('-f', '--force', action='store_true')
+	parser.add_argument('-j', '--jobs', type=int, metavar='JOBS', help='Number of processes to split dataset images (default: CPU count).')
+	parser.add_argument('--no-cache', action='store_true', help='Split all dataset images without the glyph cache.')
+
+	args = parser.parse_args()
+
+	# Set default input
+	if args.input is None:
+		args.input = env.DEV_DIGIT_DATA_PATH
+
+	# Set default filename
+	if args.filename is None:
+		args.filename = env.DIGIT_MODEL_PATH
+
+	# Set default output
+	if args.output is None:
+		args.output = env.DIGIT_QUANT_MODEL_PATH
+
+	main(args)
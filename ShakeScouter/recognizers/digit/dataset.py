@@ -4,15 +4,23 @@
 import numpy as np
 import torch
 
-from torch.utils.data import Dataset
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+from numpy.typing import NDArray
+from os import cpu_count, replace
+from pathlib import Path
+from torch.utils.data import DataLoader, Dataset
 from typing import Optional
 
 from ShakeScouter.constants import env, screen
-from ShakeScouter.recognizers.digit.model import DatasetAsset, DatasetRoot
+from ShakeScouter.recognizers.digit.model import DatasetRoot
 from ShakeScouter.recognizers.digit.normalize import normalizeDigitImage
 
 from ShakeScouter.utils import calcDigits, getDigit
 from ShakeScouter.utils.images import detectBbox, Frame
+from ShakeScouter.utils.images.manifest import partKey
+from ShakeScouter.utils.images.model import PartInfo
+from ShakeScouter.utils.path import fileHash
 
 class DigitDataset(Dataset):
 	def __init__(self, inputs: torch.Tensor, labels: torch.Tensor):
@@ -29,12 +37,73 @@ class DigitDataset(Dataset):
 		label = self.__labels[index]
 		return input, label
 
-def addData(
-	dataset: list[list[torch.Tensor]],
-	subimage: np.ndarray,
-	value: int,
-	message: str,
-):
+	def __getitems__(self, indices: list[int]):
+		# Slice a whole batch instead of collating each sample
+		index = torch.tensor(indices, dtype=torch.int64)
+		return self.__inputs[index], self.__labels[index]
+
+def collateBatch(batch: tuple[torch.Tensor, torch.Tensor]) -> tuple[torch.Tensor, torch.Tensor]:
+	# Batches are already stacked by DigitDataset
+	return batch
+
+def createLoader(
+	dataset: DigitDataset,
+	batchSize: int,
+	shuffle: bool = False,
+	workers: int = 0,
+	pin: bool = False,
+) -> DataLoader:
+	return DataLoader(
+		dataset,
+		batch_size=batchSize,
+		shuffle=shuffle,
+		num_workers=workers,
+		collate_fn=collateBatch,
+		pin_memory=pin,
+		persistent_workers=workers > 0,
+	)
+
+# Cache entries are invalidated when bumped
+CACHE_VERSION = 1
+
+# Digit parts by name of dataset items
+PARTS: dict[str, PartInfo] = {
+	'timer':  screen.TIMER_PART,
+	'amount': screen.AMOUNT_PART,
+	'quota':  screen.QUOTA_PART,
+}
+
+class GlyphCache:
+	def __init__(self, directory: Path = env.DEV_DIGIT_CACHE_DIR) -> None:
+		self.__directory = directory
+		self.hits   = 0
+		self.misses = 0
+
+	@staticmethod
+	def key(digest: str, part: PartInfo, value: int) -> str:
+		# Key of the image content, the part and the normalization
+		spec = f'{CACHE_VERSION}:{digest}:{partKey(part)}:{value}:{env.DIGIT_WIDTH}x{env.DIGIT_HEIGHT}'
+		return sha256(spec.encode('utf8')).hexdigest()
+
+	def load(self, key: str) -> Optional[NDArray[np.uint8]]:
+		try:
+			glyphs = np.load(self.__directory / f'{key}.npy')
+		except (FileNotFoundError, ValueError):
+			self.misses += 1
+			return None
+		self.hits += 1
+		return glyphs
+
+	def save(self, key: str, glyphs: NDArray[np.uint8]) -> None:
+		# Write atomically, so that an interrupted run leaves no broken entry
+		self.__directory.mkdir(parents=True, exist_ok=True)
+		filepath = self.__directory / f'{key}.npy'
+		temppath = filepath.with_suffix('.tmp')
+		with open(temppath, 'wb') as fh:
+			np.save(fh, glyphs)
+		replace(temppath, filepath)
+
+def splitDigits(subimage: np.ndarray, value: int) -> NDArray[np.uint8]:
 	# Get digits
 	digits = calcDigits(value)
 
@@ -42,56 +111,95 @@ def addData(
 	bboxes = detectBbox(subimage)
 
 	# Fail if bbox count != digits
-	if len(bboxes) != digits:
-		print(message)
-		return
+	glyphs = np.zeros((digits if len(bboxes) == digits else 0, env.DIGIT_HEIGHT, env.DIGIT_WIDTH), dtype=np.uint8)
+	if len(glyphs) == 0:
+		return glyphs
 
-	# Add data
+	# Normalize glyphs from the least significant digit
 	for k in range(digits):
-		number = getDigit(value, k)
 		x, y, width, height = bboxes[digits - k - 1]
 		eachDigitImage = subimage[y:y + height, x:x + width]
-		normDigitImage = normalizeDigitImage(eachDigitImage)
-		dataset[number].append(normDigitImage)
+		glyphs[k] = normalizeDigitImage(eachDigitImage).numpy()
+	return glyphs
 
-def aggregateAsset(config: DatasetAsset, filepath: str, dataset: list[list[torch.Tensor]], index: int):
+def splitAsset(filepath: str, parts: list[tuple[str, int]]) -> list[NDArray[np.uint8]]:
+	# Runs in a worker process
 	frame = Frame(filepath=filepath)
+	return [splitDigits(frame.apply(PARTS[name]), value) for name, value in parts]
 
-	if config.timer is not None:
-		timerImage = frame.apply(screen.TIMER_PART)
-		i = index if config.timer == 'range' else config.timer
-		addData(dataset, timerImage, i, message=f'Cannot split timer image (filepath: {filepath})')
-
-	if config.amount is not None:
-		amountImage = frame.apply(screen.AMOUNT_PART)
-		i = index if config.amount == 'range' else config.amount
-		addData(dataset, amountImage, i, message=f'Cannot split amount image (filepath: {filepath})')
-
-	if config.quota is not None:
-		quotaImage = frame.apply(screen.QUOTA_PART)
-		i = index if config.quota == 'range' else config.quota
-		addData(dataset, quotaImage, i, message=f'Cannot split quota image (filepath: {filepath})')
-
-def aggregateAssets(config: DatasetRoot) -> list[list[torch.Tensor]]:
-	dataset: list[list[torch.Tensor]] = [[] for _ in range(10)]
-
+def listAssets(config: DatasetRoot) -> list[tuple[str, list[tuple[str, int]]]]:
+	assets: list[tuple[str, list[tuple[str, int]]]] = []
 	for asset in config.items:
-		if asset.range is None:
+		indices = [0] if asset.range is None else range(asset.range.start or 0, asset.range.stop, asset.range.step or 1)
+		for i in indices:
 			filepath = f'{config.root_dir}{asset.filename}'
-			aggregateAsset(asset, filepath, dataset, 0)
+			if asset.range is not None:
+				filepath = filepath.format(i)
+
+			parts: list[tuple[str, int]] = []
+			for name in PARTS:
+				value = getattr(asset, name)
+				if value is not None:
+					parts.append((name, i if value == 'range' else value))
+			assets.append((filepath, parts))
+	return assets
+
+def aggregateAssets(
+	config: DatasetRoot,
+	cache: Optional[GlyphCache] = None,
+	workers: Optional[int] = None,
+) -> list[list[torch.Tensor]]:
+	assets = listAssets(config)
+
+	# Look up cached glyphs
+	keys: list[list[str]] = []
+	results: list[list[Optional[NDArray[np.uint8]]]] = []
+	for filepath, parts in assets:
+		digest = fileHash(filepath) if cache is not None else ''
+		assetKeys = [GlyphCache.key(digest, PARTS[name], value) for name, value in parts]
+		keys.append(assetKeys)
+		results.append([cache.load(key) if cache is not None else None for key in assetKeys])
+
+	# Decode and split the rest in processes
+	missing = [i for i, glyphs in enumerate(results) if any(g is None for g in glyphs)]
+	if len(missing) != 0:
+		filepaths = [assets[i][0] for i in missing]
+		parts = [assets[i][1] for i in missing]
+		workers = min(workers or cpu_count() or 1, len(missing))
+		if workers == 1:
+			splits = list(map(splitAsset, filepaths, parts))
 		else:
-			start = asset.range.start or 0
-			stop  = asset.range.stop
-			step  = asset.range.step  or 1
-
-			for i in range(start, stop, step):
-				filepath = f'{config.root_dir}{asset.filename}'.format(i)
-				aggregateAsset(asset, filepath, dataset, i)
+			with ProcessPoolExecutor(max_workers=workers) as executor:
+				chunksize = max(1, len(missing) // (4 * workers))
+				splits = list(executor.map(splitAsset, filepaths, parts, chunksize=chunksize))
+		for i, glyphs in zip(missing, splits):
+			results[i] = list(glyphs)
+
+		if cache is not None:
+			for i in missing:
+				for key, glyphs in zip(keys[i], results[i]):
+					assert glyphs is not None
+					cache.save(key, glyphs)
+
+	# Collect glyphs in the order of the items
+	dataset: list[list[torch.Tensor]] = [[] for _ in range(10)]
+	for (filepath, parts), glyphs in zip(assets, results):
+		for (name, value), digitGlyphs in zip(parts, glyphs):
+			assert digitGlyphs is not None
+			if len(digitGlyphs) == 0:
+				print(f'Cannot split {name} image (filepath: {filepath})')
+				continue
+			for k, glyph in enumerate(digitGlyphs):
+				dataset[getDigit(value, k)].append(torch.from_numpy(glyph.astype(np.float32)))
 
 	return dataset
 
-def buildDataset(config: DatasetRoot) -> tuple[DigitDataset, DigitDataset]:
-	dataset = aggregateAssets(config)
+def buildDataset(
+	config: DatasetRoot,
+	cache: Optional[GlyphCache] = None,
+	workers: Optional[int] = None,
+) -> tuple[DigitDataset, DigitDataset]:
+	dataset = aggregateAssets(config, cache, workers)
 	c = 4
 
 	trainInputs: torch.Tensor = torch.zeros(10 * c, env.DIGIT_HEIGHT, env.DIGIT_WIDTH, dtype=torch.float32)
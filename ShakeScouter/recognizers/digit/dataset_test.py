@@ -0,0 +1,89 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import cv2 as cv
+import numpy as np
+import torch
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from ShakeScouter.constants import screen
+from ShakeScouter.recognizers.digit.dataset import aggregateAssets, createLoader, DigitDataset, GlyphCache
+from ShakeScouter.recognizers.digit.model import DatasetAsset, DatasetAssetRange, DatasetRoot
+from ShakeScouter.utils.images.model import PartInfo
+
+def drawNumber(image: np.ndarray, part: PartInfo, value: int) -> None:
+	area = part['area']
+	x = round(area['left'] * 1920) + 8
+	y = round(area['bottom'] * 1080) - 10
+	cv.putText(image, str(value), (x, y), cv.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 255), 3)
+
+class TestAggregateAssets(TestCase):
+	def setUp(self):
+		self.__directory = TemporaryDirectory()
+		self.__path = Path(self.__directory.name)
+
+		# Synthetic captures with the timer, amount and quota
+		for i in range(12):
+			image = np.zeros((1080, 1920, 3), dtype=np.uint8)
+			drawNumber(image, screen.TIMER_PART, 40 + i)
+			drawNumber(image, screen.AMOUNT_PART, i)
+			drawNumber(image, screen.QUOTA_PART, 21)
+			cv.imwrite(str(self.__path / f'count{i}.png'), image)
+		cv.imwrite(str(self.__path / 'blank.png'), np.zeros((1080, 1920, 3), dtype=np.uint8))
+
+		self.__config = DatasetRoot(f'{self.__path}/', [
+			DatasetAsset('count{}.png', range=DatasetAssetRange(stop=12), amount='range'),
+			DatasetAsset('count3.png', timer=43, quota=21),
+			DatasetAsset('blank.png', timer=50),
+		])
+
+	def tearDown(self):
+		self.__directory.cleanup()
+
+	def assertSameDataset(self, actual: list[list[torch.Tensor]], expected: list[list[torch.Tensor]]):
+		self.assertEqual([len(d) for d in actual], [len(d) for d in expected])
+		for a, e in zip(actual, expected):
+			for x, y in zip(a, e):
+				torch.testing.assert_close(x, y, rtol=0, atol=0)
+
+	def test_cache(self):
+		expected = aggregateAssets(self.__config, workers=1)
+		self.assertEqual(sum(len(d) for d in expected), 10 + 2 * 2 + 2 + 2)
+
+		# Split in processes and fill the cache
+		cache = GlyphCache(self.__path / 'cache')
+		self.assertSameDataset(aggregateAssets(self.__config, cache, workers=2), expected)
+		self.assertEqual((cache.hits, cache.misses), (0, 12 + 2 + 1))
+
+		# Second run reads all glyphs, including the failed split, from the cache
+		cache = GlyphCache(self.__path / 'cache')
+		self.assertSameDataset(aggregateAssets(self.__config, cache), expected)
+		self.assertEqual((cache.hits, cache.misses), (12 + 2 + 1, 0))
+
+	def test_invalidate(self):
+		cache = GlyphCache(self.__path / 'cache')
+		aggregateAssets(self.__config, cache, workers=1)
+
+		# Edited capture is split again
+		image = cv.imread(str(self.__path / 'count0.png'))
+		cv.rectangle(image, (0, 0), (8, 8), (255, 255, 255), -1)
+		cv.imwrite(str(self.__path / 'count0.png'), image)
+
+		cache = GlyphCache(self.__path / 'cache')
+		aggregateAssets(self.__config, cache, workers=1)
+		self.assertEqual((cache.hits, cache.misses), (12 + 2 + 1 - 1, 1))
+
+class TestCreateLoader(TestCase):
+	def test_batches(self):
+		inputs = torch.arange(10 * 20 * 16, dtype=torch.float32).reshape(10, 20, 16)
+		labels = torch.arange(10, dtype=torch.int64)
+		loader = createLoader(DigitDataset(inputs, labels), 4)
+
+		# Batches are sliced from the stacked tensors
+		batches = list(loader)
+		self.assertEqual([len(batch[1]) for batch in batches], [4, 4, 2])
+		torch.testing.assert_close(torch.cat([batch[0] for batch in batches]), inputs, rtol=0, atol=0)
+		torch.testing.assert_close(torch.cat([batch[1] for batch in batches]), labels, rtol=0, atol=0)
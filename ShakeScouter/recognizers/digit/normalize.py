@@ -5,6 +5,8 @@ import cv2 as cv
 import numpy as np
 import torch
 
+from typing import Sequence
+
 from ShakeScouter.constants import env
 
 DIGIT_SIZE = (env.DIGIT_WIDTH, env.DIGIT_HEIGHT)
@@ -20,3 +22,52 @@ def normalizeDigitImage(image: np.ndarray) -> torch.Tensor:
 	tensor = torch.from_numpy(binary.astype(np.float32))
 
 	return tensor
+
+class DigitNormalizer:
+	def __init__(self, capacity: int = 8) -> None:
+		self.__scratch = np.empty((env.DIGIT_HEIGHT, env.DIGIT_WIDTH), dtype=np.uint8)
+		self.__allocate(capacity)
+
+	def __allocate(self, capacity: int) -> None:
+		self.__buffer = np.zeros((capacity, 1, env.DIGIT_HEIGHT, env.DIGIT_WIDTH), dtype=np.float32)
+		self.__tensor = torch.from_numpy(self.__buffer)
+
+	def normalize(self, items: Sequence[tuple[np.ndarray, Sequence[cv.typing.Rect]]]) -> torch.Tensor:
+		# Group glyphs by size (glyphs in the same ROI mostly share it)
+		groups: dict[tuple[int, ...], tuple[list[int], list[np.ndarray]]] = {}
+		count = 0
+		for image, bboxes in items:
+			for x, y, width, height in bboxes:
+				glyph = image[y:y + height, x:x + width]
+				indices, glyphs = groups.setdefault(glyph.shape, ([], []))
+				indices.append(count)
+				glyphs.append(glyph)
+				count += 1
+
+		# Grow buffer if needed
+		if count > len(self.__buffer):
+			self.__allocate(max(count, 2 * len(self.__buffer)))
+
+		scratch = self.__scratch
+		for indices, glyphs in groups.values():
+			if len(glyphs) == 1:
+				# Resize char image
+				cv.resize(glyphs[0], DIGIT_SIZE, dst=scratch, interpolation=cv.INTER_LANCZOS4)
+
+				# Binalyze
+				cv.threshold(scratch, 127, 255, cv.THRESH_BINARY, dst=scratch)
+
+				# Write into (N, 1, 20, 16) buffer
+				self.__buffer[indices[0], 0] = scratch
+			else:
+				# Resize glyphs as channels of one image (same result as each resize)
+				resize = cv.resize(np.dstack(glyphs), DIGIT_SIZE, interpolation=cv.INTER_LANCZOS4)
+
+				# Binalyze
+				cv.threshold(resize, 127, 255, cv.THRESH_BINARY, dst=resize)
+
+				# Write into (N, 1, 20, 16) buffer
+				self.__buffer[indices, 0] = np.moveaxis(resize, 2, 0)
+
+		# The returned tensor shares memory and is overwritten by the next call
+		return self.__tensor[:count]
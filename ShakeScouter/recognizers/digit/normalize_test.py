@@ -0,0 +1,57 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import cv2 as cv
+import numpy as np
+import torch
+
+from unittest import TestCase
+
+from ShakeScouter.recognizers.digit.normalize import DigitNormalizer, normalizeDigitImage
+from ShakeScouter.utils.images import detectBbox
+
+def createDigitImage(value: int, scale: float) -> np.ndarray:
+	image = np.zeros((60, 120), dtype=np.uint8)
+	cv.putText(image, str(value), (4, 52), cv.FONT_HERSHEY_SIMPLEX, scale, 255, 5)
+	return image
+
+class TestDigitNormalizer(TestCase):
+	def test_normalize(self):
+		images = [
+			createDigitImage(value, scale)
+			for value, scale in [(0, 1.8), (42, 1.6), (100, 1.8), (999, 1.4)]
+		]
+		items = [(image, detectBbox(image, 36)) for image in images]
+
+		expected = torch.stack([
+			normalizeDigitImage(image[y:y + height, x:x + width]).unsqueeze(0)
+			for image, bboxes in items
+			for x, y, width, height in bboxes
+		])
+
+		# Grow from small capacity and reuse the buffer
+		normalizer = DigitNormalizer(capacity=2)
+		for _ in range(2):
+			actual = normalizer.normalize(items)
+			self.assertEqual(actual.shape, (9, 1, 20, 16))
+			self.assertEqual(actual.dtype, torch.float32)
+			self.assertTrue(torch.equal(actual, expected))
+
+	def test_normalizeSameSize(self):
+		image = createDigitImage(888, 1.8)
+		items = [(image, detectBbox(image, 36))] * 6
+
+		expected = torch.stack([
+			normalizeDigitImage(image[y:y + height, x:x + width]).unsqueeze(0)
+			for image, bboxes in items
+			for x, y, width, height in bboxes
+		])
+
+		actual = DigitNormalizer().normalize(items)
+		self.assertEqual(actual.shape, (18, 1, 20, 16))
+		self.assertTrue(torch.equal(actual, expected))
+
+	def test_normalizeEmpty(self):
+		normalizer = DigitNormalizer()
+		actual = normalizer.normalize([(np.zeros((60, 120), dtype=np.uint8), [])])
+		self.assertEqual(actual.shape, (0, 1, 20, 16))
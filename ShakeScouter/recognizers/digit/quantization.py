@@ -0,0 +1,77 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import torch
+import torch.ao.quantization as q
+import torch.nn as nn
+
+from torch.utils.data import DataLoader
+from typing import Optional
+
+from ShakeScouter.recognizers.digit.cnn import DigitCNN
+
+QUANTIZE_MODES = ['none', 'dynamic', 'static']
+
+class QuantizableDigitCNN(nn.Module):
+	def __init__(self, model: DigitCNN):
+		super(QuantizableDigitCNN, self).__init__()
+		layers = next(model.children())
+		self.quant   = q.QuantStub()
+		self.layers  = nn.Sequential(*list(layers)[:-1])
+		self.dequant = q.DeQuantStub()
+		self.output  = list(layers)[-1]  # LogSoftmax runs in float
+
+	def forward(self, x):
+		x = self.quant(x)
+		x = self.layers(x)
+		x = self.dequant(x)
+		output = self.output(x)
+		return output
+
+def quantizeDynamic(model: DigitCNN) -> nn.Module:
+	# Linear layers only (Conv2d is not supported by dynamic quantization)
+	model.eval()
+	quantized = q.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+	return quantized
+
+def prepareStatic(model: DigitCNN) -> nn.Module:
+	wrapper = QuantizableDigitCNN(model)
+	wrapper.eval()
+
+	# Fuse Conv2d+ReLU and Linear+ReLU
+	wrapper = q.fuse_modules(wrapper, [['layers.0', 'layers.1'], ['layers.2', 'layers.3'], ['layers.6', 'layers.7']])
+
+	wrapper.qconfig = q.get_default_qconfig(torch.backends.quantized.engine)
+	prepared = q.prepare(wrapper)
+	return prepared
+
+def quantizeStatic(model: DigitCNN, loader: Optional[DataLoader] = None) -> nn.Module:
+	prepared = prepareStatic(model)
+
+	# Calibrate observers
+	if loader is not None:
+		with torch.no_grad():
+			for data in loader:
+				prepared(data[0].unsqueeze(1))
+
+	quantized = q.convert(prepared)
+	return quantized
+
+def loadQuantized(mode: str, filename, device: torch.device) -> nn.Module:
+	if device.type != 'cpu':
+		raise TypeError(f'Quantized digit model requires "cpu" device: {device}')
+
+	model = DigitCNN()
+	match mode:
+		case 'dynamic':
+			model.load_state_dict(torch.load(filename, map_location=device))
+			quantized = quantizeDynamic(model)
+		case 'static':
+			# Build the same architecture, then load scales and weights
+			quantized = quantizeStatic(model)
+			quantized.load_state_dict(torch.load(filename, map_location=device))
+		case _:
+			raise ValueError(f'"mode" is unknown value: {mode}')
+
+	quantized.eval()
+	return quantized
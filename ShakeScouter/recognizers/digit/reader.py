@@ -6,61 +6,92 @@ import numpy as np
 import torch
 
 from functools import reduce
+from pathlib import Path
+from threading import local
 from typing import Optional
 
 from ShakeScouter.constants import env
 from ShakeScouter.recognizers.digit.cnn import DigitCNN
-from ShakeScouter.recognizers.digit.normalize import normalizeDigitImage
+from ShakeScouter.recognizers.digit.normalize import DigitNormalizer
+from ShakeScouter.recognizers.digit.quantization import loadQuantized
+from ShakeScouter.recognizers.digit.script import loadScriptFor
+from ShakeScouter.utils.executor import runAnalysis
 from ShakeScouter.utils.images import detectBbox
 
 class DigitReader:
-	def __init__(self, device: torch.device) -> None:
-		model = DigitCNN()
-		model.load_state_dict(torch.load(env.DIGIT_MODEL_PATH, map_location=device))
+	def __init__(
+		self,
+		device: torch.device,
+		quantize: str = 'none',
+		filename: Path = env.DIGIT_MODEL_PATH,
+		quantFilename: Path = env.DIGIT_QUANT_MODEL_PATH,
+	) -> None:
+		match quantize:
+			case 'none':
+				# Use frozen module exported by train.py, if up to date
+				model = loadScriptFor(filename)
+				if model is None:
+					# Inputs are normalized on the CPU
+					model = DigitCNN()
+					model.load_state_dict(torch.load(filename, map_location='cpu'))
+			case 'dynamic':
+				model = loadQuantized(quantize, filename, device)
+			case _:
+				# Static model is built by quantize.py, not shipped
+				if not quantFilename.exists():
+					raise FileNotFoundError(f'Static quantized digit model is not found: {quantFilename}. Run quantize.py to build it.')
+				model = loadQuantized(quantize, quantFilename, device)
 		self.__model = model
+		self.__local = local()
 
-	def read(self, image: np.ndarray) -> Optional[int]:
-		def convertItem(image: np.ndarray, bbox: cv.typing.Rect) -> torch.Tensor:
-			x, y, width, height = bbox
-
-			# Get each image
-			eachImage = image[y:y + height, x:x + width]
-
-			# Normalize digit image
-			normImage = normalizeDigitImage(eachImage)
-
-			# Add dims: (16, 20) to (1, 16, 20)
-			input = normImage.unsqueeze(0)
-
-			return input
+	@property
+	def __normalizer(self) -> DigitNormalizer:
+		# Reuse input buffer per worker thread
+		normalizer = getattr(self.__local, 'normalizer', None)
+		if normalizer is None:
+			normalizer = DigitNormalizer()
+			self.__local.normalizer = normalizer
+		return normalizer
 
-		def recognize(pyInputs: list[torch.Tensor]) -> int:
-			# Get inputs as Tensor
-			inputs = torch.stack(pyInputs)
+	async def readAsync(self, image: np.ndarray) -> Optional[int]:
+		return await runAnalysis(self.read, image)
 
-			# Get predicted data
-			outputs = self.__model(inputs)
-			_, predicted = torch.max(outputs.data, 1)
+	async def readManyAsync(self, images: list[np.ndarray]) -> list[Optional[int]]:
+		return await runAnalysis(self.readMany, images)
 
-			# Get predicted integer
-			predictedInt = reduce(lambda n, i: 10 * n + predicted[i].item(), range(len(pyInputs)), 0)
-
-			return predictedInt
-
-		# Calc min height
-		minHeight = round(0.6 * image.shape[0])
+	def read(self, image: np.ndarray) -> Optional[int]:
+		return self.readMany([image])[0]
 
-		# Get inputs
-		inputs = [
-			convertItem(image, bbox)
-			for bbox in detectBbox(image, minHeight)
-		]
+	def readMany(self, images: list[np.ndarray]) -> list[Optional[int]]:
+		# Detect bboxes of each image
+		items: list[tuple[np.ndarray, list[cv.typing.Rect]]] = []
+		for image in images:
+			# Calc min height
+			minHeight = round(0.6 * image.shape[0])
+			items.append((image, detectBbox(image, minHeight)))
 
 		# Check empty
-		if len(inputs) == 0:
-			return None
-
-		# Get integer
-		integer = recognize(inputs)
-
-		return integer
+		if all(len(bboxes) == 0 for _, bboxes in items):
+			return [None] * len(images)
+
+		# Get inputs as Tensor: (N, 1, 20, 16)
+		inputs = self.__normalizer.normalize(items)
+
+		# Get predicted data
+		outputs = self.__model(inputs)
+		_, predicted = torch.max(outputs.data, 1)
+		digits: list[int] = predicted.tolist()
+
+		# Get predicted integers
+		integers: list[Optional[int]] = []
+		start = 0
+		for _, bboxes in items:
+			if len(bboxes) == 0:
+				integers.append(None)
+				continue
+
+			end = start + len(bboxes)
+			integers.append(reduce(lambda n, d: 10 * n + d, digits[start:end], 0))
+			start = end
+
+		return integers
@@ -0,0 +1,61 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import cv2 as cv
+import numpy as np
+import torch
+
+from pathlib import Path
+from shutil import copyfile
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from ShakeScouter.constants import env
+from ShakeScouter.recognizers.digit.cnn import DigitCNN
+from ShakeScouter.recognizers.digit.reader import DigitReader
+from ShakeScouter.recognizers.digit.script import saveScript, scriptPath
+
+def drawNumber(value: int) -> np.ndarray:
+	image = np.zeros((60, 120), dtype=np.uint8)
+	cv.putText(image, str(value), (8, 50), cv.FONT_HERSHEY_SIMPLEX, 1.5, 255, 4)
+	return image
+
+class TestDigitReader(TestCase):
+	def setUp(self):
+		self.__directory = TemporaryDirectory()
+		self.__filename = Path(self.__directory.name) / 'digit.pth'
+		copyfile(env.DIGIT_MODEL_PATH, self.__filename)
+
+		# Export frozen module as train.py does
+		model = DigitCNN()
+		model.load_state_dict(torch.load(self.__filename, map_location='cpu'))
+		saveScript(model, scriptPath(self.__filename), self.__filename)
+		self.__model = model
+
+	def tearDown(self):
+		self.__directory.cleanup()
+
+	def test_device(self):
+		# Model stays on the CPU with normalized inputs, whatever the device
+		device = torch.device('cuda') if torch.cuda.is_available() else torch.device('meta')
+		reader = DigitReader(device, filename=self.__filename)
+		image = drawNumber(42)
+		self.assertEqual(reader.read(image), DigitReader(torch.device('cpu'), filename=self.__filename).read(image))
+		self.assertIsInstance(reader.read(image), int)
+
+	def test_stale(self):
+		# Retrained state dict wins over the frozen module
+		with torch.no_grad():
+			for parameter in self.__model.parameters():
+				parameter.zero_()
+		torch.save(self.__model.state_dict(), self.__filename)
+
+		with self.assertLogs('ShakeScouter.recognizers.digit.script', 'WARNING'):
+			reader = DigitReader(torch.device('cpu'), filename=self.__filename)
+		self.assertIsInstance(reader._DigitReader__model, DigitCNN)
+
+	def test_staticMissing(self):
+		# Clear error instead of the bare one from torch.load
+		missing = Path(self.__directory.name) / 'digit-int8.pth'
+		with self.assertRaisesRegex(FileNotFoundError, 'quantize.py'):
+			DigitReader(torch.device('cpu'), 'static', quantFilename=missing)
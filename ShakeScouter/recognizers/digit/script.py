@@ -0,0 +1,64 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import torch
+
+from logging import getLogger
+from pathlib import Path
+from torch import nn
+from typing import BinaryIO, IO, Optional
+
+from ShakeScouter.constants import env
+from ShakeScouter.utils.path import fileHash
+
+# Hash of the state dict file the module is exported from
+SOURCE_HASH = 'source.sha256'
+
+logger = getLogger(__name__)
+
+def scriptPath(filename: str | Path) -> Path:
+	# Frozen module is exported next to the state dict file
+	return Path(filename).with_suffix('.pt')
+
+def scriptModel(model: nn.Module) -> torch.jit.ScriptModule:
+	# Trace (name-mangled attributes are not scriptable), then fold weights as constants
+	model.eval()
+	inputs = torch.zeros(1, 1, env.DIGIT_HEIGHT, env.DIGIT_WIDTH, device=next(model.parameters()).device)
+	with torch.no_grad():
+		traced = torch.jit.trace(model, inputs)
+	frozen = torch.jit.freeze(traced)
+	return frozen
+
+def saveScript(
+	model: nn.Module,
+	file: str | Path | BinaryIO | IO[bytes],
+	source: Optional[str | Path] = None,
+) -> torch.jit.ScriptModule:
+	scripted = scriptModel(model)
+	extraFiles = {} if source is None else {SOURCE_HASH: fileHash(source)}
+	torch.jit.save(scripted, file, _extra_files=extraFiles)
+	return scripted
+
+def loadScript(filename: str | Path | BinaryIO | IO[bytes]) -> torch.jit.ScriptModule:
+	# Inputs are normalized on the CPU, so keep the constants there
+	scripted = torch.jit.load(filename, map_location='cpu')
+	scripted.eval()
+	return scripted
+
+def loadScriptFor(filename: str | Path) -> Optional[torch.jit.ScriptModule]:
+	# Load the frozen module only if it is exported from the state dict file
+	filepath = scriptPath(filename)
+	if not filepath.exists():
+		return None
+
+	extraFiles = {SOURCE_HASH: ''}
+	scripted = torch.jit.load(filepath, map_location='cpu', _extra_files=extraFiles)
+	sourceHash = extraFiles[SOURCE_HASH]
+	if isinstance(sourceHash, bytes):
+		sourceHash = sourceHash.decode('utf8')
+	if sourceHash != fileHash(filename):
+		logger.warning(f'Frozen digit model is stale, loading "{filename}" instead: {filepath}')
+		return None
+
+	scripted.eval()
+	return scripted
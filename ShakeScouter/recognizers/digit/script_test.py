@@ -0,0 +1,36 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import torch
+
+from io import BytesIO
+from parameterized import parameterized
+from unittest import TestCase
+
+from ShakeScouter.constants import env
+from ShakeScouter.recognizers.digit.cnn import DigitCNN
+from ShakeScouter.recognizers.digit.script import loadScript, saveScript
+
+class TestScript(TestCase):
+	@classmethod
+	def setUpClass(cls):
+		model = DigitCNN()
+		model.load_state_dict(torch.load(env.DIGIT_MODEL_PATH, map_location='cpu'))
+		model.eval()
+		cls.model = model
+
+		# Round trip via memory
+		buffer = BytesIO()
+		saveScript(model, buffer)
+		buffer.seek(0)
+		cls.scripted = loadScript(buffer)
+
+	@parameterized.expand([[1], [3], [8]])
+	def test_equivalence(self, batchSize: int):
+		generator = torch.Generator().manual_seed(batchSize)
+		inputs = 255 * torch.rand(batchSize, 1, env.DIGIT_HEIGHT, env.DIGIT_WIDTH, generator=generator)
+		with torch.no_grad():
+			expected = self.model(inputs)
+			actual   = self.scripted(inputs)
+		torch.testing.assert_close(actual, expected)
+		self.assertTrue(torch.equal(torch.argmax(actual, 1), torch.argmax(expected, 1)))
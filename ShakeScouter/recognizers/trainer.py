@@ -3,9 +3,10 @@
 
 import torch
 
+from time import perf_counter
 from torch import nn, optim
 from torch.utils.data import DataLoader
-from typing import BinaryIO, IO, Type
+from typing import BinaryIO, IO, Optional, Type
 
 class Trainer:
 	def __init__(
@@ -16,7 +17,10 @@ class Trainer:
 	):
 		self.__device = device
 
-		if 'filename' in kwargs:
+		if 'instance' in kwargs:
+			# Use model instance (e.g. quantized model)
+			self.__model = kwargs['instance'].to(device)
+		elif 'filename' in kwargs:
 			# Load model
 			filename = kwargs['filename']
 			modelInstance = model()
@@ -36,29 +40,78 @@ class Trainer:
 		criterion: nn.Module,
 		optimizer: optim.Optimizer,
 		epochs: int,
-	):
+		scheduler: Optional[optim.lr_scheduler.LRScheduler] = None,
+		evalLoader: Optional[DataLoader] = None,
+		patience: Optional[int] = None,
+		checkpoint: Optional[str | BinaryIO | IO[bytes]] = None,
+	) -> Optional[float]:
+		bestAccuracy: Optional[float] = None
+		bestEpoch = 0
+		bestState: Optional[dict[str, torch.Tensor]] = None
+		totalSamples = 0
+		totalTime = 0.0
+
 		self.__model.train()
 		for epoch in range(epochs):
 			runningLoss = 0.0
+			samples = 0
+			startTime = perf_counter()
 
 			for data in dataLoader:
-				inputs = data[0].unsqueeze(1).to(self.__device)
-				labels = data[1].to(self.__device)
+				inputs = data[0].unsqueeze(1).to(self.__device, non_blocking=True)
+				labels = data[1].to(self.__device, non_blocking=True)
 
 				# Compute prediction error
 				outputs = self.__model(inputs)
 				loss = criterion(outputs, labels)
 
 				# Backpropagation
-				optimizer.zero_grad()
+				optimizer.zero_grad(set_to_none=True)
 				loss.backward()
 				optimizer.step()
 
 				runningLoss += loss.item() * inputs.size(0)
-
-			dataSize = len(dataLoader)
-			epochLoss = runningLoss / dataSize
-			print(f'Epoch {epoch + 1}/{epochs}, Loss: {epochLoss:.4f}')
+				samples += inputs.size(0)
+
+			if scheduler is not None:
+				scheduler.step()
+
+			elapsed = perf_counter() - startTime
+			totalSamples += samples
+			totalTime += elapsed
+
+			epochLoss = runningLoss / samples
+			message = f'Epoch {epoch + 1}/{epochs}, Loss: {epochLoss:.4f}, {samples / elapsed:.0f} samples/s'
+			if evalLoader is None:
+				print(message)
+				continue
+
+			# Keep the best model on eval accuracy
+			accuracy = self.eval(evalLoader)
+			self.__model.train()
+			print(f'{message}, Accuracy: {accuracy:.4f}')
+			if bestAccuracy is None or accuracy > bestAccuracy:
+				bestAccuracy = accuracy
+				bestEpoch = epoch
+				bestState = {k: v.detach().clone() for k, v in self.__model.state_dict().items()}
+				if checkpoint is not None:
+					# Overwrite the previous best
+					if not isinstance(checkpoint, str):
+						checkpoint.seek(0)
+						checkpoint.truncate()
+					torch.save(bestState, checkpoint)
+			elif patience is not None and epoch - bestEpoch >= patience:
+				print(f'Early stopping: no improvement for {patience} epochs')
+				break
+
+		print(f'Train Speed: {totalSamples / totalTime:.0f} samples/s')
+
+		# Restore the best model
+		if bestState is not None:
+			self.__model.load_state_dict(bestState)
+			print(f'Best Epoch: {bestEpoch + 1}, Accuracy: {bestAccuracy:.4f}')
+
+		return bestAccuracy
 
 	def eval(self, dataLoader: DataLoader) -> float:
 		self.__model.eval()
@@ -0,0 +1,45 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import torch
+
+from io import BytesIO
+from torch import nn, optim
+from unittest import TestCase
+
+from ShakeScouter.recognizers import selectDevice, Trainer
+from ShakeScouter.recognizers.digit.cnn import DigitCNN
+from ShakeScouter.recognizers.digit.dataset import createLoader, DigitDataset
+
+class TestTrainer(TestCase):
+	def setUp(self):
+		torch.manual_seed(0)
+		inputs = (torch.rand(40, 20, 16) > 0.5).float() * 255
+		labels = torch.arange(40, dtype=torch.int64) % 10
+		self.__loader = createLoader(DigitDataset(inputs, labels), 8, shuffle=True)
+		self.__evalLoader = createLoader(DigitDataset(inputs, labels), 512)
+
+	def test_earlyStopping(self):
+		trainer = Trainer(selectDevice('cpu'), DigitCNN)
+		optimizer = optim.Adam(trainer.model.parameters(), lr=0.001)
+		checkpoint = BytesIO()
+		accuracy = trainer.train(
+			self.__loader,
+			nn.CrossEntropyLoss(),
+			optimizer,
+			1000,
+			scheduler=optim.lr_scheduler.CosineAnnealingLR(optimizer, T_max=1000),
+			evalLoader=self.__evalLoader,
+			patience=3,
+			checkpoint=checkpoint,
+		)
+
+		# Memorizes the samples, then stops long before the last epoch
+		self.assertEqual(accuracy, 1.0)
+		self.assertEqual(trainer.eval(self.__evalLoader), accuracy)
+
+		# Checkpoint holds the best model
+		checkpoint.seek(0)
+		best = Trainer(selectDevice('cpu'), DigitCNN)
+		best.model.load_state_dict(torch.load(checkpoint))
+		self.assertEqual(best.eval(self.__evalLoader), accuracy)
@@ -12,6 +12,7 @@ from ShakeScouter.scenes.base import Scene
 from ShakeScouter.utils import debug_flags
 from ShakeScouter.utils.debug_io import debug_log, debug_save
 from ShakeScouter.utils.images import Frame, errorMAE
+from ShakeScouter.utils.images.debug import setWaveDebug
 
 TELEMETRY_DIR = Path(__file__).resolve().parents[1] / '.telemetry'
 _YUYV_DETECTED: Optional[bool] = None
@@ -104,7 +105,7 @@ def main() -> None:
 	parser.add_argument('--wave-debug', action='store_true', default=False, help='enable wave debug logs and intermediate image dumps')
 	args = parser.parse_args()
 
-	debug_flags.WAVE_DEBUG = args.wave_debug
+	setWaveDebug(args.wave_debug)
 	timestamp = time.strftime('%Y%m%d-%H%M%S')
 
 	raw = capture_frame(args.device, args.video)
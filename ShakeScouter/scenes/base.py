@@ -5,22 +5,25 @@ import cv2 as cv
 import numpy as np
 
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from numpy.typing import NDArray
 from typing import Any, Optional
 
 from ShakeScouter.constants import env
 from ShakeScouter.utils.images import Frame
+from ShakeScouter.utils.images.bundle import TemplateBundle
 
 class SceneEvent(Enum):
-	DEV_COMMENT = 'dev_comment'
-	DEV_WARN    = 'dev_warn'
-	MATCHMAKING = 'matchmaking'
-	GAME_STAGE  = 'game_stage'
-	GAME_KING   = 'game_king'
-	GAME_UPDATE = 'game_update'
-	GAME_RESULT = 'game_result'
-	GAME_ERROR  = 'game_error'
+	DEV_COMMENT  = 'dev_comment'
+	DEV_WARN     = 'dev_warn'
+	DEV_SCHEDULE = 'dev_schedule'
+	MATCHMAKING  = 'matchmaking'
+	GAME_STAGE   = 'game_stage'
+	GAME_KING    = 'game_king'
+	GAME_UPDATE  = 'game_update'
+	GAME_RESULT  = 'game_result'
+	GAME_ERROR   = 'game_error'
 
 class SceneStatus(Enum):
 	FALSE = 0
@@ -48,18 +51,26 @@ class SceneContext:
 		raise NotImplementedError()
 
 class Scene:
+	__templates: dict[str, NDArray[np.uint8]] = {}
+	__bundle: Optional[TemplateBundle] = None
+	__bundleLoaded = False
+
 	def setup(self) -> Any:
 		return None
 
 	def reset(self, data: Any) -> None:
 		pass
 
+	def rateScale(self, data: Any, timestamp: float) -> float:
+		# Scale for the rate of the parent Drop
+		return 1.0
+
 	@abstractmethod
 	async def analysis(self, context: SceneContext, data: Any, frame: Frame) -> SceneStatus:
 		raise NotImplementedError()
 
 	@staticmethod
-	def loadTemplate(templateName: str) -> NDArray[np.uint8]:
+	def readTemplate(templateName: str) -> NDArray[np.uint8]:
 		filepath = env.template_path(templateName)
 		image = cv.imread(str(filepath), cv.IMREAD_GRAYSCALE)
 		if image is None:
@@ -67,3 +78,50 @@ class Scene:
 		if image.dtype != np.uint8:
 			raise TypeError(f'Image type is not np.uint8')
 		return image.astype(np.uint8)
+
+	@staticmethod
+	def templateBundle() -> Optional[TemplateBundle]:
+		if not Scene.__bundleLoaded:
+			Scene.__bundle = TemplateBundle.open(env.TEMPLATE_BUNDLE_PATH)
+			Scene.__bundleLoaded = True
+		return Scene.__bundle
+
+	@staticmethod
+	def loadTemplate(templateName: str) -> NDArray[np.uint8]:
+		image = Scene.__templates.get(templateName)
+		if image is None:
+			# Map from the bundle, or decode PNG if it is not built
+			bundle = Scene.templateBundle()
+			if bundle is not None:
+				image = bundle.get(templateName)
+			if image is None:
+				image = Scene.readTemplate(templateName)
+			Scene.__templates[templateName] = image
+		return image
+
+	@staticmethod
+	def templateNames() -> list[str]:
+		names = [
+			filepath.relative_to(env.TEMPLATE_DIR).with_suffix('').as_posix()
+			for filepath in sorted(env.TEMPLATE_DIR.rglob('*.png'))
+		]
+		return names
+
+	@staticmethod
+	def preloadTemplates(templateNames: list[str]) -> None:
+		# Bundled templates are mapped on demand
+		bundle = Scene.templateBundle()
+		if bundle is not None:
+			templateNames = [templateName for templateName in templateNames if templateName not in bundle]
+
+		def read(templateName: str) -> Optional[NDArray[np.uint8]]:
+			try:
+				return Scene.readTemplate(templateName)
+			except TypeError:
+				return None  # raise in loadTemplate if it is used
+
+		# Decode in parallel (imread releases the GIL)
+		with ThreadPoolExecutor() as executor:
+			for templateName, image in zip(templateNames, executor.map(read, templateNames)):
+				if image is not None:
+					Scene.__templates[templateName] = image
@@ -15,6 +15,7 @@ class SceneContextImpl(SceneContext):
 	def __init__(self, streams: list[MemoryObjectSendStream[Any]] = []) -> None:
 		self.__cache: dict[SceneEvent, dict[str, Any]] = {}
 		self.__streams = streams
+		self.__session = generate()  # dev events may come before matchmaking
 		self.__timestamp = time()
 
 	def __del__(self) -> None:
@@ -85,3 +86,34 @@ class SceneContextImpl(SceneContext):
 
 		# Send
 		await self.__send(eventMessage)
+
+class BufferedSceneContext(SceneContext):
+	def __init__(self, context: SceneContext) -> None:
+		self.__context = context
+		self.__events: list[tuple[bool, SceneEvent, Optional[dict[str, Any]]]] = []
+
+	@property
+	def session(self) -> str:
+		return self.__context.session
+
+	@property
+	def timestamp(self) -> float:
+		return self.__context.timestamp
+
+	def updateTimestamp(self) -> float:
+		return self.__context.updateTimestamp()
+
+	async def sendImmediately(self, event: SceneEvent, message: Optional[dict[str, Any]] = None) -> None:
+		self.__events.append((True, event, message))
+
+	async def send(self, event: SceneEvent, message: dict[str, Any]) -> None:
+		self.__events.append((False, event, message))
+
+	async def flush(self) -> None:
+		# Replay events in the order they were sent
+		for immediate, event, message in self.__events:
+			if immediate:
+				await self.__context.sendImmediately(event, message)
+			else:
+				await self.__context.send(event, message)
+		self.__events.clear()
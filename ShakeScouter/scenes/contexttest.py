@@ -50,3 +50,48 @@ class TestSceneContext(SceneContext):
 	@property
 	def message(self) -> Any:
 		return self.__message
+
+class ReplaySceneContext(SceneContext):
+	def __init__(self, interval: float = 1 / 60) -> None:
+		self.__interval = interval
+		self.__messages: list[dict[str, Any]] = []
+		self.__timestamp = 0.0
+		self.__session = 0
+
+	@property
+	def session(self) -> str:
+		return str(self.__session)
+
+	@property
+	def timestamp(self) -> float:
+		return self.__timestamp
+
+	def updateTimestamp(self) -> float:
+		# Advance one frame
+		self.__timestamp += self.__interval
+		return self.__timestamp
+
+	async def sendImmediately(self, event: SceneEvent, message: Optional[dict[str, Any]] = None) -> None:
+		if event == SceneEvent.MATCHMAKING:
+			self.__session += 1
+
+		eventMessage = {
+			'session': self.session,
+			'event': event.value,
+			'timestamp': self.__timestamp,
+		}
+
+		if message is not None:
+			# Set additional field
+			for key, val in message.items():
+				if val is not None:
+					eventMessage[key] = deepcopy(val)
+
+		self.__messages.append(eventMessage)
+
+	async def send(self, event: SceneEvent, message: dict[str, Any]) -> None:
+		await self.sendImmediately(event, message)
+
+	@property
+	def messages(self) -> list[dict[str, Any]]:
+		return self.__messages
@@ -5,4 +5,4 @@ from ShakeScouter.scenes.ingame.error import ErrorScene
 from ShakeScouter.scenes.ingame.king import KingScene
 from ShakeScouter.scenes.ingame.result import ResultScene
 from ShakeScouter.scenes.ingame.stage import StageScene
-from ShakeScouter.scenes.ingame.wave import WaveScene
+from ShakeScouter.scenes.ingame.wave import WaveData, WaveScene
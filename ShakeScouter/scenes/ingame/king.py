@@ -1,10 +1,11 @@
 # Copyright (C) 2024 mntone
 # Licensed under the GPLv3 license.
 
-from typing import Any
+from typing import Any, Optional
 
 from ShakeScouter.constants import assets, screen
 from ShakeScouter.scenes.base import *
+from ShakeScouter.utils.executor import runAnalysis
 from ShakeScouter.utils.images import Frame, getMinErrorKey
 
 class KingScene(Scene):
@@ -16,13 +17,18 @@ class KingScene(Scene):
 			for key in assets.kingKeys
 		}
 
-	async def analysis(self, context: SceneContext, data: Any, frame: Frame) -> SceneStatus:
+	def __findKing(self, frame: Frame) -> Optional[str]:
 		kingImage = frame.apply(screen.KING_NAME_PART)
 		kingKey = getMinErrorKey(
 			kingImage,
 			self.__kingTemplates,
 			minError=KingScene.MIN_ERROR,
 		)
+		return kingKey
+
+	async def analysis(self, context: SceneContext, data: Any, frame: Frame) -> SceneStatus:
+		# Match all king templates on the worker pool
+		kingKey = await runAnalysis(self.__findKing, frame)
 
 		if kingKey is None:
 			return SceneStatus.FALSE
@@ -1,16 +1,43 @@
 # Copyright (C) 2024 mntone
 # Licensed under the GPLv3 license.
 
+import cv2 as cv
+import numpy as np
+
 from os import chdir
 from parameterized import parameterized
 from pathlib import Path
-from unittest import IsolatedAsyncioTestCase
+from unittest import IsolatedAsyncioTestCase, TestCase
 
-from ShakeScouter.constants import env
+from ShakeScouter.constants import assets, env, screen
 from ShakeScouter.scenes import SceneEvent, SceneStatus
 from ShakeScouter.scenes.ingame import KingScene
 from ShakeScouter.scenes.contexttest import TestSceneContext
-from ShakeScouter.utils.images import Frame
+from ShakeScouter.utils.images import errors, Frame, getMinErrorKey
+
+def drawKingName(text: str) -> np.ndarray:
+	image = np.zeros((1080, 1920, 3), dtype=np.uint8)
+	cv.putText(image, text, (50, 950), cv.FONT_HERSHEY_SIMPLEX, 2.4, (255, 255, 255), 7)
+	return image
+
+class TestKingSceneResolution(TestCase):
+	@parameterized.expand([
+		(1280, 720),
+		(960, 540),
+	])
+	def test_minError(self, width: int, height: int):
+		templates = {
+			key: Frame(raw=drawKingName(key.capitalize())).apply(screen.KING_NAME_PART)
+			for key in assets.kingKeys
+		}
+
+		# Templates fitted to the capture keep the threshold
+		for key in assets.kingKeys:
+			image = cv.resize(drawKingName(key.capitalize()), (width, height), interpolation=cv.INTER_AREA)
+			kingImage = Frame(raw=image).apply(screen.KING_NAME_PART)
+			with self.subTest(key=key):
+				self.assertLessEqual(errors(kingImage, templates)[key], KingScene.MIN_ERROR)
+				self.assertEqual(getMinErrorKey(kingImage, templates, KingScene.MIN_ERROR), key)
 
 class TestKingScene(IsolatedAsyncioTestCase):
 	@classmethod
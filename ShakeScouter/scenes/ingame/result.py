@@ -1,17 +1,20 @@
 # Copyright (C) 2024 mntone
 # Licensed under the GPLv3 license.
 
-from typing import Any
+from typing import Any, TYPE_CHECKING
 
 from ShakeScouter.constants import screen
-from ShakeScouter.recognizers.digit import DigitReader
 from ShakeScouter.scenes.base import *
 from ShakeScouter.utils.images import errorMAE, Frame
 
+# Load torch on the first reader
+if TYPE_CHECKING:
+	from ShakeScouter.recognizers.digit import DigitReader
+
 class ResultScene(Scene):
 	MIN_ERROR = 0.1
 
-	def __init__(self, reader: DigitReader) -> None:
+	def __init__(self, reader: 'DigitReader') -> None:
 		self.__reader = reader
 		self.__mrgrizzTemplate = Scene.loadTemplate('mrgrizz')
 
@@ -23,13 +26,10 @@ class ResultScene(Scene):
 		if grizzError > ResultScene.MIN_ERROR:
 			return SceneStatus.FALSE
 
-		# Read "golden"
+		# Read "golden" and "power" in a batch
 		goldenImage = frame.apply(screen.GEGG_PART)
-		goldenInt = self.__reader.read(goldenImage)
-
-		# Read "power"
-		powerImage = frame.apply(screen.PEGG_PART)
-		powerInt = self.__reader.read(powerImage)
+		powerImage  = frame.apply(screen.PEGG_PART)
+		goldenInt, powerInt = await self.__reader.readManyAsync([goldenImage, powerImage])
 
 		if goldenInt is None or powerInt is None:
 			return SceneStatus.FALSE
@@ -5,28 +5,60 @@ import cv2 as cv
 import numpy as np
 import time
 
+from dataclasses import dataclass
 from numpy.typing import NDArray
-from typing import Any, Optional
+from typing import Any, Literal, Optional, TYPE_CHECKING
 
 import ShakeScouter.utils.images.filters as f
 
 from ShakeScouter.constants import Color, screen
-from ShakeScouter.recognizers.digit import DigitReader
 from ShakeScouter.scenes.base import *
 from ShakeScouter.utils.anomaly import CounterAnomalyDetector
-from ShakeScouter.utils.images import errorMAE, Frame
+from ShakeScouter.utils.images import errorMAE, fitTemplate, Frame
 from ShakeScouter.utils import debug_flags
 from ShakeScouter.utils.debug_io import debug_log, debug_save
-from ShakeScouter.utils.images.frame import TELEMETRY_DIR
+from ShakeScouter.utils.executor import runAnalysis
+from ShakeScouter.utils.images.frame import isLumaOnly, TELEMETRY_DIR
+from ShakeScouter.utils.images.model import PartInfo
+from ShakeScouter.utils.recorder import FlightRecorder
+from ShakeScouter.utils.tracker import TimerTracker
+
+# Load torch on the first reader
+if TYPE_CHECKING:
+	from ShakeScouter.recognizers.digit import DigitReader
+
+@dataclass(slots=True)
+class WaveData:
+	end: float
+	wave: int | Literal['extra']
+	color: Optional[Color]
+	quota: int
+	detector: CounterAnomalyDetector
+	tracker: TimerTracker
+	initialWaveRetryCount: int
+	initialWaveLastOcr: Optional[int]
+	steady: int = 0  # count of normal timer reads in a row
 
 class WaveScene(Scene):
 	MIN_ERROR = 0.1
 	ALIVE_THRESHOLD = 600
 	GEGG_HUE        = 32
 	GEGG_THRESHOLD  = 354  # the half of π×30²
+
+	# Players layout at 1080p
+	PLAYERS_HEIGHT = 85
+	PLAYERS_SPLIT  = 55
+	PLAYER_STRIDE  = 72
+	PLAYER_WIDTH   = 67
 	INITIAL_WAVE_MAX_RETRY = 5
 
-	def __init__(self, reader: DigitReader) -> None:
+	# Adaptive rate
+	FAST_RATE_SCALE = 2.0
+	SLOW_RATE_SCALE = 0.5
+	LAST_SECONDS    = 10
+	STEADY_COUNT    = 4
+
+	def __init__(self, reader: 'DigitReader') -> None:
 		self.__reader           = reader
 		self.__playersTemplate  = Scene.loadTemplate('players')
 		self.__geggTemplate     = Scene.loadTemplate('gegg')
@@ -37,13 +69,29 @@ class WaveScene(Scene):
 		self.__timerDebugId     = 0
 		self.__lastTimerDebug   = None
 		self.__lastTimerImages  = None
+		self.__lastTimerFrame: Optional[Frame] = None
+		self.__recorder         = FlightRecorder(TELEMETRY_DIR)
+
+	@property
+	def recorder(self) -> FlightRecorder:
+		return self.__recorder
+
+	@staticmethod
+	def __applyPart(frame: Frame, part: PartInfo) -> tuple[NDArray[np.uint8], NDArray[np.uint8]]:
+		# Keep the crop the filters read, so recording needs no extra conversion
+		filters = part['filters']
+		crop = frame.subimage(part['area'], isLumaOnly(filters)).native
+		return crop, Frame(raw=crop).filter(filters)
 
 	def __captureTimerDebug(self, timestamp: float, count: Optional[int]) -> Optional[dict[str, Any]]:
 		if not debug_flags.WAVE_DEBUG:
 			return None
-		if self.__lastTimerImages is None:
+		if self.__lastTimerImages is None or self.__lastTimerFrame is None:
 			return None
-		rawTimerImage, grayImage, timerImage = self.__lastTimerImages
+		_, grayImage, timerImage = self.__lastTimerImages
+
+		# Fetch color crop only for debugging
+		rawTimerImage = self.__lastTimerFrame.subimage(screen.TIMER_PART['area']).native
 		self.__timerDebugId += 1
 		debug_id = self.__timerDebugId
 		ts_str = time.strftime('%Y%m%d-%H%M%S', time.localtime(timestamp))
@@ -64,36 +112,66 @@ class WaveScene(Scene):
 		self.__lastTimerDebug = debug_info
 		return debug_info
 
-	def setup(self) -> Any:
-		data = {
-			'end': -1,
-			'wave': 0,
-			'color': None,
-			'quota': -1,
-			'detector': CounterAnomalyDetector(),
-			'initial_wave_retry_count': 0,
-			'initial_wave_last_ocr': None,
-		}
+	def setup(self) -> WaveData:
+		detector = CounterAnomalyDetector()
+		data = WaveData(
+			end=-1,
+			wave=0,
+			color=None,
+			quota=-1,
+			detector=detector,
+			tracker=TimerTracker(detector),
+			initialWaveRetryCount=0,
+			initialWaveLastOcr=None,
+		)
 		return data
 
-	def reset(self, data: Any) -> None:
-		data['end']   = -1
-		data['wave']  = 0
-		data['color'] = None
-		data['quota'] = -1
-		data['detector'].reset()
-		data['initial_wave_retry_count'] = 0
-		data['initial_wave_last_ocr'] = None
-
-	async def __detectAnomalousCount(self, context: SceneContext, data: Any, count: Optional[int]) -> None:
-		if count is not None:
-			if not data['detector'].isAnomalous(count, context.timestamp):
+	def reset(self, data: WaveData) -> None:
+		data.end   = -1
+		data.wave  = 0
+		data.color = None
+		data.quota = -1
+		data.detector.reset()
+		data.tracker.reset()
+		data.initialWaveRetryCount = 0
+		data.initialWaveLastOcr = None
+		data.steady = 0
+
+	def rateScale(self, data: WaveData, timestamp: float) -> float:
+		# Watch transitions: "Xtrawave", between waves and the last seconds of each wave
+		detector = data.detector
+		if data.wave == 'extra' or detector.state != 'COUNTDOWN' or detector.value <= WaveScene.LAST_SECONDS:
+			return WaveScene.FAST_RATE_SCALE
+
+		# Timer is predictable in the middle of a wave
+		if data.steady >= WaveScene.STEADY_COUNT:
+			return WaveScene.SLOW_RATE_SCALE
+
+		return 1.0
+
+	async def __detectAnomalousCount(self, context: SceneContext, data: WaveData, count: Optional[int]) -> Optional[int]:
+		# Record timer read in this frame
+		if self.__lastTimerImages is not None:
+			rawTimerImage, _, timerImage = self.__lastTimerImages
+			self.__recorder.record(context.timestamp, 'timer', timerImage, rawTimerImage)
+
+		tracker = data.tracker
+		if count is None:
+			data.steady = 0
+			self.__recorder.dump(context.timestamp, 'timer_none')
+		else:
+			if not data.detector.isAnomalous(count, context.timestamp):
 				# Calc estimated end timestamp
-				data['end'] = context.timestamp + (100 - count)
+				data.end = context.timestamp + (100 - count)
+				data.steady += 1
+				tracker.accept(count, not tracker.predicted)
+				return count
 			else:
+				data.steady = 0
+				self.__recorder.dump(context.timestamp, 'anomalous')
 				if debug_flags.WAVE_DEBUG:
-					prev_value = getattr(data['detector'], '_CounterAnomalyDetector__preValue', None)
-					prev_timestamp = getattr(data['detector'], '_CounterAnomalyDetector__preTimestamp', None)
+					prev_value = getattr(data.detector, '_CounterAnomalyDetector__preValue', None)
+					prev_timestamp = getattr(data.detector, '_CounterAnomalyDetector__preTimestamp', None)
 					elapsed = None
 					if prev_timestamp is not None:
 						elapsed = context.timestamp - prev_timestamp
@@ -107,17 +185,32 @@ class WaveScene(Scene):
 					'description': f'Anomalous value detected: {count}',
 				})
 
-	def __analysisCount(self, frame: Frame) -> Optional[int]:
+		# Substitute the prediction for a missing or anomalous read
+		predicted = tracker.correct()
+		if predicted is not None and not data.detector.isAnomalous(predicted, context.timestamp):
+			data.end = context.timestamp + (100 - predicted)
+			tracker.accept(predicted, False)
+			return predicted
+
+		tracker.accept(None, False)
+		return count
+
+	def __analysisCount(self, frame: Frame, tracker: TimerTracker, timestamp: float) -> Optional[int]:
 		# Read "count"
-		rawTimerFrame = frame.subimage(screen.TIMER_PART['area'])
+		rawTimerFrame = frame.subimage(screen.TIMER_PART['area'], luma=True)
 		rawTimerImage = rawTimerFrame.native
 		filters = screen.TIMER_PART['filters']
 		grayImage = filters[0].apply(rawTimerImage) if len(filters) > 0 else rawTimerImage
 		timerImage = filters[1].apply(grayImage) if len(filters) > 1 else grayImage
-		timerInt = self.__reader.read(timerImage)
+		self.__lastTimerImages = (rawTimerImage, grayImage, timerImage)
+		self.__lastTimerFrame  = frame
+
+		# Skip OCR while the timer follows the prediction
+		timerInt = tracker.observe(timestamp, timerImage)
+		if timerInt is None:
+			timerInt = self.__reader.read(timerImage)
 
 		if debug_flags.WAVE_DEBUG:
-			self.__lastTimerImages = (rawTimerImage, grayImage, timerImage)
 			if timerInt is None or timerInt == 200:
 				debug_info = self.__captureTimerDebug(time.time(), timerInt)
 				if debug_info is not None:
@@ -141,26 +234,40 @@ class WaveScene(Scene):
 	def __analysisPlayerStatus(self, color: Color, frame: Frame):
 		# Get player image
 		playerInfoImage = frame.apply(screen.PLAYERS_PART)
+		return WaveScene.getPlayerStatus(playerInfoImage, color, self.__playersTemplate, self.__geggTemplate)
+
+	@staticmethod
+	def getPlayerStatus(
+		playerInfoImage: NDArray[np.uint8],
+		color: Color,
+		playersTemplate: NDArray[np.uint8],
+		geggTemplate: NDArray[np.uint8],
+	) -> list[dict[str, bool]]:
+		# Scale layout to the capture resolution
+		scale = playerInfoImage.shape[0] / WaveScene.PLAYERS_HEIGHT
+		split = round(WaveScene.PLAYERS_SPLIT * scale)
 
 		hue = color.value.hueA
-		playersSubimage = playerInfoImage[:55, :]
+		playersSubimage = playerInfoImage[:split, :]
+		playersMask = fitTemplate(playersTemplate, playersSubimage.shape)
 		playersImage = cv.inRange(
-			cv.bitwise_and(playersSubimage, playersSubimage, mask=self.__playersTemplate),
+			cv.bitwise_and(playersSubimage, playersSubimage, mask=playersMask),
 			np.array([hue - 5, 102, 102]),
 			np.array([hue + 5, 255, 255]),
 		)
 
-		geggSubimage = playerInfoImage[55:, :]
+		geggSubimage = playerInfoImage[split:, :]
+		geggMask = fitTemplate(geggTemplate, geggSubimage.shape)
 		geggImage = cv.inRange(
-			cv.bitwise_and(geggSubimage, geggSubimage, mask=self.__geggTemplate),
+			cv.bitwise_and(geggSubimage, geggSubimage, mask=geggMask),
 			np.array([WaveScene.GEGG_HUE - 5, 102, 102]),
 			np.array([WaveScene.GEGG_HUE + 5, 255, 255]),
 		)
 
 		# Get player status
 		playerStatus = list(map(lambda i: {
-			'alive': WaveScene.__getStatus(playersImage, i, WaveScene.ALIVE_THRESHOLD),
-			'gegg':  WaveScene.__getStatus(geggImage,    i, WaveScene.GEGG_THRESHOLD),
+			'alive': WaveScene.__getStatus(playersImage, i, scale, WaveScene.ALIVE_THRESHOLD),
+			'gegg':  WaveScene.__getStatus(geggImage,    i, scale, WaveScene.GEGG_THRESHOLD),
 		}, range(4)))
 
 		return playerStatus
@@ -173,8 +280,15 @@ class WaveScene(Scene):
 
 		return unstableStatus
 
-	async def __analysisXtrawave(self, context: SceneContext, data: Any, frame: Frame, waveImage: Optional[NDArray[np.uint8]] = None) -> SceneStatus:
-		if context.timestamp >= data['end']:
+	def __analysisParts(self, color: Color, frame: Frame, tracker: TimerTracker, timestamp: float) -> tuple[Optional[int], list[dict[str, bool]], bool]:
+		# Read each part in a single worker call
+		count    = self.__analysisCount(frame, tracker, timestamp)
+		players  = self.__analysisPlayerStatus(color, frame)
+		unstable = self.__analysisUnstable(frame)
+		return count, players, unstable
+
+	async def __analysisXtrawave(self, context: SceneContext, data: WaveData, frame: Frame, waveImage: Optional[NDArray[np.uint8]] = None) -> SceneStatus:
+		if context.timestamp >= data.end:
 			# Debug bookkeeping for every Extra Wave check
 			debug_id: Optional[int] = None
 			roi_color: Optional[NDArray[np.uint8]] = None
@@ -202,20 +316,18 @@ class WaveScene(Scene):
 			if waveExError > WaveScene.MIN_ERROR:
 				return SceneStatus.FALSE
 			else:
-				data['wave']  = 'extra'
-				data['quota'] = -1
+				data.wave  = 'extra'
+				data.quota = -1
 
 		# Read each part
-		count    = self.__analysisCount(frame)
-		players  = self.__analysisPlayerStatus(data['color'], frame)
-		unstable = self.__analysisUnstable(frame)
+		count, players, unstable = await runAnalysis(self.__analysisParts, data.color, frame, data.tracker, context.timestamp)
 
 		# Detect anomalous count
-		await self.__detectAnomalousCount(context, data, count)
+		count = await self.__detectAnomalousCount(context, data, count)
 
 		# Send message
 		message = {
-			'color': data['color'].value.name,
+			'color': data.color.value.name,
 			'wave': 'extra',
 			'count': count,
 			'players': players,
@@ -225,85 +337,89 @@ class WaveScene(Scene):
 
 		return SceneStatus.CONTINUE
 
-	async def analysis(self, context: SceneContext, data: Any, frame: Frame) -> SceneStatus:
+	async def analysis(self, context: SceneContext, data: WaveData, frame: Frame) -> SceneStatus:
 		initial_wave_forced = False
+		wave_missing = False
 
 		# In "Xtrawave"
-		if data['wave'] == 'extra':
+		if data.wave == 'extra':
 			result = await self.__analysisXtrawave(context, data, frame)
 			return result
 
-		if context.timestamp >= data['end']:
+		if context.timestamp >= data.end:
 			# Detect "Wave"
-			waveImage = frame.apply(screen.WAVE_PART)
+			waveCrop, waveImage = WaveScene.__applyPart(frame, screen.WAVE_PART)
 			waveTextImage = screen.removeNumberAreaFromWaveImage(waveImage)
 			waveError = errorMAE(waveTextImage, self.__waveTemplate)
 
 			if waveError > WaveScene.MIN_ERROR:
-				data['quota'] = -1
+				data.quota = -1
 
 				# Check "Xtrawave"
 				result = await self.__analysisXtrawave(context, data, frame, waveImage)
 				return result
 
 			# Get nearest hue
-			if data['color'] is None:
+			if data.color is None:
 				playerImage = frame \
 					.subimage(screen.PLAYERS_PART['area']) \
 					.filter([
 						f.Blur((7, 7)),
 						f.HSV(),
 					])
-				data['color'] = WaveScene.__findNearestColor(playerImage)
-
-			# Read "wave"
-			waveNumberImage = waveImage[:, self.__waveTemplate.shape[1]:]
-			waveNumberInt = self.__reader.read(waveNumberImage)
+				data.color = WaveScene.__findNearestColor(playerImage)
+
+			# Read "wave" and "quota" in a batch
+			waveNumberImage = waveImage[:, waveTextImage.shape[1]:]
+			quotaCrop, quotaImage = WaveScene.__applyPart(frame, screen.QUOTA_PART)
+			waveNumberInt, quotaInt = await self.__reader.readManyAsync([waveNumberImage, quotaImage])
+			self.__recorder.record(context.timestamp, 'wave', waveImage, waveCrop)
+			self.__recorder.record(context.timestamp, 'quota', quotaImage, quotaCrop)
+			wave_missing = waveNumberInt is None
 			initial_wave_retrying = False
 			initial_wave_forced = False
-			data['initial_wave_last_ocr'] = waveNumberInt
-			if data['wave'] == 0:
+			data.initialWaveLastOcr = waveNumberInt
+			if data.wave == 0:
 				if waveNumberInt == 1:
-					data['wave'] = 1
-					data['initial_wave_retry_count'] = 0
+					data.wave = 1
+					data.initialWaveRetryCount = 0
 				else:
-					if data['initial_wave_retry_count'] < WaveScene.INITIAL_WAVE_MAX_RETRY:
-						data['initial_wave_retry_count'] += 1
-						initial_wave_retrying = data['initial_wave_retry_count'] < WaveScene.INITIAL_WAVE_MAX_RETRY
-					if data['initial_wave_retry_count'] >= WaveScene.INITIAL_WAVE_MAX_RETRY:
-						data['wave'] = 1
+					if data.initialWaveRetryCount < WaveScene.INITIAL_WAVE_MAX_RETRY:
+						data.initialWaveRetryCount += 1
+						initial_wave_retrying = data.initialWaveRetryCount < WaveScene.INITIAL_WAVE_MAX_RETRY
+					if data.initialWaveRetryCount >= WaveScene.INITIAL_WAVE_MAX_RETRY:
+						data.wave = 1
 						initial_wave_forced = True
-						debug_log(f'[INFO] initial_wave_forced_to_1 retry_count={data["initial_wave_retry_count"]} last_ocr={waveNumberInt} ts={context.timestamp}')
+						debug_log(f'[INFO] initial_wave_forced_to_1 retry_count={data.initialWaveRetryCount} last_ocr={waveNumberInt} ts={context.timestamp}')
 			else:
 				if waveNumberInt is not None:
-					data['wave'] = waveNumberInt
+					data.wave = waveNumberInt
 
-			# Read "quota"
-			quotaImage = frame.apply(screen.QUOTA_PART)
-			quotaInt = self.__reader.read(quotaImage)
+			# Update "quota"
 			if quotaInt is not None:
-				data['quota'] = quotaInt
+				data.quota = quotaInt
 
 		# Read "amount"
-		amountImage = frame.apply(screen.AMOUNT_PART)
-		amountInt = self.__reader.read(amountImage)
+		amountCrop, amountImage = WaveScene.__applyPart(frame, screen.AMOUNT_PART)
+		amountInt = await self.__reader.readAsync(amountImage)
+		self.__recorder.record(context.timestamp, 'amount', amountImage, amountCrop)
 
 		# Read each part
-		count    = self.__analysisCount(frame)
-		players  = self.__analysisPlayerStatus(data['color'], frame)
-		unstable = self.__analysisUnstable(frame)
+		count, players, unstable = await runAnalysis(self.__analysisParts, data.color, frame, data.tracker, context.timestamp)
 
 		# Detect anomalous count
-		await self.__detectAnomalousCount(context, data, count)
+		count = await self.__detectAnomalousCount(context, data, count)
+		if wave_missing:
+			self.__recorder.dump(context.timestamp, 'wave_none')
 
 		# Send message if any of count or amount is not None, or forced wave1 fallback occurred
-		if (any([count, amountInt]) or initial_wave_forced) and not (data['wave'] == 0 and 'initial_wave_retry_count' in data and data['initial_wave_retry_count'] > 0 and not initial_wave_forced):
+		if (any([count, amountInt]) or initial_wave_forced) and not (data.wave == 0 and data.initialWaveRetryCount > 0 and not initial_wave_forced):
 			message = {
-				'color': data['color'].value.name,
-				'wave': data['wave'],
+				'color': data.color.value.name,
+				'wave': data.wave,
 				'count': count,
 				'amount': amountInt,
-				'quota': data['quota'],
+				'quota': data.quota,
 				'players': players,
 				'unstable': unstable,
 			}
@@ -331,12 +447,13 @@ class WaveScene(Scene):
 		return nearestColor
 
 	@staticmethod
-	def __getStatus(image: np.ndarray, playerIndex: int, threshold: int) -> bool:
+	def __getStatus(image: np.ndarray, playerIndex: int, scale: float, threshold: int) -> bool:
 		# Get each player image
-		left = playerIndex * 72
-		subimage = image[:, left:(left + 67)]
+		left = round(playerIndex * WaveScene.PLAYER_STRIDE * scale)
+		subimage = image[:, left:(left + round(WaveScene.PLAYER_WIDTH * scale))]
 
 		# Count color pixels
 		pixelCount = cv.countNonZero(subimage)
 
-		return pixelCount >= threshold
+		# Threshold is the pixel count at 1080p
+		return pixelCount >= threshold * scale * scale
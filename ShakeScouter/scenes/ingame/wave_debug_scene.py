@@ -4,37 +4,33 @@
 import ShakeScouter.utils.images.filters as f
 import time
 
-from typing import Any, Optional
+from typing import Optional
 
 from ShakeScouter.constants import screen
 from ShakeScouter.scenes.base import SceneContext, SceneEvent, SceneStatus
-from ShakeScouter.scenes.ingame.wave import WaveScene
+from ShakeScouter.scenes.ingame.wave import WaveData, WaveScene
 from ShakeScouter.utils.debug_io import debug_log, debug_save
 from ShakeScouter.utils import debug_flags
+from ShakeScouter.utils.executor import runAnalysis
 from ShakeScouter.utils.images import Frame, errorMAE
 from ShakeScouter.utils.images.frame import TELEMETRY_DIR
 
 
 class DebugWaveScene(WaveScene):
-	def __init__(self, reader) -> None:
-		from ShakeScouter.utils import debug_flags
-		debug_flags.WAVE_DEBUG = True
-		super().__init__(reader)
-
 	# Copy of WaveScene.analysis with additional debug logs.
-	async def analysis(self, context: SceneContext, data: Any, frame: Frame) -> SceneStatus:
+	async def analysis(self, context: SceneContext, data: WaveData, frame: Frame) -> SceneStatus:
 		initial_wave_forced = False
-		debug_log(f'[DEBUG] analysis enter: wave={data["wave"]}, ts={context.timestamp}, end={data["end"]}')
+		debug_log(f'[DEBUG] analysis enter: wave={data.wave}, ts={context.timestamp}, end={data.end}')
 
 		# In "Xtrawave"
-		if data['wave'] == 'extra':
+		if data.wave == 'extra':
 			result = await self._WaveScene__analysisXtrawave(context, data, frame)
 			return result
 
-		debug_log(f'[DEBUG] check_wave_block: ts={context.timestamp}, end={data["end"]}')
+		debug_log(f'[DEBUG] check_wave_block: ts={context.timestamp}, end={data.end}')
 
-		if context.timestamp >= data['end']:
-			debug_log(f'[DEBUG] enter_wave_block: ts={context.timestamp}, end={data["end"]}')
+		if context.timestamp >= data.end:
+			debug_log(f'[DEBUG] enter_wave_block: ts={context.timestamp}, end={data.end}')
 			# Detect "Wave"
 			waveImage = frame.apply(screen.WAVE_PART)
 			waveTextImage = screen.removeNumberAreaFromWaveImage(waveImage)
@@ -46,7 +42,7 @@ class DebugWaveScene(WaveScene):
 			if waveError > WaveScene.MIN_ERROR:
 				# Debug point (2): entering extra branch
 				debug_log('[DEBUG] ENTER_EXTRA_BRANCH')
-				data['quota'] = -1
+				data.quota = -1
 
 				# Debug point (3): before calling __analysisXtrawave
 				debug_log('[DEBUG] CALL_analysisXtrawave')
@@ -56,67 +52,64 @@ class DebugWaveScene(WaveScene):
 				return result
 
 			# Get nearest hue
-			if data['color'] is None:
+			if data.color is None:
 				playerImage = frame \
 					.subimage(screen.PLAYERS_PART['area']) \
 					.filter([
 						f.Blur((7, 7)),
 						f.HSV(),
 					])
-				data['color'] = WaveScene._WaveScene__findNearestColor(playerImage)
+				data.color = WaveScene._WaveScene__findNearestColor(playerImage)
 
 			# Read "wave"
-			waveNumberImage = waveImage[:, self._WaveScene__waveTemplate.shape[1]:]
+			waveNumberImage = waveImage[:, waveTextImage.shape[1]:]
 			if debug_flags.WAVE_DEBUG:
 				ts_str = time.strftime('%Y%m%d-%H%M%S', time.localtime(context.timestamp))
 				debug_save(TELEMETRY_DIR / f'wave_text_trim72_{ts_str}.png', waveTextImage)
 				debug_save(TELEMETRY_DIR / f'wave_number_roi_{ts_str}.png', waveNumberImage)
-			waveNumberInt = self._WaveScene__reader.read(waveNumberImage)
-			data['initial_wave_last_ocr'] = waveNumberInt
-			if data['wave'] == 0:
+			quotaImage = frame.apply(screen.QUOTA_PART)
+			waveNumberInt, quotaInt = await self._WaveScene__reader.readManyAsync([waveNumberImage, quotaImage])
+			data.initialWaveLastOcr = waveNumberInt
+			if data.wave == 0:
 				if waveNumberInt == 1:
-					data['wave'] = 1
-					data['initial_wave_retry_count'] = 0
+					data.wave = 1
+					data.initialWaveRetryCount = 0
 				else:
-					if data['initial_wave_retry_count'] < DebugWaveScene.INITIAL_WAVE_MAX_RETRY:
-						data['initial_wave_retry_count'] += 1
-						debug_log(f'[DEBUG] initial_wave_retry retry_count={data["initial_wave_retry_count"]} ocr={waveNumberInt} ts={context.timestamp}')
-					if data['initial_wave_retry_count'] >= DebugWaveScene.INITIAL_WAVE_MAX_RETRY:
-						data['wave'] = 1
+					if data.initialWaveRetryCount < DebugWaveScene.INITIAL_WAVE_MAX_RETRY:
+						data.initialWaveRetryCount += 1
+						debug_log(f'[DEBUG] initial_wave_retry retry_count={data.initialWaveRetryCount} ocr={waveNumberInt} ts={context.timestamp}')
+					if data.initialWaveRetryCount >= DebugWaveScene.INITIAL_WAVE_MAX_RETRY:
+						data.wave = 1
 						initial_wave_forced = True
-						debug_log(f'[DEBUG] initial_wave_forced_to_1 retry_count={data["initial_wave_retry_count"]} last_ocr={waveNumberInt} ts={context.timestamp}')
+						debug_log(f'[DEBUG] initial_wave_forced_to_1 retry_count={data.initialWaveRetryCount} last_ocr={waveNumberInt} ts={context.timestamp}')
 			else:
 				if waveNumberInt is not None:
-					data['wave'] = waveNumberInt
+					data.wave = waveNumberInt
 
-			# Read "quota"
-			quotaImage = frame.apply(screen.QUOTA_PART)
-			quotaInt = self._WaveScene__reader.read(quotaImage)
+			# Update "quota"
 			if quotaInt is not None:
-				data['quota'] = quotaInt
+				data.quota = quotaInt
 
 		# Read "amount"
 		amountImage = frame.apply(screen.AMOUNT_PART)
-		amountInt = self._WaveScene__reader.read(amountImage)
+		amountInt = await self._WaveScene__reader.readAsync(amountImage)
 
 		# Read each part
-		count    = self._WaveScene__analysisCount(frame)
+		count, players, unstable = await runAnalysis(self._WaveScene__analysisParts, data.color, frame, data.tracker, context.timestamp)
 		if debug_flags.WAVE_DEBUG and (count is None or count == 200):
-			debug_log(f'[DEBUG] extra_probe timestamp={context.timestamp} end={data["end"]} count={count}')
-		players  = self._WaveScene__analysisPlayerStatus(data['color'], frame)
-		unstable = self._WaveScene__analysisUnstable(frame)
+			debug_log(f'[DEBUG] extra_probe timestamp={context.timestamp} end={data.end} count={count}')
 
 		# Detect anomalous count
-		await self._WaveScene__detectAnomalousCount(context, data, count)
+		count = await self._WaveScene__detectAnomalousCount(context, data, count)
 
 		# Send message if any of count or amount is not None, or forced wave1 fallback occurred
-		if (any([count, amountInt]) or initial_wave_forced) and not (data['wave'] == 0 and 'initial_wave_retry_count' in data and data['initial_wave_retry_count'] > 0 and not initial_wave_forced):
+		if (any([count, amountInt]) or initial_wave_forced) and not (data.wave == 0 and data.initialWaveRetryCount > 0 and not initial_wave_forced):
 			message = {
-				'color': data['color'].value.name,
-				'wave': data['wave'],
+				'color': data.color.value.name,
+				'wave': data.wave,
 				'count': count,
 				'amount': amountInt,
-				'quota': data['quota'],
+				'quota': data.quota,
 				'players': players,
 				'unstable': unstable,
 			}
@@ -1,18 +1,22 @@
 # Copyright (C) 2024 mntone
 # Licensed under the GPLv3 license.
 
+import cv2 as cv
+import numpy as np
+
 from os import chdir
 from parameterized import parameterized
 from pathlib import Path
-from unittest import IsolatedAsyncioTestCase
+from unittest import IsolatedAsyncioTestCase, TestCase
 
-from ShakeScouter.constants import Color, env
+from ShakeScouter.constants import Color, env, screen
 from ShakeScouter.recognizers import selectDevice
 from ShakeScouter.recognizers.digit import DigitReader
 from ShakeScouter.scenes import SceneEvent, SceneStatus
 from ShakeScouter.scenes.ingame import WaveScene
 from ShakeScouter.scenes.contexttest import TestSceneContext
-from ShakeScouter.utils.images import Frame
+from ShakeScouter.utils.images import errorMAE, Frame
+from ShakeScouter.utils.images.model import PartInfo
 
 COLORS = [
 	Color.ORANGE,
@@ -23,6 +27,76 @@ COLORS = [
 	Color.YELLOW,
 ]
 
+# Resolutions supported by scaling the 1080p layout and templates
+RESOLUTIONS = [
+	(1280, 720),
+	(960, 540),
+]
+
+def drawText(text: str, part: PartInfo, fontScale: float, thickness: int) -> np.ndarray:
+	image = np.zeros((1080, 1920, 3), dtype=np.uint8)
+	area = part['area']
+	origin = (round(area['left'] * 1920) + 6, round(area['bottom'] * 1080) - 8)
+	cv.putText(image, text, origin, cv.FONT_HERSHEY_SIMPLEX, fontScale, (255, 255, 255), thickness)
+	return image
+
+def drawPlayers(color: Color, alive: list[bool], gegg: list[bool]) -> np.ndarray:
+	image = np.zeros((1080, 1920, 3), dtype=np.uint8)
+	hsv = np.array([[[round(color.value.hueA), 255, 255], [WaveScene.GEGG_HUE, 255, 255]]], dtype=np.uint8)
+	playerColor, geggColor = (tuple(int(c) for c in bgr) for bgr in cv.cvtColor(hsv, cv.COLOR_HSV2BGR)[0])
+	for i in range(4):
+		cx = 54 + WaveScene.PLAYER_STRIDE * i + 33
+
+		# Icons 2.5x or 0.3x of the pixel thresholds
+		cv.circle(image, (cx, 199), 22 if alive[i] else 8, playerColor, -1)
+		size = 12 if gegg[i] else 4
+		cv.rectangle(image, (cx - size, 242 - size), (cx + size - 1, 242 + size - 1), geggColor, -1)
+	return image
+
+def resize(image: np.ndarray, width: int, height: int) -> np.ndarray:
+	return cv.resize(image, (width, height), interpolation=cv.INTER_AREA)
+
+class TestWaveSceneResolution(TestCase):
+	@parameterized.expand(RESOLUTIONS)
+	def test_playerStatus(self, width: int, height: int):
+		alive = [True, False, True, True]
+		gegg  = [False, True, True, False]
+		frame = Frame(raw=resize(drawPlayers(Color.ORANGE, alive, gegg), width, height))
+
+		# Pixel thresholds scale with the area
+		playersTemplate = np.full((WaveScene.PLAYERS_SPLIT, 283), 255, dtype=np.uint8)
+		geggTemplate = np.full((WaveScene.PLAYERS_HEIGHT - WaveScene.PLAYERS_SPLIT, 283), 255, dtype=np.uint8)
+		status = WaveScene.getPlayerStatus(frame.apply(screen.PLAYERS_PART), Color.ORANGE, playersTemplate, geggTemplate)
+		self.assertEqual([s['alive'] for s in status], alive)
+		self.assertEqual([s['gegg'] for s in status], gegg)
+
+	@parameterized.expand(RESOLUTIONS)
+	def test_waveMinError(self, width: int, height: int):
+		def waveText(image: np.ndarray) -> np.ndarray:
+			return screen.removeNumberAreaFromWaveImage(Frame(raw=image).apply(screen.WAVE_PART))
+
+		template = waveText(drawText('WAVE 1', screen.WAVE_PART, 1.3, 4))
+		match = waveText(resize(drawText('WAVE 3', screen.WAVE_PART, 1.3, 4), width, height))
+		other = waveText(resize(drawText('EXTRA', screen.WAVE_PART, 1.3, 4), width, height))
+		self.assertLessEqual(errorMAE(match, template), WaveScene.MIN_ERROR)
+		self.assertGreater(errorMAE(other, template), WaveScene.MIN_ERROR)
+
+	@parameterized.expand(RESOLUTIONS)
+	def test_waveExMinError(self, width: int, height: int):
+		template = Frame(raw=drawText('EXTRA', screen.WAVE_PART, 1.3, 4)).apply(screen.WAVE_PART)
+		match = Frame(raw=resize(drawText('EXTRA', screen.WAVE_PART, 1.3, 4), width, height)).apply(screen.WAVE_PART)
+		other = Frame(raw=resize(drawText('WAVE 3', screen.WAVE_PART, 1.3, 4), width, height)).apply(screen.WAVE_PART)
+		self.assertLessEqual(errorMAE(match, template), WaveScene.MIN_ERROR)
+		self.assertGreater(errorMAE(other, template), WaveScene.MIN_ERROR)
+
+	@parameterized.expand(RESOLUTIONS)
+	def test_unstableMinError(self, width: int, height: int):
+		template = Frame(raw=drawText('UNSTABLE', screen.UNSTABLE_PART, 3.0, 8)).apply(screen.UNSTABLE_PART)
+		match = Frame(raw=resize(drawText('UNSTABLE', screen.UNSTABLE_PART, 3.0, 8), width, height)).apply(screen.UNSTABLE_PART)
+		other = Frame(raw=resize(drawText('STABLE', screen.UNSTABLE_PART, 3.0, 8), width, height)).apply(screen.UNSTABLE_PART)
+		self.assertLessEqual(errorMAE(match, template), WaveScene.MIN_ERROR)
+		self.assertGreater(errorMAE(other, template), WaveScene.MIN_ERROR)
+
 class TestWaveScene(IsolatedAsyncioTestCase):
 	@classmethod
 	def setUpClass(cls):
@@ -59,7 +133,7 @@ class TestWaveScene(IsolatedAsyncioTestCase):
 		frame = Frame(filepath=filepath)
 
 		data = self.__scene.setup()
-		data['color'] = color
+		data.color = color
 
 		ret = await self.__scene.analysis(self.__ctx, data, frame)
 		self.assertEqual(ret, SceneStatus.CONTINUE)
@@ -92,3 +166,32 @@ class TestWaveScene(IsolatedAsyncioTestCase):
 		self.assertEqual(self.__ctx.message['players'][1]['gegg'], a1)
 		self.assertEqual(self.__ctx.message['players'][2]['gegg'], a2)
 		self.assertEqual(self.__ctx.message['players'][3]['gegg'], a3)
+
+	@parameterized.expand([
+		('idle',      [],                    0, 1,       WaveScene.FAST_RATE_SCALE),
+		('countdown', [(99, 0.0), (60, 39)], 1, 1,       1.0),
+		('steady',    [(99, 0.0), (60, 39)], 4, 1,       WaveScene.SLOW_RATE_SCALE),
+		('last',      [(99, 0.0), (10, 89)], 4, 2,       WaveScene.FAST_RATE_SCALE),
+		('extra',     [(99, 0.0), (60, 39)], 4, 'extra', WaveScene.FAST_RATE_SCALE),
+	])
+	def test_rateScale(self, _: str, counts: list[tuple[int, float]], steady: int, wave, expected: float):
+		data = self.__scene.setup()
+		for value, timestamp in counts:
+			self.assertFalse(data.detector.isAnomalous(value, timestamp))
+		data.steady = steady
+		data.wave   = wave
+
+		self.assertEqual(self.__scene.rateScale(data, 0.0), expected)
+
+	async def test_recordCrop(self):
+		filepath = env.DEV_ASSET_PATH.format('other/color_orange01')
+		frame = Frame(filepath=filepath)
+
+		data = self.__scene.setup()
+		await self.__scene.analysis(self.__ctx, data, frame)
+
+		# The recorded crop is the image the filters read
+		entry = next(e for e in reversed(self.__scene.recorder.entries) if e.name == 'amount')
+		expected = frame.subimage(screen.AMOUNT_PART['area']).native
+		np.testing.assert_array_equal(entry.crop, expected)
+		np.testing.assert_array_equal(entry.image, frame.apply(screen.AMOUNT_PART))
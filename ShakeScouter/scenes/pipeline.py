@@ -3,54 +3,256 @@
 
 import ShakeScouter.scenes.utils as su
 
-from ShakeScouter.recognizers import selectDevice
-from ShakeScouter.recognizers.digit import DigitReader
+from anyio import to_thread
+from concurrent.futures import ThreadPoolExecutor
+from json import loads
+from logging import getLogger
+from os import stat
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional, TYPE_CHECKING
+
+from ShakeScouter.constants import env
 from ShakeScouter.scenes import Scene
 from ShakeScouter.scenes.matchmaking import MatchmakingScene
 from ShakeScouter.scenes.ingame import *
+from ShakeScouter.scenes.ingame.wave_debug_scene import DebugWaveScene
+from ShakeScouter.utils.executor import analysisExecutor
+from ShakeScouter.utils.images.debug import setWaveDebug
+from ShakeScouter.utils.images.manifest import checkTemplates, loadManifest
 
-def getCorePipeline(dev: str) -> Scene:
-	device = selectDevice(dev)
-	reader = DigitReader(device)
-	pipeline = \
-		su.PriorityParallel([
-			(0, su.Drop(
-				StageScene(),
-				rate=2,
-			)),
-			(1, su.Parallel([
-				su.Drop(
-					WaveScene(reader),
-					rate=2,
-				),
-				su.Drop(
-					KingScene(),
-					rate=0.5,
-				),
-			])),
-			(2, su.Drop(
-				su.Parallel(
-					[
-						ResultScene(reader),
-						ErrorScene(),
-					],
-					anyDone=True,
-				),
-				rate=1,
-			)),
-		])
-	return pipeline
+# Set up logger
+logger = getLogger(__name__)
+
+# Load torch on the first reader
+if TYPE_CHECKING:
+	from ShakeScouter.recognizers.digit import DigitReader
+
+SCENE_FACTORIES: dict[str, Callable[[Callable[[], 'DigitReader']], Scene]] = {
+	'MatchmakingScene': lambda reader: MatchmakingScene(),
+	'StageScene':       lambda reader: StageScene(),
+	'WaveScene':        lambda reader: WaveScene(reader()),
+	'DebugWaveScene':   lambda reader: DebugWaveScene(reader()),
+	'KingScene':        lambda reader: KingScene(),
+	'ResultScene':      lambda reader: ResultScene(reader()),
+	'ErrorScene':       lambda reader: ErrorScene(),
+}
+READER_SCENES = set(['WaveScene', 'DebugWaveScene', 'ResultScene'])
+
+def collectScenes(node: Any) -> Iterator[str]:
+	if isinstance(node, str):
+		yield node
+	elif isinstance(node, dict):
+		for key in ['child', 'children']:
+			if key in node:
+				yield from collectScenes(node[key])
+	elif isinstance(node, list):
+		for child in node:
+			yield from collectScenes(child)
+
+class PipelineBuilder:
+	def __init__(self, device: str, devMode: bool, quantize: str = 'none') -> None:
+		self.__device   = device
+		self.__dev      = devMode
+		self.__quantize = quantize
+		self.__reader: Optional['DigitReader'] = None
+		self.__scenes: dict[str, Scene] = {}
+		self.__waveDebug = False
+		self.__waveDebugApplied = False
+		self.__preloaded = False
+		self.__timings: dict[str, float] = {}
+
+	@property
+	def scenes(self) -> dict[str, Scene]:
+		return self.__scenes
+
+	@property
+	def timings(self) -> dict[str, float]:
+		return self.__timings
+
+	def __measure(self, name: str, fn: Callable[..., Any], *args: Any) -> None:
+		start = perf_counter()
+		fn(*args)
+		self.__timings[name] = perf_counter() - start
+
+	def __prepare(self, names: set[str]) -> None:
+		# Load model and templates concurrently
+		with ThreadPoolExecutor(max_workers=2) as executor:
+			futures = []
+			if self.__reader is None and len(names & READER_SCENES) != 0:
+				futures.append(executor.submit(self.__measure, 'model', self.__getReader))
+			if not self.__preloaded:
+				futures.append(executor.submit(self.__measure, 'templates', PipelineBuilder.__loadTemplates))
+				self.__preloaded = True
+			for future in futures:
+				future.result()
+
+	@staticmethod
+	def __loadTemplates() -> None:
+		# Warn templates built with other parts or edited after the build
+		manifest = loadManifest()
+		if manifest is not None:
+			for problem in checkTemplates(manifest):
+				logger.warning(f'{problem}. Run templates/build.py to rebuild templates.')
+
+		Scene.preloadTemplates(Scene.templateNames())
+
+	def __getReader(self) -> 'DigitReader':
+		if self.__reader is None:
+			from ShakeScouter.recognizers import selectDevice
+			from ShakeScouter.recognizers.digit import DigitReader
+			self.__reader = DigitReader(selectDevice(self.__device), self.__quantize)
+		return self.__reader
+
+	def __getScene(self, name: str) -> Scene:
+		# Reuse the loaded model and templates across builds
+		scene = self.__scenes.get(name)
+		if scene is None:
+			if name not in SCENE_FACTORIES:
+				raise ValueError(f'"scene" is unknown value: {name}')
+			scene = SCENE_FACTORIES[name](self.__getReader)
+			self.__scenes[name] = scene
+		return scene
+
+	@staticmethod
+	def __get(node: Any, key: str) -> Any:
+		if not isinstance(node, dict):
+			raise ValueError(f'Node is not an object: {node}')
+		if key not in node:
+			raise ValueError(f'"{key}" is not found in "{node.get("type")}" node')
+		return node[key]
+
+	@staticmethod
+	def __getList(node: dict[str, Any], key: str) -> list[Any]:
+		value = PipelineBuilder.__get(node, key)
+		if not isinstance(value, list):
+			raise ValueError(f'"{key}" is not a list in "{node.get("type")}" node')
+		return value
+
+	def __build(self, node: Any) -> Scene:
+		if isinstance(node, str):
+			return self.__getScene(node)
+		if not isinstance(node, dict):
+			raise ValueError(f'Node is not a scene name or an object: {node}')
+
+		get     = PipelineBuilder.__get
+		getList = PipelineBuilder.__getList
+		match node.get('type'):
+			case 'root':
+				return su.Root(self.__build(get(node, 'child')), self.__dev)
+			case 'scheduler':
+				options = {key: node[key] for key in ['budget', 'maxLoad'] if key in node}
+				return su.DropScheduler(self.__build(get(node, 'child')), devMode=self.__dev, **options)
+			case 'drop':
+				return su.Drop(self.__build(get(node, 'child')), rate=node.get('rate', 1))
+			case 'sequential':
+				return su.Sequential([self.__build(child) for child in getList(node, 'children')])
+			case 'parallel':
+				concurrent = node.get('concurrent', False)
+				if concurrent == 'auto':
+					concurrent = analysisExecutor.workers > 1
+				return su.Parallel(
+					[self.__build(child) for child in getList(node, 'children')],
+					anyDone=node.get('anyDone', False),
+					concurrent=concurrent,
+				)
+			case 'priority':
+				return su.PriorityParallel([
+					(get(child, 'priority'), self.__build(get(child, 'child')))
+					for child in getList(node, 'children')
+				])
+			case nodeType:
+				raise ValueError(f'"type" is unknown value: {nodeType}')
+
+	def build(self, spec: Any) -> Scene:
+		if not isinstance(spec, dict) or 'root' not in spec:
+			raise ValueError('"root" is not found in pipeline')
+		names = set(collectScenes(spec['root']))
+		self.__prepare(names)
+		scene = self.__build(spec['root'])
+
+		# Wave debug is switched later by applyWaveDebug
+		self.__waveDebug = 'DebugWaveScene' in names
+		return scene
+
+	def applyWaveDebug(self) -> None:
+		# Call between frames, since hooks are swapped while no worker is in Frame.apply
+		waveDebug = self.__waveDebug
+		if waveDebug:
+			setWaveDebug(True)
+		elif self.__waveDebugApplied:
+			setWaveDebug(False)
+		self.__waveDebugApplied = waveDebug
+
+class PipelineLoader:
+	CHECK_INTERVAL = 1.0
+
+	def __init__(self, filepath: str | Path, builder: PipelineBuilder) -> None:
+		self.__filepath = Path(filepath)
+		self.__builder  = builder
+		self.__mtime: Optional[int] = None
+		self.__checked  = 0.0
+
+	@property
+	def filepath(self) -> Path:
+		return self.__filepath
+
+	def __build(self) -> Scene:
+		self.__mtime = stat(self.__filepath).st_mtime_ns
+		with open(self.__filepath, 'r', encoding='utf8') as fh:
+			spec = loads(fh.read())
+		scene = self.__builder.build(spec)
+		return scene
+
+	def load(self) -> Scene:
+		scene = self.__build()
+		self.__builder.applyWaveDebug()
+		return scene
+
+	async def loadAsync(self) -> Scene:
+		# Build in a worker thread, then switch wave debug on the event loop
+		scene = await to_thread.run_sync(self.__build)
+		self.__builder.applyWaveDebug()
+		return scene
+
+	def __changed(self, timestamp: float) -> bool:
+		# Check the file at most once per interval
+		if timestamp < self.__checked + PipelineLoader.CHECK_INTERVAL:
+			return False
+		self.__checked = timestamp
+
+		try:
+			mtime = stat(self.__filepath).st_mtime_ns
+		except OSError:
+			return False
+		return mtime != self.__mtime
+
+	def __reload(self) -> Optional[Scene]:
+		# Raise ValueError if the new file is broken, and keep current pipeline
+		try:
+			scene = self.__build()
+		except OSError:
+			return None
+		return scene
+
+	def poll(self, timestamp: float) -> Optional[Scene]:
+		if not self.__changed(timestamp):
+			return None
+		scene = self.__reload()
+		if scene is not None:
+			self.__builder.applyWaveDebug()
+		return scene
+
+	async def pollAsync(self, timestamp: float) -> Optional[Scene]:
+		# Build in a worker thread, since it may load the model and templates
+		if not self.__changed(timestamp):
+			return None
+		scene = await to_thread.run_sync(self.__reload)
+		if scene is not None:
+			self.__builder.applyWaveDebug()
+		return scene
 
-def getDefaultPipeline(device: str, devMode: bool) -> Scene:
-	pipeline = \
-		su.Root(
-			su.Sequential([
-				su.Drop(
-					MatchmakingScene(),
-					rate=2,
-				),
-				getCorePipeline(device),
-			]),
-			devMode,
-		)
+def getDefaultPipeline(device: str, devMode: bool, quantize: str = 'none') -> Scene:
+	builder = PipelineBuilder(device, devMode, quantize)
+	pipeline = PipelineLoader(env.DEFAULT_PIPELINE_PATH, builder).load()
 	return pipeline
@@ -0,0 +1,159 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+from json import dumps
+from os import chdir, utime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import get_ident
+from unittest import IsolatedAsyncioTestCase
+
+import ShakeScouter.scenes.utils as su
+
+from ShakeScouter.constants import env
+from ShakeScouter.scenes import PipelineBuilder, PipelineLoader
+from ShakeScouter.scenes.ingame import WaveScene
+from ShakeScouter.scenes.ingame.wave_debug_scene import DebugWaveScene
+from ShakeScouter.utils import debug_flags
+
+class TestPipeline(IsolatedAsyncioTestCase):
+	@classmethod
+	def setUpClass(cls):
+		currentDir = Path(__file__)
+		sourceDir  = next(p for p in currentDir.parents if p.name == 'ShakeScouter')
+		chdir(sourceDir)
+
+	def tearDown(self):
+		debug_flags.WAVE_DEBUG = False
+
+	def test_default(self):
+		builder = PipelineBuilder('cpu', False)
+		scene = PipelineLoader(env.DEFAULT_PIPELINE_PATH, builder).load()
+
+		self.assertIsInstance(scene, su.Root)
+		self.assertIsInstance(scene.child, su.DropScheduler)
+		self.assertEqual(
+			[(slot.name, slot.interval) for slot in scene.child.slots],
+			[
+				('MatchmakingScene', 0.5),
+				('StageScene', 0.5),
+				('WaveScene', 0.5),
+				('KingScene', 2.0),
+				('ResultScene+ErrorScene', 1.0),
+			],
+		)
+
+	def test_reload(self):
+		builder = PipelineBuilder('cpu', False)
+		default = PipelineLoader(env.DEFAULT_PIPELINE_PATH, builder).load()
+		debug = PipelineLoader(env.WAVE_DEBUG_PIPELINE_PATH, builder).load()
+		self.assertTrue(debug_flags.WAVE_DEBUG)
+
+		# Scenes other than wave are shared
+		self.assertIsInstance(builder.scenes['WaveScene'], WaveScene)
+		self.assertIsInstance(builder.scenes['DebugWaveScene'], DebugWaveScene)
+		self.assertEqual(len(builder.scenes), 7)
+		self.assertIsNot(default, debug)
+
+		# Back to default one
+		PipelineLoader(env.DEFAULT_PIPELINE_PATH, builder).load()
+		self.assertFalse(debug_flags.WAVE_DEBUG)
+		self.assertEqual(len(builder.scenes), 7)
+
+	def test_poll(self):
+		spec = {
+			'root': {
+				'type': 'root',
+				'child': {'type': 'drop', 'rate': 2, 'child': 'StageScene'},
+			},
+		}
+		with TemporaryDirectory() as dirname:
+			filepath = Path(dirname) / 'pipeline.json'
+			filepath.write_text(dumps(spec))
+
+			loader = PipelineLoader(filepath, PipelineBuilder('cpu', True))
+			scene = loader.load()
+			self.assertEqual(scene.child.interval, 0.5)
+			self.assertIsNone(loader.poll(1.0))
+
+			# Changed file is loaded after the check interval
+			spec['root']['child']['rate'] = 4
+			filepath.write_text(dumps(spec))
+			utime(filepath, ns=(1, 1))
+			self.assertIsNone(loader.poll(1.5))
+			scene = loader.poll(2.0)
+			self.assertEqual(scene.child.interval, 0.25)
+
+			# Broken file is reported once
+			filepath.write_text('{')
+			utime(filepath, ns=(2, 2))
+			with self.assertRaises(ValueError):
+				loader.poll(3.0)
+			self.assertIsNone(loader.poll(4.0))
+
+	async def test_pollAsync(self):
+		spec = {'root': {'type': 'root', 'child': 'StageScene'}}
+		with TemporaryDirectory() as dirname:
+			filepath = Path(dirname) / 'pipeline.json'
+			filepath.write_text(dumps(spec))
+
+			builder = PipelineBuilder('cpu', True)
+			loader = PipelineLoader(filepath, builder)
+			loader.load()
+			self.assertIsNone(await loader.pollAsync(1.0))
+
+			# Rebuilt off the event loop
+			threads: list[int] = []
+			build = builder.build
+			def record(spec):
+				threads.append(get_ident())
+				return build(spec)
+			builder.build = record
+
+			spec['root']['child'] = {'type': 'drop', 'rate': 2, 'child': 'StageScene'}
+			filepath.write_text(dumps(spec))
+			utime(filepath, ns=(1, 1))
+			scene = await loader.pollAsync(2.0)
+			self.assertEqual(scene.child.interval, 0.5)
+			self.assertNotEqual(threads, [get_ident()])
+			self.assertEqual(len(threads), 1)
+
+			# Broken node raises ValueError, not TypeError
+			filepath.write_text(dumps({'root': {'type': 'priority', 'children': ['WaveScene']}}))
+			utime(filepath, ns=(2, 2))
+			with self.assertRaises(ValueError):
+				await loader.pollAsync(3.0)
+
+	async def test_waveDebugAsync(self):
+		builder = PipelineBuilder('cpu', False)
+		flags: list[bool] = []
+		build = builder.build
+		def record(spec):
+			scene = build(spec)
+			flags.append(debug_flags.WAVE_DEBUG)
+			return scene
+		builder.build = record
+
+		# Hooks are swapped on the event loop after the build
+		await PipelineLoader(env.WAVE_DEBUG_PIPELINE_PATH, builder).loadAsync()
+		self.assertEqual(flags, [False])
+		self.assertTrue(debug_flags.WAVE_DEBUG)
+
+		await PipelineLoader(env.DEFAULT_PIPELINE_PATH, builder).loadAsync()
+		self.assertEqual(flags, [False, True])
+		self.assertFalse(debug_flags.WAVE_DEBUG)
+
+	def test_invalid(self):
+		builder = PipelineBuilder('cpu', False)
+		for spec in [
+			{},
+			{'root': 'UnknownScene'},
+			{'root': {'type': 'unknown'}},
+			{'root': {'type': 'drop', 'rate': 2}},
+			{'root': {'type': 'priority', 'children': [{'child': 'StageScene'}]}},
+			{'root': {'type': 'priority', 'children': ['StageScene']}},
+			{'root': {'type': 'sequential', 'children': 1}},
+			[],
+		]:
+			with self.assertRaises(ValueError):
+				builder.build(spec)
@@ -1,8 +1,9 @@
 # Copyright (C) 2024 mntone
 # Licensed under the GPLv3 license.
 
-from ShakeScouter.scenes.utils.drop import Drop
-from ShakeScouter.scenes.utils.parallel import Parallel
-from ShakeScouter.scenes.utils.priorityparallel import PriorityParallel
+from ShakeScouter.scenes.utils.drop import Drop, DropData
+from ShakeScouter.scenes.utils.parallel import Parallel, ParallelData
+from ShakeScouter.scenes.utils.priorityparallel import PriorityParallel, PriorityParallelData
 from ShakeScouter.scenes.utils.root import Root
-from ShakeScouter.scenes.utils.sequential import Sequential
+from ShakeScouter.scenes.utils.scheduler import DropScheduler, ScheduleSlot, SchedulerData, SlotState
+from ShakeScouter.scenes.utils.sequential import Sequential, SequentialData
@@ -1,35 +1,66 @@
 # Copyright (C) 2024 mntone
 # Licensed under the GPLv3 license.
 
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Optional, TYPE_CHECKING
 
 from ShakeScouter.scenes import Scene, SceneContext, SceneStatus
 from ShakeScouter.utils.images import Frame
 
+if TYPE_CHECKING:
+	from ShakeScouter.scenes.utils.scheduler import DropScheduler
+
+@dataclass(slots=True)
+class DropData:
+	cache: SceneStatus
+	next: float
+	child: Any
+
 class Drop(Scene):
 	def __init__(self, child: Scene, rate: float = 1) -> None:
 		self.__child = child
 		self.__diff  = 1 / rate
 
-	def setup(self) -> Any:
-		data = {
-			'cache': SceneStatus.FALSE,
-			'next':  0,
+		# Deadlines owned by DropScheduler
+		self.__scheduler: Optional['DropScheduler'] = None
+		self.__slot = 0
 
-			'child': self.__child.setup(),
-		}
-		return data
+	@property
+	def child(self) -> Scene:
+		return self.__child
 
-	def reset(self, data: Any) -> None:
-		data['cache'] = SceneStatus.FALSE
-		data['next']  = 0
-		self.__child.reset(data['child'])
+	@property
+	def interval(self) -> float:
+		return self.__diff
+
+	def schedule(self, scheduler: 'DropScheduler', slot: int) -> None:
+		self.__scheduler = scheduler
+		self.__slot      = slot
+
+	def setup(self) -> DropData:
+		data = DropData(
+			cache=SceneStatus.FALSE,
+			next=0,
+			child=self.__child.setup(),
+		)
+		return data
 
-	async def analysis(self, context: SceneContext, data: Any, frame: Frame) -> SceneStatus:
-		next = data['next']
+	def reset(self, data: DropData) -> None:
+		data.cache = SceneStatus.FALSE
+		data.next  = 0
+		if self.__scheduler is not None:
+			self.__scheduler.resetSlot(self.__slot)
+		self.__child.reset(data.child)
 
-		if context.timestamp >= next:
-			data['cache'] = await self.__child.analysis(context, data['child'], frame)
-			data['next']  = context.timestamp + self.__diff
+	async def analysis(self, context: SceneContext, data: DropData, frame: Frame) -> SceneStatus:
+		scheduler = self.__scheduler
+		if scheduler is None:
+			if context.timestamp >= data.next:
+				data.cache = await self.__child.analysis(context, data.child, frame)
+				data.next  = context.timestamp + self.__diff / self.__child.rateScale(data.child, context.timestamp)
+		elif scheduler.due(self.__slot, context.timestamp):
+			start = scheduler.clock()
+			data.cache = await self.__child.analysis(context, data.child, frame)
+			scheduler.complete(self.__slot, context.timestamp, start, self.__child.rateScale(data.child, context.timestamp))
 
-		return data['cache']
+		return data.cache
@@ -1,46 +1,91 @@
 # Copyright (C) 2024 mntone
 # Licensed under the GPLv3 license.
 
-from typing import Any
+from anyio import create_task_group
+from dataclasses import dataclass
+from typing import Any, Optional
 
 from ShakeScouter.scenes import Scene, SceneContext, SceneStatus
+from ShakeScouter.scenes.context import BufferedSceneContext
 from ShakeScouter.utils.images import Frame
 
+@dataclass(slots=True)
+class ParallelData:
+	stop: bool
+	data: Any
+
 class Parallel(Scene):
-	def __init__(self, children: list[Scene], anyDone: bool = False) -> None:
-		self.__children = children
-		self.__check    = any if anyDone else all
+	def __init__(self, children: list[Scene], anyDone: bool = False, concurrent: bool = False) -> None:
+		self.__children   = children
+		self.__check      = any if anyDone else all
+		self.__concurrent = concurrent
+
+	@property
+	def children(self) -> list[Scene]:
+		return self.__children
 
-	def setup(self) -> Any:
+	def setup(self) -> list[ParallelData]:
 		data = [
-			{
-				'stop': False,
-				'data': c.setup(),
-			}
+			ParallelData(
+				stop=False,
+				data=c.setup(),
+			)
 			for c in self.__children
 		]
 		return data
 
-	def reset(self, data: Any) -> None:
+	def reset(self, data: list[ParallelData]) -> None:
 		for i, c in enumerate(self.__children):
-			data[i]['stop'] = False
-			c.reset(data[i]['data'])
+			data[i].stop = False
+			c.reset(data[i].data)
 
-	async def analysis(self, context: SceneContext, data: Any, frame: Frame) -> SceneStatus:
+	async def __analysisSequential(self, context: SceneContext, data: list[ParallelData], frame: Frame) -> None:
 		for i, scene in enumerate(self.__children):
 			d = data[i]
 
-			if d['stop']:
+			if d.stop:
 				continue
 
 			# Analysis frame
-			result = await scene.analysis(context, d['data'], frame)
+			result = await scene.analysis(context, d.data, frame)
 
 			# Handle result
 			if result == SceneStatus.DONE:
-				d['stop'] = True
+				d.stop = True
+
+	async def __analysisConcurrent(self, context: SceneContext, data: list[ParallelData], frame: Frame) -> None:
+		contexts: list[Optional[BufferedSceneContext]] = [None] * len(self.__children)
+		results: list[Optional[SceneStatus]] = [None] * len(self.__children)
+
+		async def run(index: int, scene: Scene, d: ParallelData):
+			contexts[index] = BufferedSceneContext(context)
+			results[index] = await scene.analysis(contexts[index], d.data, frame)
+
+		# Analysis frame
+		async with create_task_group() as tg:
+			for i, scene in enumerate(self.__children):
+				if not data[i].stop:
+					tg.start_soon(run, i, scene, data[i])
+
+		# Send events in children order
+		for i, ctx in enumerate(contexts):
+			if ctx is None:
+				continue
+
+			await ctx.flush()
+
+			# Handle result
+			if results[i] == SceneStatus.DONE:
+				data[i].stop = True
+
+	async def analysis(self, context: SceneContext, data: list[ParallelData], frame: Frame) -> SceneStatus:
+		# Run concurrently only when two or more children are active
+		if self.__concurrent and sum(not d.stop for d in data) > 1:
+			await self.__analysisConcurrent(context, data, frame)
+		else:
+			await self.__analysisSequential(context, data, frame)
 
-		if self.__check(d['stop'] for d in data):
+		if self.__check(d.stop for d in data):
 			return SceneStatus.DONE
 		else:
 			return SceneStatus.CONTINUE
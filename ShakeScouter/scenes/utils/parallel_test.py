@@ -3,7 +3,7 @@
 
 from unittest import IsolatedAsyncioTestCase
 
-from ShakeScouter.scenes import SceneStatus
+from ShakeScouter.scenes import SceneEvent, SceneStatus
 from ShakeScouter.scenes.contexttest import TestSceneContext
 from ShakeScouter.scenes.utils import Parallel
 from ShakeScouter.scenes.utils.test import *
@@ -22,8 +22,8 @@ class TestParallelScene(IsolatedAsyncioTestCase):
 		data = scene.setup()
 		ret = await scene.analysis(self.__ctx, data, None)
 		self.assertEqual(ret, SceneStatus.DONE)
-		self.assertEqual(data[0]['stop'], True)
-		self.assertEqual(data[1]['stop'], True)
+		self.assertEqual(data[0].stop, True)
+		self.assertEqual(data[1].stop, True)
 
 	async def test_analysisDone(self):
 		scene = Parallel([
@@ -36,13 +36,58 @@ class TestParallelScene(IsolatedAsyncioTestCase):
 		# count = 1
 		ret = await scene.analysis(self.__ctx, data, None)
 		self.assertEqual(ret, SceneStatus.CONTINUE)
-		self.assertEqual(data[0]['stop'], True)
-		self.assertEqual(data[1]['stop'], False)
-		self.assertEqual(data[1]['data']['count'], 0)
+		self.assertEqual(data[0].stop, True)
+		self.assertEqual(data[1].stop, False)
+		self.assertEqual(data[1].data['count'], 0)
 
 		# count = 0
 		ret = await scene.analysis(self.__ctx, data, None)
 		self.assertEqual(ret, SceneStatus.DONE)
-		self.assertEqual(data[0]['stop'], True)
-		self.assertEqual(data[1]['stop'], True)
-		self.assertEqual(data[1]['data']['count'], 0)
+		self.assertEqual(data[0].stop, True)
+		self.assertEqual(data[1].stop, True)
+		self.assertEqual(data[1].data['count'], 0)
+
+	async def test_analysisConcurrentDone(self):
+		scene = Parallel([
+			TestScene(SceneStatus.DONE),
+			CountDownTestScene(1),
+		], concurrent=True)
+
+		data = scene.setup()
+
+		# count = 1
+		ret = await scene.analysis(self.__ctx, data, None)
+		self.assertEqual(ret, SceneStatus.CONTINUE)
+		self.assertEqual(data[0].stop, True)
+		self.assertEqual(data[1].stop, False)
+		self.assertEqual(data[1].data['count'], 0)
+
+		# count = 0
+		ret = await scene.analysis(self.__ctx, data, None)
+		self.assertEqual(ret, SceneStatus.DONE)
+		self.assertEqual(data[0].stop, True)
+		self.assertEqual(data[1].stop, True)
+
+	async def test_analysisConcurrentAnyDone(self):
+		scene = Parallel([
+			CountDownTestScene(2),
+			CountDownTestScene(0),
+		], anyDone=True, concurrent=True)
+
+		data = scene.setup()
+		ret = await scene.analysis(self.__ctx, data, None)
+		self.assertEqual(ret, SceneStatus.DONE)
+		self.assertEqual(data[0].stop, False)
+		self.assertEqual(data[1].stop, True)
+
+	async def test_analysisConcurrentOrder(self):
+		# The first child finishes last, but its event is sent first
+		scene = Parallel([
+			SendTestScene(SceneEvent.GAME_KING, {'king': 'first'}, delay=0.05),
+			SendTestScene(SceneEvent.GAME_KING, {'king': 'second'}),
+		], concurrent=True)
+
+		data = scene.setup()
+		ret = await scene.analysis(self.__ctx, data, None)
+		self.assertEqual(ret, SceneStatus.DONE)
+		self.assertEqual(self.__ctx.message['king'], 'second')
@@ -1,55 +1,64 @@
 # Copyright (C) 2024 mntone
 # Licensed under the GPLv3 license.
 
-from copy import copy
-from heapq import heapify, heappop
+from bisect import bisect_left
+from dataclasses import dataclass
 from typing import Any
 
 from ShakeScouter.scenes import Scene, SceneContext, SceneStatus
 from ShakeScouter.utils.images import Frame
 
+@dataclass(slots=True)
+class PriorityParallelData:
+	priority: int
+	children: list[Any]
+
 class PriorityParallel(Scene):
 	def __init__(self, children: list[tuple[int, Scene]]) -> None:
 		self.__children = children
 		self.__maxPrio  = max(p[0] for p in children)
 
-	def setup(self) -> Any:
-		data = {
-			'priority': -1,
-			'children': [c.setup() for _, c in self.__children],
-		}
+		# Dispatch table sorted by priority: (priority, data index, scene)
+		self.__table = sorted(
+			((p, i, scene) for i, (p, scene) in enumerate(children)),
+			key=lambda entry: entry[0],
+		)
+		self.__priorities = [entry[0] for entry in self.__table]
+
+	@property
+	def children(self) -> list[tuple[int, Scene]]:
+		return self.__children
+
+	def setup(self) -> PriorityParallelData:
+		data = PriorityParallelData(
+			priority=-1,
+			children=[c.setup() for _, c in self.__children],
+		)
 		return data
 
-	def reset(self, data: Any) -> None:
-		data['priority'] = -1
+	def reset(self, data: PriorityParallelData) -> None:
+		data.priority = -1
 
 		for i, c in enumerate(self.__children):
-			c[1].reset(data['children'][i])
+			c[1].reset(data.children[i])
 
-	async def analysis(self, context: SceneContext, data: Any, frame: Frame) -> SceneStatus:
-		# Init priority queue
-		prio = copy(self.__children)
-		heapify(prio)
+	async def analysis(self, context: SceneContext, data: PriorityParallelData, frame: Frame) -> SceneStatus:
+		# Skip priority tiers below current priority
+		start = bisect_left(self.__priorities, data.priority)
 
-		for _ in range(len(prio)):
-			# Get current scene
-			p, scene = heappop(prio)
-
-			# Return if priority is exceeded
-			if p < data['priority']:
+		for p, dataIndex, scene in self.__table[start:]:
+			# Skip if priority is exceeded during this frame
+			if p < data.priority:
 				continue
 
-			# Get data index
-			dataIndex = self.__children.index((p, scene))
-
 			# Analysis frame
-			result = await scene.analysis(context, data['children'][dataIndex], frame)
+			result = await scene.analysis(context, data.children[dataIndex], frame)
 
 			# Handle result
 			if result == SceneStatus.DONE:
-				data['priority'] = p + 1
+				data.priority = p + 1
 
-		if data['priority'] >= self.__maxPrio:
+		if data.priority >= self.__maxPrio:
 			return SceneStatus.DONE
 		else:
 			return SceneStatus.CONTINUE
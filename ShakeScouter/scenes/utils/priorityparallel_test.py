@@ -20,15 +20,53 @@ class TestPriorityParallelScene(IsolatedAsyncioTestCase):
 		])
 
 		data = scene.setup()
-		self.assertEqual(data['priority'], -1)
-		self.assertEqual(data['children'][1]['count'], 1)
+		self.assertEqual(data.priority, -1)
+		self.assertEqual(data.children[1]['count'], 1)
 
 		ret = await scene.analysis(self.__ctx, data, None)
 		self.assertEqual(ret, SceneStatus.CONTINUE)
-		self.assertEqual(data['priority'], -1)
-		self.assertEqual(data['children'][1]['count'], 0)
+		self.assertEqual(data.priority, -1)
+		self.assertEqual(data.children[1]['count'], 0)
 
 		ret = await scene.analysis(self.__ctx, data, None)
 		self.assertEqual(ret, SceneStatus.DONE)
-		self.assertEqual(data['priority'], 2)
-		self.assertEqual(data['children'][1]['count'], 0)
+		self.assertEqual(data.priority, 2)
+		self.assertEqual(data.children[1]['count'], 0)
+
+	async def test_analysisSamePriority(self):
+		scene = PriorityParallel([
+			(1, CountDownTestScene(1)),
+			(0, TestScene(SceneStatus.CONTINUE)),
+			(1, CountDownTestScene(2)),
+		])
+
+		data = scene.setup()
+
+		ret = await scene.analysis(self.__ctx, data, None)
+		self.assertEqual(ret, SceneStatus.CONTINUE)
+		self.assertEqual(data.children[0]['count'], 0)
+		self.assertEqual(data.children[2]['count'], 1)
+
+		# Skip the rest of the tier once a scene is done
+		ret = await scene.analysis(self.__ctx, data, None)
+		self.assertEqual(ret, SceneStatus.DONE)
+		self.assertEqual(data.priority, 2)
+		self.assertEqual(data.children[2]['count'], 1)
+
+	async def test_analysisSkipTiers(self):
+		scene = PriorityParallel([
+			(0, CountDownTestScene(0)),
+			(1, CountDownTestScene(5)),
+			(2, CountDownTestScene(5)),
+			(3, CountDownTestScene(5)),
+		])
+
+		data = scene.setup()
+		data.priority = 2
+
+		ret = await scene.analysis(self.__ctx, data, None)
+		self.assertEqual(ret, SceneStatus.CONTINUE)
+		self.assertEqual(data.children[0]['count'], 0)
+		self.assertEqual(data.children[1]['count'], 5)
+		self.assertEqual(data.children[2]['count'], 4)
+		self.assertEqual(data.children[3]['count'], 4)
@@ -11,6 +11,10 @@ class Root(Scene):
 		self.__child = child
 		self.__dev   = devMode
 
+	@property
+	def child(self) -> Scene:
+		return self.__child
+
 	def setup(self) -> Any:
 		data = self.__child.setup()
 		return data
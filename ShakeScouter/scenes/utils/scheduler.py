@@ -0,0 +1,262 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+from dataclasses import dataclass, field
+from math import floor
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional
+
+from ShakeScouter.scenes import Scene, SceneContext, SceneEvent, SceneStatus
+from ShakeScouter.scenes.utils.drop import Drop
+from ShakeScouter.scenes.utils.parallel import Parallel
+from ShakeScouter.scenes.utils.priorityparallel import PriorityParallel
+from ShakeScouter.scenes.utils.root import Root
+from ShakeScouter.scenes.utils.sequential import Sequential
+from ShakeScouter.utils.images import Frame
+
+@dataclass(slots=True)
+class ScheduleSlot:
+	name: str
+	interval: float
+	phase: float = 0.0
+
+@dataclass(slots=True)
+class SlotState:
+	period: float          # interval with rate scale and backoff
+	deadline: float = 0.0  # 0 until the first run
+	runs: int = 0
+	deferred: int = 0
+	missed: int = 0
+	elapsed: float = 0.0
+
+@dataclass(slots=True)
+class SchedulerData:
+	child: Any
+	slots: list[SlotState]
+
+	# Frame state
+	epoch: Optional[float] = None
+	spent: float = 0.0
+	deferred: list[str] = field(default_factory=list)
+	missed: list[str] = field(default_factory=list)
+
+	# Load state
+	window: Optional[float] = None
+	work: float = 0.0
+	load: float = 0.0
+	backoff: float = 1.0
+	reported: float = 1.0
+
+def childScenes(scene: Scene) -> list[Scene]:
+	if isinstance(scene, (Root, Drop)):
+		return [scene.child]
+	if isinstance(scene, (Sequential, Parallel)):
+		return scene.children
+	if isinstance(scene, PriorityParallel):
+		return [child for _, child in scene.children]
+	return []
+
+def findDrops(scene: Scene) -> Iterator[Drop]:
+	# Outermost drops only, inner ones run in the time of the outer one
+	if isinstance(scene, Drop):
+		yield scene
+		return
+
+	for child in childScenes(scene):
+		yield from findDrops(child)
+
+def leafNames(scene: Scene) -> list[str]:
+	children = childScenes(scene)
+	if len(children) == 0:
+		return [type(scene).__name__]
+	return [name for child in children for name in leafNames(child)]
+
+class DropScheduler(Scene):
+	LOAD_WINDOW  = 2.0
+	BACKOFF_STEP = 1.25
+	MAX_BACKOFF  = 4.0
+
+	def __init__(
+		self,
+		child: Scene,
+		budget: float = 1 / 60,
+		maxLoad: Optional[float] = 0.5,
+		devMode: bool = False,
+		clock: Callable[[], float] = perf_counter,
+	) -> None:
+		self.__child   = child
+		self.__budget  = budget
+		self.__maxLoad = maxLoad
+		self.__dev     = devMode
+		self.__clock   = clock
+
+		# Take over deadlines of drops
+		drops = list(findDrops(child))
+		self.__slots = [
+			ScheduleSlot('+'.join(leafNames(drop.child)), drop.interval)
+			for drop in drops
+		]
+
+		# Spread phases evenly over the shortest interval
+		if len(drops) != 0:
+			step = min(slot.interval for slot in self.__slots) / len(drops)
+			for i, (drop, slot) in enumerate(zip(drops, self.__slots)):
+				slot.phase = i * step
+				drop.schedule(self, i)
+
+		# Data of the frame under analysis
+		self.__data: Optional[SchedulerData] = None
+
+	@property
+	def child(self) -> Scene:
+		return self.__child
+
+	@property
+	def budget(self) -> float:
+		return self.__budget
+
+	@property
+	def clock(self) -> Callable[[], float]:
+		return self.__clock
+
+	@property
+	def slots(self) -> list[ScheduleSlot]:
+		return self.__slots
+
+	def setup(self) -> SchedulerData:
+		data = SchedulerData(
+			child=self.__child.setup(),
+			slots=[SlotState(period=slot.interval) for slot in self.__slots],
+		)
+		return data
+
+	def reset(self, data: SchedulerData) -> None:
+		data.slots = [SlotState(period=slot.interval) for slot in self.__slots]
+		data.epoch    = None
+		data.spent    = 0.0
+		data.deferred = []
+		data.missed   = []
+		data.window   = None
+		data.work     = 0.0
+		data.load     = 0.0
+		data.backoff  = 1.0
+		data.reported = 1.0
+		self.__child.reset(data.child)
+
+	def resetSlot(self, index: int) -> None:
+		# Due on the next frame
+		if self.__data is not None:
+			self.__data.slots[index].deadline = 0
+
+	def due(self, index: int, timestamp: float) -> bool:
+		data  = self.__data
+		assert data is not None
+		slot  = self.__slots[index]
+		state = data.slots[index]
+		if timestamp < state.deadline:
+			return False
+
+		# Due from now on the first run
+		if state.deadline == 0:
+			state.deadline = timestamp
+
+		# Defer to a later frame while within the interval
+		late = timestamp - state.deadline
+		if late < state.period:
+			if data.spent >= self.__budget:
+				state.deferred += 1
+				data.deferred.append(slot.name)
+				return False
+		else:
+			state.missed += 1
+			data.missed.append(slot.name)
+
+		return True
+
+	def complete(self, index: int, timestamp: float, start: float, scale: float = 1.0) -> None:
+		data  = self.__data
+		assert data is not None
+		slot  = self.__slots[index]
+		state = data.slots[index]
+		elapsed = self.__clock() - start
+		data.spent    += elapsed
+		state.runs    += 1
+		state.elapsed += elapsed
+
+		# Next deadline on the grid of the slot
+		state.period = data.backoff * slot.interval / scale
+		base = (data.epoch or 0.0) + slot.phase
+		state.deadline = base + (floor((timestamp - base) / state.period) + 1) * state.period
+
+	def __updateLoad(self, data: SchedulerData, timestamp: float, elapsed: float) -> None:
+		data.work += elapsed
+		if data.window is None:
+			data.window = timestamp
+			return
+
+		# Load is the ratio of analysis time to wall time in each window
+		wall = timestamp - data.window
+		if wall < DropScheduler.LOAD_WINDOW:
+			return
+		data.load   = data.work / wall
+		data.work   = 0.0
+		data.window = timestamp
+
+		# Back off all rates while the load is too high
+		if self.__maxLoad is None:
+			return
+		if data.load > self.__maxLoad:
+			data.backoff = min(data.backoff * DropScheduler.BACKOFF_STEP, DropScheduler.MAX_BACKOFF)
+		elif data.load < self.__maxLoad / DropScheduler.BACKOFF_STEP:
+			data.backoff = max(data.backoff / DropScheduler.BACKOFF_STEP, 1.0)
+
+	async def analysis(self, context: SceneContext, data: SchedulerData, frame: Frame) -> SceneStatus:
+		# Start schedule at the first frame
+		if data.epoch is None:
+			data.epoch = context.timestamp
+			if self.__dev:
+				await context.sendImmediately(SceneEvent.DEV_SCHEDULE, {
+					'budget': self.__budget,
+					'slots': [
+						{
+							'name': slot.name,
+							'rate': 1 / slot.interval,
+							'phase': slot.phase,
+						}
+						for slot in self.__slots
+					],
+				})
+
+		# Start frame
+		start = self.__clock()
+		data.spent = 0.0
+		data.deferred.clear()
+		data.missed.clear()
+
+		# Analysis frame
+		self.__data = data
+		try:
+			result = await self.__child.analysis(context, data.child, frame)
+		finally:
+			self.__data = None
+		self.__updateLoad(data, context.timestamp, self.__clock() - start)
+
+		# Report overload
+		if self.__dev and (len(data.deferred) != 0 or len(data.missed) != 0):
+			await context.sendImmediately(SceneEvent.DEV_SCHEDULE, {
+				'spent': data.spent,
+				'deferred': list(data.deferred),
+				'missed': list(data.missed),
+			})
+
+		# Report backoff
+		changed   = abs(data.backoff - data.reported) >= 0.25
+		recovered = data.backoff == 1.0 and data.reported != 1.0
+		if self.__dev and (changed or recovered):
+			data.reported = data.backoff
+			await context.sendImmediately(SceneEvent.DEV_SCHEDULE, {
+				'load': data.load,
+				'backoff': data.backoff,
+			})
+
+		return result
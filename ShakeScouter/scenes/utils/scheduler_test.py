@@ -0,0 +1,208 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+from typing import Any
+from unittest import IsolatedAsyncioTestCase
+
+from ShakeScouter.scenes import Scene, SceneContext, SceneEvent, SceneStatus
+from ShakeScouter.scenes.contexttest import ReplaySceneContext
+from ShakeScouter.scenes.utils import Drop, DropScheduler, Parallel, Root, Sequential
+from ShakeScouter.scenes.utils.test import *
+
+class FakeClock:
+	def __init__(self) -> None:
+		self.now = 0.0
+
+	def __call__(self) -> float:
+		return self.now
+
+class CostTestScene(Scene):
+	def __init__(self, clock: FakeClock, cost: float, scale: float = 1.0) -> None:
+		self.__clock = clock
+		self.__cost  = cost
+		self.__scale = scale
+
+	def setup(self) -> Any:
+		data = {
+			'frames': [],
+		}
+		return data
+
+	def reset(self, data: Any) -> None:
+		data['frames'].clear()
+
+	def rateScale(self, data: Any, timestamp: float) -> float:
+		return self.__scale
+
+	async def analysis(self, context: SceneContext, data: Any, frame: Any) -> SceneStatus:
+		self.__clock.now += self.__cost
+		data['frames'].append(frame)
+		return SceneStatus.FALSE
+
+class PhaseTestScene(CostTestScene):
+	def __init__(self, clock: FakeClock, switch: float) -> None:
+		super().__init__(clock, 0.0)
+		self.__switch = switch
+		self.timestamps: list[float] = []
+
+	def rateScale(self, data: Any, timestamp: float) -> float:
+		# Fast phase, then slow phase (like WaveScene in the middle of a wave)
+		return 2.0 if timestamp < self.__switch else 0.5
+
+	async def analysis(self, context: SceneContext, data: Any, frame: Any) -> SceneStatus:
+		self.timestamps.append(context.timestamp)
+		return await super().analysis(context, data, frame)
+
+class TestDropScheduler(IsolatedAsyncioTestCase):
+	async def replay(self, scene: Scene, context: ReplaySceneContext, frames: int) -> Any:
+		data = scene.setup()
+		for frame in range(frames):
+			await scene.analysis(context, data, frame)
+		return data
+
+	def test_phases(self):
+		scheduler = DropScheduler(Sequential([
+			Drop(TestScene(SceneStatus.DONE), rate=2),
+			Parallel([
+				Drop(TestScene(SceneStatus.FALSE), rate=2),
+				Drop(Parallel([TestScene(SceneStatus.FALSE), CountDownTestScene(1)]), rate=0.5),
+			]),
+		]))
+
+		slots = scheduler.slots
+		self.assertEqual([slot.name for slot in slots], ['TestScene', 'TestScene', 'TestScene+CountDownTestScene'])
+		self.assertEqual([slot.interval for slot in slots], [0.5, 0.5, 2.0])
+		self.assertEqual([slot.phase for slot in slots], [0.0, 0.5 / 3, 1 / 3])
+
+	async def test_spread(self):
+		clock = FakeClock()
+		children = [CostTestScene(clock, 0.001) for _ in range(3)]
+		scene = Root(DropScheduler(
+			Parallel([Drop(child, rate=2) for child in children]),
+			clock=clock,
+		))
+
+		data = await self.replay(scene, ReplaySceneContext(interval=1 / 30), 95)
+		frames = [set(d.data.child['frames']) for d in data.child]
+
+		# Same rate, but never in the same frame after the first run
+		self.assertEqual([len(f) for f in frames], [7, 7, 7])
+		self.assertEqual(frames[0] & frames[1], {0})
+		self.assertEqual(frames[1] & frames[2], {0})
+		self.assertEqual(frames[0] & frames[2], {0})
+
+	async def test_budget(self):
+		clock = FakeClock()
+		scene = Root(DropScheduler(
+			Parallel([
+				Drop(CostTestScene(clock, 0.010), rate=2),
+				Drop(CostTestScene(clock, 0.010), rate=2),
+			]),
+			budget=0.005,
+			devMode=True,
+			clock=clock,
+		))
+
+		context = ReplaySceneContext(interval=1 / 30)
+		data = await self.replay(scene, context, 2)
+		self.assertEqual([d.data.child['frames'] for d in data.child], [[0], [1]])
+
+		messages = [m for m in context.messages if m['event'] == SceneEvent.DEV_SCHEDULE.value]
+		self.assertEqual(messages[0]['budget'], 0.005)
+		self.assertEqual([slot['rate'] for slot in messages[0]['slots']], [2.0, 2.0])
+		self.assertEqual(messages[1]['deferred'], ['CostTestScene'])
+		self.assertEqual(messages[1]['missed'], [])
+		self.assertEqual(len(messages), 2)
+
+	async def test_missed(self):
+		clock = FakeClock()
+		drop = Drop(CostTestScene(clock, 0.0), rate=2)
+		scheduler = DropScheduler(drop, devMode=True, clock=clock)
+
+		# 1 fps is slower than the deadline interval
+		context = ReplaySceneContext(interval=1)
+		data = await self.replay(Root(scheduler), context, 4)
+
+		messages = [m for m in context.messages if m['event'] == SceneEvent.DEV_SCHEDULE.value]
+		self.assertEqual([m['missed'] for m in messages[1:]], [['CostTestScene']] * 3)
+		self.assertEqual(data.slots[0].runs, 4)
+		self.assertEqual(data.slots[0].missed, 3)
+
+	async def test_reset(self):
+		clock = FakeClock()
+		drop = Drop(CostTestScene(clock, 0.0), rate=1)
+		scheduler = DropScheduler(drop, clock=clock)
+		context = ReplaySceneContext()
+		data = await self.replay(Root(scheduler), context, 2)
+		self.assertGreater(data.slots[0].deadline, context.timestamp)
+		self.assertIsNotNone(data.epoch)
+
+		scheduler.reset(data)
+		self.assertEqual(data.slots[0].deadline, 0)
+		self.assertIsNone(data.epoch)
+		self.assertEqual(data.child.next, 0)
+
+	async def test_rebuild(self):
+		clock = FakeClock()
+		drop = Drop(CostTestScene(clock, 0.300), rate=2)
+		scheduler = DropScheduler(drop, maxLoad=0.25, clock=clock)
+		data = await self.replay(Root(scheduler), ReplaySceneContext(interval=1 / 30), 30 * 10)
+		self.assertGreater(data.backoff, 1.0)
+
+		# New data of the same instances starts without the previous load
+		data = scheduler.setup()
+		self.assertEqual((data.load, data.backoff, data.epoch), (0.0, 1.0, None))
+		self.assertEqual(data.slots[0].deadline, 0)
+
+	async def test_rateScale(self):
+		clock = FakeClock()
+		children = [CostTestScene(clock, 0.0, scale) for scale in [0.5, 1.0, 2.0]]
+
+		# Same for drops with and without scheduler
+		for scene in [
+			Root(Parallel([Drop(child, rate=2) for child in children])),
+			Root(DropScheduler(Parallel([Drop(child, rate=2) for child in children]), clock=clock)),
+		]:
+			data = await self.replay(scene, ReplaySceneContext(interval=1 / 30), 300)
+			if isinstance(scene.child, DropScheduler):
+				data = data.child
+			for d, expected in zip(data, [10, 20, 40]):
+				self.assertAlmostEqual(len(d.data.child['frames']), expected, delta=2)
+
+	async def test_rateScaleChange(self):
+		clock = FakeClock()
+		for useScheduler in [False, True]:
+			child = PhaseTestScene(clock, 5.0)
+			drop = Drop(child, rate=2)
+			scene = Root(DropScheduler(drop, clock=clock) if useScheduler else drop)
+			await self.replay(scene, ReplaySceneContext(interval=1 / 30), 300)
+
+			# 4 runs per second before the switch, 1 run per second after it
+			timestamps = child.timestamps
+			self.assertAlmostEqual(len([t for t in timestamps if t < 5.0]), 20, delta=1)
+			self.assertAlmostEqual(len([t for t in timestamps if t >= 5.5]), 5, delta=1)
+
+	async def test_backoff(self):
+		clock = FakeClock()
+		drop = Drop(CostTestScene(clock, 0.300), rate=2)
+		scheduler = DropScheduler(drop, maxLoad=0.25, devMode=True, clock=clock)
+
+		# 60% of wall time without backoff
+		context = ReplaySceneContext(interval=1 / 30)
+		data = await self.replay(Root(scheduler), context, 30 * 60)
+		self.assertGreater(data.backoff, 1.0)
+		self.assertLess(len(data.child.child['frames']), 60)
+
+		messages = [m for m in context.messages if 'backoff' in m]
+		self.assertGreater(len(messages), 0)
+
+	async def test_noBackoff(self):
+		clock = FakeClock()
+		drop = Drop(CostTestScene(clock, 0.100), rate=2)
+		scheduler = DropScheduler(drop, maxLoad=0.25, clock=clock)
+
+		# 20% of wall time
+		data = await self.replay(Root(scheduler), ReplaySceneContext(interval=1 / 30), 30 * 60)
+		self.assertAlmostEqual(data.load, 0.2, delta=0.01)
+		self.assertEqual(data.backoff, 1.0)
+		self.assertEqual(len(data.child.child['frames']), 120)
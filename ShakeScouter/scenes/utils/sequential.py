@@ -1,37 +1,47 @@
 # Copyright (C) 2024 mntone
 # Licensed under the GPLv3 license.
 
+from dataclasses import dataclass
 from typing import Any
 
 from ShakeScouter.scenes import Scene, SceneContext, SceneStatus
 from ShakeScouter.utils.images import Frame
 
+@dataclass(slots=True)
+class SequentialData:
+	index: int
+	children: list[Any]
+
 class Sequential(Scene):
 	def __init__(self, children: list[Scene]) -> None:
 		self.__children = children
 
-	def setup(self) -> Any:
-		data = {
-			'index': 0,
-			'children': [c.setup() for c in self.__children],
-		}
+	@property
+	def children(self) -> list[Scene]:
+		return self.__children
+
+	def setup(self) -> SequentialData:
+		data = SequentialData(
+			index=0,
+			children=[c.setup() for c in self.__children],
+		)
 		return data
 
-	def reset(self, data: Any) -> None:
-		data['index'] = 0
+	def reset(self, data: SequentialData) -> None:
+		data.index = 0
 
 		for i, c in enumerate(self.__children):
-			c.reset(data['children'][i])
+			c.reset(data.children[i])
 
-	async def analysis(self, context: SceneContext, data: Any, frame: Frame) -> SceneStatus:
+	async def analysis(self, context: SceneContext, data: SequentialData, frame: Frame) -> SceneStatus:
 		# Get index
-		i = data['index']
+		i = data.index
 
 		# Get current scene
 		scene = self.__children[i]
 
 		# Analysis frame
-		result = await scene.analysis(context, data['children'][i], frame)
+		result = await scene.analysis(context, data.children[i], frame)
 
 		# Handle result
 		# - FALSE, CONTINUE ->            CONTINUE
@@ -41,8 +51,8 @@ class Sequential(Scene):
 			case SceneStatus.FALSE | SceneStatus.CONTINUE:
 				return SceneStatus.CONTINUE
 			case SceneStatus.DONE:
-				data['index'] = i + 1
-				if data['index'] < len(self.__children):
+				data.index = i + 1
+				if data.index < len(self.__children):
 					return SceneStatus.CONTINUE
 				else:
 					return SceneStatus.DONE
@@ -24,12 +24,12 @@ class TestSequentialScene(IsolatedAsyncioTestCase):
 		# index = 0
 		ret = await scene.analysis(self.__ctx, data, None)
 		self.assertEqual(ret, SceneStatus.CONTINUE)
-		self.assertEqual(data['index'], 1)
+		self.assertEqual(data.index, 1)
 
 		# index = 1
 		ret = await scene.analysis(self.__ctx, data, None)
 		self.assertEqual(ret, SceneStatus.DONE)
-		self.assertEqual(data['index'], 2)
+		self.assertEqual(data.index, 2)
 
 	async def test_analysisDone(self):
 		scene = Sequential([
@@ -42,17 +42,17 @@ class TestSequentialScene(IsolatedAsyncioTestCase):
 		# index = 0, count = 1
 		ret = await scene.analysis(self.__ctx, data, None)
 		self.assertEqual(ret, SceneStatus.CONTINUE)
-		self.assertEqual(data['index'], 1)
-		self.assertEqual(data['children'][1]['count'], 1)
+		self.assertEqual(data.index, 1)
+		self.assertEqual(data.children[1]['count'], 1)
 
 		# index = 1, count = 0
 		ret = await scene.analysis(self.__ctx, data, None)
 		self.assertEqual(ret, SceneStatus.CONTINUE)
-		self.assertEqual(data['index'], 1)
-		self.assertEqual(data['children'][1]['count'], 0)
+		self.assertEqual(data.index, 1)
+		self.assertEqual(data.children[1]['count'], 0)
 
 		# index = 1, count = 0
 		ret = await scene.analysis(self.__ctx, data, None)
 		self.assertEqual(ret, SceneStatus.DONE)
-		self.assertEqual(data['index'], 2)
-		self.assertEqual(data['children'][1]['count'], 0)
+		self.assertEqual(data.index, 2)
+		self.assertEqual(data.children[1]['count'], 0)
@@ -1,9 +1,10 @@
 # Copyright (C) 2024 mntone
 # Licensed under the GPLv3 license.
 
+from anyio import sleep
 from typing import Any
 
-from ShakeScouter.scenes import Scene, SceneContext, SceneStatus
+from ShakeScouter.scenes import Scene, SceneContext, SceneEvent, SceneStatus
 from ShakeScouter.utils.images import Frame
 
 class TestScene(Scene):
@@ -29,3 +30,14 @@ class CountDownTestScene(Scene):
 			return SceneStatus.FALSE
 
 		return SceneStatus.DONE
+
+class SendTestScene(Scene):
+	def __init__(self, event: SceneEvent, message: dict[str, Any], delay: float = 0.0) -> None:
+		self.__event   = event
+		self.__message = message
+		self.__delay   = delay
+
+	async def analysis(self, context: SceneContext, data: Any, frame: Frame) -> SceneStatus:
+		await sleep(self.__delay)
+		await context.sendImmediately(self.__event, self.__message)
+		return SceneStatus.DONE
@@ -4,15 +4,22 @@
 # Copyright (C) 2024 mntone
 # Licensed under the GPLv3 license.
 
+# Measure import time from here
+from time import perf_counter
+startTime = perf_counter()
+
 from anyio import create_task_group, create_memory_object_stream, run
 from argparse import ArgumentParser
 from dotenv import load_dotenv
+from logging import basicConfig, INFO
 from os import getenv
+from pathlib import Path
 from typing import Any
 
+from ShakeScouter.constants import env
 from ShakeScouter.inputs.cv import CVInput
 from ShakeScouter.outputs import OUTPUT_PLUGINS_KEYLIST, Output
-from ShakeScouter.scenes import getDefaultPipeline, SceneStatus
+from ShakeScouter.scenes import PipelineBuilder, PipelineLoader, SceneEvent, SceneStatus
 from ShakeScouter.scenes.context import SceneContextImpl
 
 from ShakeScouter.utils import forceCwd, PluginLoader
@@ -22,6 +29,7 @@ from ShakeScouter.utils.images import Frame
 forceCwd(__file__)
 
 async def main(args):
+	importElapsed = perf_counter() - startTime
 	targetOutputPlugins = map(lambda o: OUTPUT_PLUGINS_KEYLIST[o], args.outputs)
 
 	outputLoader = PluginLoader('ShakeScouter.outputs')
@@ -40,11 +48,49 @@ async def main(args):
 
 		# Init context and pipeline
 		context = SceneContextImpl(list(map(lambda ss: ss[0], streams)))
-		scene = getDefaultPipeline(args.device, args.development)
-		data = scene.setup()
+		builder = PipelineBuilder(args.device, args.development, args.quantize)
+		loader = PipelineLoader(args.pipeline, builder)
 		input = CVInput(args)
 
+		# Open input device while loading model and templates
+		captureElapsed = 0.0
+		async def openInput():
+			nonlocal captureElapsed
+			start = perf_counter()
+			await input.open()
+			captureElapsed = perf_counter() - start
+
+		async with create_task_group() as startup:
+			startup.start_soon(openInput)
+			scene = await loader.loadAsync()
+		data = scene.setup()
+
+		# Report startup time
+		if args.development:
+			timings = builder.timings
+			print(
+				f'Startup: import {1000 * importElapsed:.0f} ms, '
+				f'model {1000 * timings.get("model", 0.0):.0f} ms, '
+				f'templates {1000 * timings.get("templates", 0.0):.0f} ms, '
+				f'capture {1000 * captureElapsed:.0f} ms, '
+				f'total {1000 * (perf_counter() - startTime):.0f} ms'
+			)
+
 		async def callback(frame: Frame) -> bool:
+			nonlocal scene, data
+
+			# Switch to the edited pipeline between frames
+			try:
+				newScene = await loader.pollAsync(context.timestamp)
+			except ValueError as e:
+				newScene = None
+				await context.sendImmediately(SceneEvent.DEV_WARN, {
+					'description': f'Failed to reload pipeline: {e}',
+				})
+			if newScene is not None:
+				scene = newScene
+				data = scene.setup()
+
 			result = await scene.analysis(context, data, frame)
 			return result == SceneStatus.DONE
 
@@ -54,16 +100,20 @@ async def main(args):
 			tg.cancel_scope.cancel()
 		tg.start_soon(run)
 
-if __name__ == "__main__":
+def cli(defaultPipeline: Path = env.DEFAULT_PIPELINE_PATH) -> None:
 	parser = ArgumentParser()
 	parser.add_argument('--development', action='store_true', help='Run the program in development mode.')
 	parser.add_argument('-d', '--device', type=str, metavar='DEVICE', default='auto', choices=['auto', 'cpu', 'cuda'], help='Specify the device to use in PyTorch. Available options are "auto", "cpu", and "cuda."')
+	parser.add_argument('-q', '--quantize', type=str, metavar='MODE', default='none', choices=['none', 'dynamic', 'static'], help='Specify the int8 quantization of the digit model (CPU only). Available options are "none", "dynamic", and "static." Build the "static" model with quantize.py first.')
+	parser.add_argument('--pipeline', type=str, metavar='FILE', default=str(defaultPipeline), help='Specify the pipeline definition file. It is reloaded on change.')
 	parser.add_argument('-o', '--outputs', type=str, metavar='OUTPUTS', nargs='+', default=['console', 'websocket'], choices=['console', 'json', 'websocket'], help='Specify the output types. Available options are "console", "json", and "websocket."')
 
 	# CVInput options
 	parser.add_argument('-i', '--input', type=int, metavar='INPUT', help='Specify the device ID of the OpenCV input.')
 	parser.add_argument('--width', type=int, default=1920, choices=range(640, 8192), metavar='WIDTH', help='Specify the width of the OpenCV input.')
 	parser.add_argument('--height', type=int, default=1080, choices=range(360, 4320), metavar='HEIGHT', help='Specify the height of the OpenCV input.')
+	parser.add_argument('--crop', action='store_true', help='Keep only the HUD regions of each frame after decode.')
+	parser.add_argument('--yuv', type=str, metavar='FORMAT', choices=['yuyv', 'nv12'], help='Keep the raw YUV buffer of the OpenCV input. Available options are "yuyv" and "nv12."')
 
 	# JsonOutput options
 	parser.add_argument('-t', '--timestamp', action='store_true', help='Use timestamp as json filename.')
@@ -75,6 +125,14 @@ if __name__ == "__main__":
 	args = parser.parse_args()
 	load_dotenv()
 
+	# Show reports such as the YUV conversion time in development mode
+	if args.development:
+		basicConfig(level=INFO)
+
+	# Static model is not shipped
+	if args.quantize == 'static' and not env.DIGIT_QUANT_MODEL_PATH.exists():
+		parser.error(f'{env.DIGIT_QUANT_MODEL_PATH} is not found. Run quantize.py to build the static quantized model.')
+
 	# Set torch device
 	if args.device == 'auto':
 		args.device = getenv('TORCH_DEVICE') or 'cpu'
@@ -97,3 +155,6 @@ if __name__ == "__main__":
 	args.sslKey = getenv('WS_SSLKEY')
 
 	run(main, args)
+
+if __name__ == "__main__":
+	cli()
@@ -7,7 +7,10 @@
 import cv2 as cv
 import numpy as np
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from hashlib import sha256
+from inspect import getsource
 from os import chdir
 from os.path import dirname, join, realpath
 from sys import path
@@ -18,8 +21,12 @@ chdir(realpath(join(dirname(__file__), '../ShakeScouter/')))
 path.append('.')
 
 from ShakeScouter.constants import assets, env, screen
+from ShakeScouter.scenes import Scene
 from ShakeScouter.utils.images import Frame
+from ShakeScouter.utils.images.bundle import TemplateBundle
+from ShakeScouter.utils.images.manifest import loadManifest, partKey, saveManifest
 from ShakeScouter.utils.images.model import PartInfo
+from ShakeScouter.utils.path import fileHash
 
 @dataclass
 class AssetData:
@@ -29,16 +36,31 @@ class AssetData:
 	part: PartInfo
 	fn: Optional[Callable[[np.ndarray], np.ndarray]] = None
 
-	def buildTemplate(self):
+	@property
+	def partName(self) -> str:
+		return next(name for name, value in vars(screen).items() if value is self.part)
+
+	def key(self) -> str:
+		# Key of the source asset, the part and the post process
+		inputPath = env.DEV_ASSET_PATH.format(self.input)
+		digest = sha256()
+		with open(inputPath, 'rb') as fh:
+			digest.update(fh.read())
+		digest.update(partKey(self.part).encode('utf8'))
+		if self.fn is not None:
+			digest.update(getsource(self.fn).strip().encode('utf8'))
+		return digest.hexdigest()
+
+	def buildTemplate(self) -> str:
 		outputPath = env.template_path(self.output)
-		if outputPath.exists():
-			print(f'[{self.name}] Mask file exists (path: {outputPath})')
-		else:
-			inputPath = env.DEV_ASSET_PATH.format(self.input)
-			image = Frame(filepath=inputPath).apply(self.part)
-			if self.fn is not None:
-				image = self.fn(image)
-			cv.imwrite(str(outputPath), image, [cv.IMWRITE_PNG_COMPRESSION, 0])
+		outputPath.parent.mkdir(parents=True, exist_ok=True)
+
+		inputPath = env.DEV_ASSET_PATH.format(self.input)
+		image = Frame(filepath=inputPath).apply(self.part)
+		if self.fn is not None:
+			image = self.fn(image)
+		cv.imwrite(str(outputPath), image, [cv.IMWRITE_PNG_COMPRESSION, 0])
+		return fileHash(outputPath)
 
 
 ASSET_INFO: list[AssetData] = [
@@ -69,23 +91,61 @@ ASSET_INFO: list[AssetData] = [
 	AssetData('Error',       'other/error',                  'error',              screen.ERROR_PART),
 ]
 
-def buildStageTemplate():
-	stageTemplateDirPath = env.TEMPLATE_DIR / 'stages'
-	stageTemplateDirPath.mkdir(parents=True, exist_ok=True)
+# Stage Masks
+ASSET_INFO += [
+	AssetData(f'Stage {stageKey}', f'stages/{stageKey}', f'stages/{stageKey}', screen.STAGE_NAME_PART)
+	for stageKey in assets.stageKeys
+]
 
-	for stageKey in assets.stageKeys:
-		outputPath = env.template_path(f'stages/{stageKey}')
-		if outputPath.exists():
-			print(f'Stage mask file exists (path: {outputPath})')
+def buildAsset(index: int) -> str:
+	# Assets are passed by index since lambdas are not picklable
+	return ASSET_INFO[index].buildTemplate()
+
+def buildTemplates() -> dict[str, dict[str, str]]:
+	manifest = loadManifest() or {}
+	entries: dict[str, dict[str, str]] = manifest.get('templates', {})
+
+	# Rebuild changed or missing templates only
+	changed: list[int] = []
+	keys: dict[str, str] = {}
+	for i, asset in enumerate(ASSET_INFO):
+		keys[asset.output] = asset.key()
+		entry = entries.get(asset.output)
+		outputPath = env.template_path(asset.output)
+		if entry is not None and entry['key'] == keys[asset.output] and outputPath.exists() and fileHash(outputPath) == entry['hash']:
+			print(f'[{asset.name}] Template is up to date (path: {outputPath})')
 		else:
-			inputPath = env.DEV_ASSET_PATH.format(f'stages/{stageKey}')
-			image = Frame(filepath=inputPath).apply(screen.STAGE_NAME_PART)
-			cv.imwrite(str(outputPath), image, [cv.IMWRITE_PNG_COMPRESSION, 0])
+			changed.append(i)
+
+	with ProcessPoolExecutor() as executor:
+		for i, digest in zip(changed, executor.map(buildAsset, changed)):
+			asset = ASSET_INFO[i]
+			entries[asset.output] = {
+				'source': asset.input,
+				'part': asset.partName,
+				'partKey': partKey(asset.part),
+				'key': keys[asset.output],
+				'hash': digest,
+			}
+			print(f'[{asset.name}] Template is built (path: {env.template_path(asset.output)})')
+	return entries
+
+def buildBundle() -> None:
+	# Pack all templates into one file for memory mapping
+	images = {
+		templateName: Scene.readTemplate(templateName)
+		for templateName in Scene.templateNames()
+	}
+	TemplateBundle.write(env.TEMPLATE_BUNDLE_PATH, images)
+	print(f'Template bundle is built (path: {env.TEMPLATE_BUNDLE_PATH}, templates: {len(images)})')
 
 def main():
-	for asset in ASSET_INFO:
-		asset.buildTemplate()
-	buildStageTemplate()
+	entries = buildTemplates()
+	buildBundle()
+	saveManifest({
+		'templates': entries,
+		'bundle': fileHash(env.TEMPLATE_BUNDLE_PATH),
+	})
 
 if __name__ == "__main__":
 	main()
@@ -16,30 +16,51 @@ from ShakeScouter.constants import env
 
 from ShakeScouter.recognizers import selectDevice, Trainer
 from ShakeScouter.recognizers.digit.cnn import DigitCNN
-from ShakeScouter.recognizers.digit.dataset import buildDataset
+from ShakeScouter.recognizers.digit.dataset import buildDataset, createLoader, GlyphCache
 from ShakeScouter.recognizers.digit.model import DatasetRoot
+from ShakeScouter.recognizers.digit.script import saveScript, scriptPath
 
 from ShakeScouter.utils import forceCwd
 
 # Set current working directory.
 forceCwd(__file__)
 
+# Eval needs no gradients, so use large batches
+EVAL_BATCH_SIZE = 512
+
 def train(
 	device: torch.device,
 	trainLoader: DataLoader,
 	testLoader: DataLoader,
 	filename: str,
 	epochs: int,
-):
+	lr: float = 0.001,
+	schedule: str = 'none',
+	patience: Optional[int] = None,
+) -> nn.Module:
 	# Init trainer
 	trainer = Trainer(device, DigitCNN)
 
 	# Define criterion and optimizer
 	criterion = nn.CrossEntropyLoss()
-	optimizer = optim.Adam(trainer.model.parameters(), lr=0.001)
-
-	# Train model
-	trainer.train(trainLoader, criterion, optimizer, epochs)
+	optimizer = optim.Adam(trainer.model.parameters(), lr=lr)
+
+	# Define learning rate schedule
+	scheduler: Optional[optim.lr_scheduler.LRScheduler] = None
+	if schedule == 'cosine':
+		scheduler = optim.lr_scheduler.CosineAnnealingLR(optimizer, T_max=epochs)
+
+	# Train model, checkpointing the best one on test accuracy
+	trainer.train(
+		trainLoader,
+		criterion,
+		optimizer,
+		epochs,
+		scheduler=scheduler,
+		evalLoader=testLoader if patience is not None else None,
+		patience=patience,
+		checkpoint=filename if patience is not None else None,
+	)
 
 	# Eval model
 	accuracy = trainer.eval(testLoader)
@@ -49,7 +70,9 @@ def train(
 	with open(filename, 'wb') as fh:
 		trainer.save(fh)
 
-def eval(device: torch.device, loader: DataLoader, filename: str):
+	return trainer.model
+
+def eval(device: torch.device, loader: DataLoader, filename: str) -> nn.Module:
 	# Init trainer
 	trainer = Trainer(device, DigitCNN, filename=filename)
 
@@ -57,6 +80,27 @@ def eval(device: torch.device, loader: DataLoader, filename: str):
 	accuracy = trainer.eval(loader)
 	print(f'Test Accuracy: {accuracy:.4f}')
 
+	return trainer.model
+
+def export(device: torch.device, model: nn.Module, loader: DataLoader, source: str):
+	# Save frozen module, recording the hash of the state dict file
+	filename = scriptPath(source)
+	scripted = saveScript(model, filename, source)
+	print(f'Export scripted model: {filename}')
+
+	# Verify equivalence
+	mismatch: int = 0
+	maxError: float = 0.0
+	with torch.no_grad():
+		for data in loader:
+			inputs = data[0].unsqueeze(1).to(device)
+			expected = model(inputs)
+			actual = scripted(inputs)
+
+			mismatch += (torch.argmax(expected, 1) != torch.argmax(actual, 1)).sum().item()
+			maxError = max(maxError, (expected - actual).abs().max().item())
+	print(f'Export Mismatch: {mismatch}, Max Error: {maxError:.3e}')
+
 def fileExists(filename: str):
 	if exists(filename):
 		response = input('Digit model file exists. Overwrite? [y/N]: ').strip().lower()
@@ -71,29 +115,46 @@ def main(args):
 	json: Optional[DatasetRoot] = None
 	with open(args.input, 'r') as fh:
 		json = DatasetRoot.from_json(fh.read())
-	trainDataset, testDataset = buildDataset(json)
+	cache = None if args.no_cache else GlyphCache()
+	trainDataset, testDataset = buildDataset(json, cache, args.jobs)
 
-	# Init test loader
-	testLoader = DataLoader(testDataset, batch_size=args.batch_size)
+	# Tune CPU threads
+	if args.threads is not None:
+		torch.set_num_threads(args.threads)
 
+	# Init test loader
 	device = selectDevice(args.device)
+	pin = device.type == 'cuda'
+	testLoader = createLoader(testDataset, EVAL_BATCH_SIZE, workers=args.workers, pin=pin)
+
 	if args.eval:
-		eval(device, testLoader, args.filename)
+		model = eval(device, testLoader, args.filename)
 	else:
 		# Init train loader
-		trainLoader = DataLoader(trainDataset, batch_size=args.batch_size, shuffle=True)
+		trainLoader = createLoader(trainDataset, args.batch_size, shuffle=True, workers=args.workers, pin=pin)
+
+		model = train(device, trainLoader, testLoader, args.filename, args.epoch, args.lr, args.schedule, args.patience)
 
-		train(device, trainLoader, testLoader, args.filename, args.epoch)
+	if args.export:
+		export(device, model, testLoader, args.filename)
 
 if __name__ == '__main__':
 	parser = ArgumentParser()
-	parser.add_argument('-b', '--batch_size', type=int, default=16, choices=[2, 4, 8, 16, 32, 64])
+	parser.add_argument('-b', '--batch_size', type=int, default=16, choices=[2, 4, 8, 16, 32, 64, 128, 256, 512])
 	parser.add_argument('-i', '--input', type=str, metavar='INPUT')
 	parser.add_argument('--filename', type=str, metavar='FILE')
 	parser.add_argument('-d', '--device', type=str, default='cpu', choices=['auto', 'cpu', 'cuda'])
-	parser.add_argument('-e', '--epoch', type=int, default=30, choices=range(1, 32), metavar='EPOCH')
+	parser.add_argument('-e', '--epoch', type=int, default=30, choices=range(1, 1001), metavar='EPOCH')
+	parser.add_argument('--lr', type=float, default=0.001, metavar='LR')
+	parser.add_argument('--schedule', type=str, default='none', choices=['none', 'cosine'], help='Learning rate schedule over the epochs.')
+	parser.add_argument('--patience', type=int, metavar='EPOCHS', help='Stop after EPOCHS epochs without better test accuracy, keeping the best model.')
+	parser.add_argument('-w', '--workers', type=int, default=0, metavar='WORKERS', help='Number of DataLoader worker processes.')
+	parser.add_argument('-t', '--threads', type=int, metavar='THREADS', help='Number of CPU threads of torch.')
 	parser.add_argument('-f', '--force', action='store_true')
+	parser.add_argument('-j', '--jobs', type=int, metavar='JOBS', help='Number of processes to split dataset images (default: CPU count).')
+	parser.add_argument('--no-cache', action='store_true', help='Split all dataset images without the glyph cache.')
 	parser.add_argument('--eval', action='store_true')
+	parser.add_argument('--export', action='store_true', help='Export frozen TorchScript model next to the model file (.pt).')
 
 	args = parser.parse_args()
 
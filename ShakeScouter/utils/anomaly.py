@@ -1,9 +1,21 @@
 # Copyright (C) 2024 mntone
 # Licensed under the GPLv3 license.
 
+import numpy as np
+
 from math import ceil
+from numpy.typing import ArrayLike, NDArray
+
+def firstIndex(mask: NDArray[np.bool_], start: int) -> int:
+	# Index of the first True from start, or the size if none
+	index = start + int(np.argmax(mask[start:]))
+	if index >= len(mask) or not mask[index]:
+		return len(mask)
+	return index
 
 class CounterAnomalyDetector:
+	SCAN_WINDOW = 16
+
 	STATE_IDLE_START = 1
 	STATE_IDLE_END   = 2
 	STATE_COUNTDOWN  = 3
@@ -25,6 +37,10 @@ class CounterAnomalyDetector:
 			case _:
 				return 'UNKNOWN'
 
+	@property
+	def value(self) -> int:
+		return self.__prevValue
+
 	def reset(self) -> None:
 		self.__state = CounterAnomalyDetector.STATE_IDLE_START
 		self.__prevValue     = 100
@@ -56,3 +72,101 @@ class CounterAnomalyDetector:
 		self.__prevTimestamp = timestamp
 
 		return False
+
+	def isAnomalousMany(self, values: ArrayLike, timestamps: ArrayLike) -> tuple[NDArray[np.bool_], NDArray[np.int8]]:
+		IDLE_START = CounterAnomalyDetector.STATE_IDLE_START
+		IDLE_END   = CounterAnomalyDetector.STATE_IDLE_END
+		COUNTDOWN  = CounterAnomalyDetector.STATE_COUNTDOWN
+
+		# Prepend previous values as the first accepted sample
+		v = np.concatenate(([self.__prevValue], np.asarray(values, dtype=np.int64)))
+		t = np.concatenate(([self.__prevTimestamp], np.asarray(timestamps, dtype=np.float64)))
+		n = len(v)
+		anomalies = np.zeros(n, dtype=np.bool_)
+		states = np.zeros(n, dtype=np.int8)
+
+		# Countdown check against the previous sample, valid while all samples are accepted
+		diffValue = v[:-1] - v[1:]
+		diffTimestamp = np.ceil(0.25 + t[1:] - t[:-1])
+		pairs = np.concatenate(([False], (diffValue >= 0) & (diffValue <= diffTimestamp)))
+		ends = (v <= 0) | (v >= 1000)
+		breaks = ~pairs | ends
+		starts = (90 <= v) & (v <= 100)
+		belows = v < 100
+
+		state = self.__state
+		last = 0  # last accepted sample
+		i = 1
+		while i < n:
+			match state:
+				case CounterAnomalyDetector.STATE_COUNTDOWN:
+					stop = firstIndex(breaks, i)
+					states[i:stop] = COUNTDOWN
+					last = stop - 1
+					if stop == n:
+						break
+
+					if pairs[stop]:
+						k = stop
+					else:
+						k = self.__scan(v, t, last, stop)
+						anomalies[stop:k] = True
+						states[stop:k] = COUNTDOWN
+						if k == n:
+							break
+
+					if ends[k]:
+						state = IDLE_END
+					states[k] = state
+					last = k
+					i = k + 1
+
+				case CounterAnomalyDetector.STATE_IDLE_START:
+					stop = firstIndex(belows, i)
+					states[i:stop] = IDLE_START
+					last = stop - 1
+					if stop == n:
+						break
+
+					state = COUNTDOWN
+					states[stop] = state
+					last = stop
+					i = stop + 1
+
+				case CounterAnomalyDetector.STATE_IDLE_END:
+					stop = firstIndex(starts, i)
+					anomalies[i:stop] = v[i:stop] != 0
+					states[i:stop] = IDLE_END
+					zeros = np.flatnonzero(~anomalies[i:stop])
+					if len(zeros) != 0:
+						last = i + int(zeros[-1])
+					if stop == n:
+						break
+
+					state = IDLE_START
+					states[stop] = state
+					last = stop
+					i = stop + 1
+
+		# Update values
+		self.__state = state
+		if last != 0:
+			self.__prevValue     = int(v[last])
+			self.__prevTimestamp = float(t[last])
+
+		return anomalies[1:], states[1:]
+
+	@staticmethod
+	def __scan(v: NDArray[np.int64], t: NDArray[np.float64], last: int, start: int) -> int:
+		# Check against the last accepted sample until one is accepted, in growing windows
+		window = CounterAnomalyDetector.SCAN_WINDOW
+		while start < len(v):
+			end = min(start + window, len(v))
+			diffValue = v[last] - v[start:end]
+			diffTimestamp = np.ceil(0.25 + t[start:end] - t[last])
+			index = firstIndex((diffValue >= 0) & (diffValue <= diffTimestamp), 0)
+			if index < end - start:
+				return start + index
+			start = end
+			window *= 2
+		return len(v)
@@ -1,16 +1,128 @@
 import cv2 as cv
+import re
 
+from atexit import register
 from pathlib import Path
+from queue import Full, Queue
+from threading import Lock, Thread
+from time import perf_counter
+from typing import Any, Callable, Optional
 
 from ShakeScouter.utils import debug_flags
 
+# Numeric parts of filename (timestamp, id and index)
+CATEGORY_PATTERN = re.compile(r'(?:^|_)[\d-]+(?=_|$)')
+
+
+def debug_category(path: Path) -> str:
+	return CATEGORY_PATTERN.sub('', path.stem)
+
+
+class DebugWriter:
+	MAX_QUEUE    = 32
+	DEFAULT_RATE = 2.0  # images per second in each category
+
+	def __init__(
+		self,
+		maxQueue: int = MAX_QUEUE,
+		rate: float = DEFAULT_RATE,
+		rates: Optional[dict[str, float]] = None,
+		clock: Callable[[], float] = perf_counter,
+	) -> None:
+		self.__queue: Queue[Optional[tuple[Path, Any, Callable[[Path, Any], Any]]]] = Queue(maxQueue)
+		self.__rate   = rate
+		self.__rates  = rates or {}
+		self.__clock  = clock
+		self.__lock   = Lock()
+		self.__thread: Optional[Thread] = None
+		self.__next: dict[str, float] = {}
+		self.__dropped: dict[str, int] = {}
+		self.__written = 0
+
+	@property
+	def dropped(self) -> dict[str, int]:
+		return dict(self.__dropped)
+
+	@property
+	def written(self) -> int:
+		return self.__written
+
+	def __drop(self, category: str) -> bool:
+		self.__dropped[category] = self.__dropped.get(category, 0) + 1
+		return False
+
+	def save(self, path: Path, image, category: Optional[str] = None) -> bool:
+		return self.submit(path, image, DebugWriter.__writeImage, category)
+
+	def submit(self, path: Path, payload: Any, write: Callable[[Path, Any], Any], category: Optional[str] = None) -> bool:
+		if category is None:
+			category = debug_category(path)
+
+		with self.__lock:
+			# Rate limit each category
+			timestamp = self.__clock()
+			if timestamp < self.__next.get(category, 0.0):
+				return self.__drop(category)
+			rate = self.__rates.get(category, self.__rate)
+			self.__next[category] = timestamp + 1 / rate
+
+			# Copy since the caller may reuse the buffer
+			try:
+				self.__queue.put_nowait((path, payload.copy(), write))
+			except Full:
+				return self.__drop(category)
+
+			if self.__thread is None:
+				self.__thread = Thread(target=self.__run, name='DebugWriter', daemon=True)
+				self.__thread.start()
+		return True
+
+	def __run(self) -> None:
+		while True:
+			item = self.__queue.get()
+			try:
+				if item is None:
+					return
+
+				# Encode and write off the analysis path
+				path, payload, write = item
+				path.parent.mkdir(parents=True, exist_ok=True)
+				write(path, payload)
+				self.__written += 1
+			finally:
+				self.__queue.task_done()
+
+	@staticmethod
+	def __writeImage(path: Path, image) -> None:
+		cv.imwrite(str(path), image)
+
+	def flush(self) -> None:
+		if self.__thread is not None:
+			self.__queue.join()
+
+	def close(self) -> None:
+		with self.__lock:
+			thread, self.__thread = self.__thread, None
+		if thread is None:
+			return
+
+		# Write queued images before exit
+		self.__queue.put(None)
+		thread.join()
+		if len(self.__dropped) != 0:
+			print(f'[DEBUG] debug writer: written={self.__written}, dropped={self.__dropped}')
+
+
+# Flight recorder dumps have their own cooldown
+debugWriter = DebugWriter(rates={'flight': float('inf')})
+register(debugWriter.close)
+
 
 def debug_log(message: str) -> None:
 	if debug_flags.WAVE_DEBUG:
 		print(message)
 
 
-def debug_save(path: Path, image) -> None:
+def debug_save(path: Path, image, category: Optional[str] = None) -> None:
 	if debug_flags.WAVE_DEBUG:
-		path.parent.mkdir(parents=True, exist_ok=True)
-		cv.imwrite(str(path), image)
+		debugWriter.save(path, image, category)
@@ -0,0 +1,77 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import cv2 as cv
+import numpy as np
+
+from parameterized import parameterized
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from ShakeScouter.utils.debug_io import debug_category, DebugWriter
+
+class FakeClock:
+	def __init__(self) -> None:
+		self.now = 0.0
+
+	def __call__(self) -> float:
+		return self.now
+
+class TestDebugWriter(TestCase):
+	def setUp(self):
+		self.__directory = TemporaryDirectory()
+		self.__path = Path(self.__directory.name)
+
+	def tearDown(self):
+		self.__directory.cleanup()
+
+	@parameterized.expand([
+		('inrange_mask_20240101-120000', 'inrange_mask'),
+		('timer_dbg_20240101-120000_12_raw', 'timer_dbg_raw'),
+		('wave_step_02_Threshold_20240101-120000', 'wave_step_Threshold'),
+		('extra_check_3_roi_color', 'extra_check_roi_color'),
+	])
+	def test_category(self, stem: str, expected: str):
+		self.assertEqual(debug_category(self.__path / f'{stem}.png'), expected)
+
+	def test_save(self):
+		writer = DebugWriter()
+		image = np.full((45, 200), 255, dtype=np.uint8)
+		self.assertTrue(writer.save(self.__path / 'sub' / 'mask_1.png', image))
+
+		# Written image is not affected by later changes of the buffer
+		image[:] = 0
+		writer.close()
+		written = cv.imread(str(self.__path / 'sub' / 'mask_1.png'), cv.IMREAD_GRAYSCALE)
+		self.assertEqual(int(written.min()), 255)
+		self.assertEqual(writer.written, 1)
+
+	def test_rateLimit(self):
+		clock = FakeClock()
+		writer = DebugWriter(rate=2.0, rates={'frame': 0.5}, clock=clock)
+		image = np.zeros((4, 4), dtype=np.uint8)
+
+		results = []
+		for i in range(8):
+			clock.now = i * 0.25
+			results.append((
+				writer.save(self.__path / f'mask_{i}.png', image),
+				writer.save(self.__path / f'frame_{i}.png', image),
+			))
+		writer.close()
+
+		self.assertEqual([mask for mask, _ in results], [True, False, True, False] * 2)
+		self.assertEqual([frame for _, frame in results], [True] + [False] * 7)
+		self.assertEqual(writer.dropped, {'mask': 4, 'frame': 7})
+		self.assertEqual(writer.written, 5)
+
+	def test_queueFull(self):
+		writer = DebugWriter(maxQueue=1, rate=1000.0, clock=FakeClock())
+		image = np.zeros((4, 4), dtype=np.uint8)
+
+		# Queue is filled before the thread starts
+		results = [writer.save(self.__path / f'{name}.png', image) for name in ['a', 'b']]
+		writer.close()
+		self.assertEqual(results[0], True)
+		self.assertEqual(writer.written + sum(writer.dropped.values()), 2)
@@ -0,0 +1,31 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+from anyio import CapacityLimiter, to_thread
+from os import cpu_count
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+class AnalysisExecutor:
+	def __init__(self, workers: Optional[int] = None) -> None:
+		self.__workers = workers or min(4, cpu_count() or 1)
+		self.__limiter: Optional[CapacityLimiter] = None
+
+	@property
+	def workers(self) -> int:
+		return self.__workers
+
+	async def run(self, fn: Callable[..., T], *args: Any) -> T:
+		# Create limiter in the running event loop
+		if self.__limiter is None:
+			self.__limiter = CapacityLimiter(self.__workers)
+
+		# OpenCV and torch release the GIL while they compute
+		result = await to_thread.run_sync(fn, *args, limiter=self.__limiter)
+		return result
+
+analysisExecutor = AnalysisExecutor()
+
+async def runAnalysis(fn: Callable[..., T], *args: Any) -> T:
+	return await analysisExecutor.run(fn, *args)
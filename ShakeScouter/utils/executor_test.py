@@ -0,0 +1,40 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+from anyio import create_task_group
+from threading import get_ident
+from time import sleep
+from unittest import IsolatedAsyncioTestCase
+
+from ShakeScouter.utils.executor import AnalysisExecutor
+
+class TestAnalysisExecutor(IsolatedAsyncioTestCase):
+	async def test_run(self):
+		executor = AnalysisExecutor(2)
+		ident = await executor.run(get_ident)
+		self.assertNotEqual(ident, get_ident())
+
+	async def test_exception(self):
+		def fail():
+			raise ValueError('fail')
+
+		executor = AnalysisExecutor(2)
+		with self.assertRaises(ValueError):
+			await executor.run(fail)
+
+	async def test_order(self):
+		# Each caller gets its own result regardless of completion order
+		executor = AnalysisExecutor(4)
+		results: list[int] = [0] * 4
+
+		def work(index: int) -> int:
+			sleep(0.01 * (4 - index))
+			return index * index
+
+		async def call(index: int):
+			results[index] = await executor.run(work, index)
+
+		async with create_task_group() as tg:
+			for i in range(4):
+				tg.start_soon(call, i)
+		self.assertEqual(results, [0, 1, 4, 9])
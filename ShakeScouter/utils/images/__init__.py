@@ -4,3 +4,5 @@
 from ShakeScouter.utils.images.bbox import *
 from ShakeScouter.utils.images.error import *
 from ShakeScouter.utils.images.frame import Frame
+from ShakeScouter.utils.images.pyramid import fitTemplate, TemplatePyramid
+from ShakeScouter.utils.images.sparse import FrameCropper, SparseFrame
@@ -38,4 +38,3 @@ def detectBbox(image: np.ndarray, minHeight: int = 8) -> list[cv.typing.Rect]:
 		if bbox[3] >= minHeight
 	]
 	return patchedBboxes
-
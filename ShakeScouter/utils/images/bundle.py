@@ -0,0 +1,91 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import cv2 as cv
+import numpy as np
+
+from json import dumps, loads
+from numpy.typing import NDArray
+from pathlib import Path
+from struct import Struct
+from typing import Optional
+
+# Header: magic, version, index size
+HEADER = Struct('<8sII')
+MAGIC = b'SSTPLBDL'
+VERSION = 1
+ALIGNMENT = 64
+
+def align(offset: int) -> int:
+	return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+class TemplateBundle:
+	def __init__(self, filepath: str | Path) -> None:
+		self.__filepath = Path(filepath)
+		with open(self.__filepath, 'rb') as fh:
+			magic, version, indexSize = HEADER.unpack(fh.read(HEADER.size))
+			if magic != MAGIC or version != VERSION:
+				raise ValueError(f'Template bundle is not supported: {self.__filepath}')
+			index = loads(fh.read(indexSize))
+
+		# Share pages of the file between workers instead of copying them
+		self.__buffer = np.memmap(self.__filepath, dtype=np.uint8, mode='r')
+		self.__entries: dict[str, tuple[int, tuple[int, int]]] = {
+			name: (entry['offset'], (entry['height'], entry['width']))
+			for name, entry in index.items()
+		}
+
+	@property
+	def filepath(self) -> Path:
+		return self.__filepath
+
+	@property
+	def names(self) -> list[str]:
+		return list(self.__entries.keys())
+
+	def __contains__(self, name: str) -> bool:
+		return name in self.__entries
+
+	def get(self, name: str) -> Optional[NDArray[np.uint8]]:
+		entry = self.__entries.get(name)
+		if entry is None:
+			return None
+
+		offset, shape = entry
+		image = self.__buffer[offset:offset + shape[0] * shape[1]].reshape(shape)
+		return image
+
+	@staticmethod
+	def open(filepath: str | Path) -> Optional['TemplateBundle']:
+		if not Path(filepath).exists():
+			return None
+		return TemplateBundle(filepath)
+
+	@staticmethod
+	def write(filepath: str | Path, images: dict[str, NDArray[np.uint8]]) -> None:
+		# Binarize in the same way as scaled templates
+		binaries = {
+			name: cv.threshold(image, 127, 255, cv.THRESH_BINARY)[1]
+			for name, image in images.items()
+		}
+
+		# Offsets depend on the index size, so fix its width with the final offsets
+		index: dict[str, dict[str, int]] = {}
+		while True:
+			indexBytes = dumps(index).encode('utf8')
+			offset = align(HEADER.size + len(indexBytes))
+			nextIndex: dict[str, dict[str, int]] = {}
+			for name, image in binaries.items():
+				nextIndex[name] = {'offset': offset, 'height': image.shape[0], 'width': image.shape[1]}
+				offset = align(offset + image.size)
+			if nextIndex == index:
+				break
+			index = nextIndex
+
+		with open(filepath, 'wb') as fh:
+			fh.write(HEADER.pack(MAGIC, VERSION, len(indexBytes)))
+			fh.write(indexBytes)
+			for name, image in binaries.items():
+				fh.seek(index[name]['offset'])
+				fh.write(np.ascontiguousarray(image, dtype=np.uint8).tobytes())
+			fh.truncate(offset)
@@ -0,0 +1,50 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import numpy as np
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from ShakeScouter.utils.images.bundle import ALIGNMENT, TemplateBundle
+
+class TestTemplateBundle(TestCase):
+	def setUp(self):
+		self.__directory = TemporaryDirectory()
+		self.__filepath = Path(self.__directory.name) / 'templates.bin'
+
+	def tearDown(self):
+		self.__directory.cleanup()
+
+	def test_roundTrip(self):
+		rng = np.random.default_rng(0)
+		images = {
+			'start': np.where(rng.random((49, 420)) < 0.5, 255, 0).astype(np.uint8),
+			'kings/cohozuna': np.where(rng.random((37, 301)) < 0.5, 255, 0).astype(np.uint8),
+		}
+		TemplateBundle.write(self.__filepath, images)
+
+		bundle = TemplateBundle(self.__filepath)
+		self.assertEqual(bundle.names, ['start', 'kings/cohozuna'])
+		for name, expected in images.items():
+			image = bundle.get(name)
+			assert image is not None
+			np.testing.assert_array_equal(image, expected)
+			self.assertFalse(image.flags.writeable)
+			self.assertEqual((image.ctypes.data - bundle.get('start').ctypes.data) % ALIGNMENT, 0)
+		self.assertIsNone(bundle.get('unknown'))
+
+	def test_binarize(self):
+		TemplateBundle.write(self.__filepath, {'logo': np.array([[0, 127, 128, 255]], dtype=np.uint8)})
+
+		image = TemplateBundle(self.__filepath).get('logo')
+		assert image is not None
+		np.testing.assert_array_equal(image, [[0, 0, 255, 255]])
+
+	def test_open(self):
+		self.assertIsNone(TemplateBundle.open(self.__filepath))
+
+		self.__filepath.write_bytes(b'0' * 64)
+		with self.assertRaises(ValueError):
+			TemplateBundle.open(self.__filepath)
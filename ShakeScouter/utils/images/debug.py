@@ -0,0 +1,58 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import cv2 as cv
+import numpy as np
+
+from numpy.typing import NDArray
+from time import strftime
+
+from ShakeScouter.constants import screen
+from ShakeScouter.utils import debug_flags
+from ShakeScouter.utils.debug_io import debug_log, debug_save
+from ShakeScouter.utils.images.filters.filter import Filter
+from ShakeScouter.utils.images.filters.inrange import InRange
+from ShakeScouter.utils.images.frame import TELEMETRY_DIR
+from ShakeScouter.utils.images.hooks import addObserver, ImageObserver, removeObserver
+from ShakeScouter.utils.images.model import PartInfo
+
+# Shapes of the wave ROI at 1080p
+WAVE_SHAPES = {(45, 200), (45, 128)}
+
+def imageStats(image: NDArray[np.uint8]) -> str:
+	if image.size == 0:
+		return f'dtype={image.dtype}, shape={image.shape}, min=0, max=0, mean=0.0, nonzero=0'
+
+	gray = image if image.ndim == 2 else cv.cvtColor(image, cv.COLOR_BGR2GRAY)
+	nonzero = int(cv.countNonZero(gray))
+	return f'dtype={image.dtype}, shape={image.shape}, min={int(image.min())}, max={int(image.max())}, mean={float(image.mean())}, nonzero={nonzero}'
+
+class WaveDebugObserver(ImageObserver):
+	def onApply(self, stage: str, partInfo: PartInfo, image: NDArray[np.uint8]) -> None:
+		if partInfo is not screen.WAVE_PART:
+			return
+		debug_log(f'[DEBUG] {stage} stats: {imageStats(image)}')
+		debug_save(TELEMETRY_DIR / f'wave_{stage}_{strftime("%Y%m%d-%H%M%S")}.png', image)
+
+	def onFilter(self, index: int, filter: Filter, image: NDArray[np.uint8]) -> None:
+		className = filter.__class__.__name__
+		debug_log(f'[DEBUG] filter#{index} {className}: {imageStats(image)}')
+		if image.shape[:2] in WAVE_SHAPES:
+			debug_save(TELEMETRY_DIR / f'wave_step_{index:02d}_{className}_{strftime("%Y%m%d-%H%M%S")}.png', image)
+
+	def onInRange(self, filter: InRange, image: NDArray[np.uint8], mask: NDArray[np.uint8]) -> None:
+		params = filter.params()
+		debug_log(f'[DEBUG] InRange: dtype={image.dtype}, shape={image.shape}, lower={params["lower"].tolist()}, upper={params["upper"].tolist()}')
+		debug_log(f'[DEBUG] InRange result: {imageStats(mask)}')
+		if mask.shape[:2] in WAVE_SHAPES:
+			debug_save(TELEMETRY_DIR / f'inrange_mask_{strftime("%Y%m%d-%H%M%S")}.png', mask)
+
+waveDebugObserver = WaveDebugObserver()
+
+def setWaveDebug(enabled: bool) -> None:
+	# Instrument images only while debugging
+	debug_flags.WAVE_DEBUG = enabled
+	if enabled:
+		addObserver(waveDebugObserver)
+	else:
+		removeObserver(waveDebugObserver)
@@ -8,23 +8,28 @@ from enum import Enum
 from numpy.typing import NDArray
 from typing import Callable, Optional
 
+from ShakeScouter.utils.images.pyramid import fitTemplate
+
 class ErrorType(Enum):
 	BITWISE       = 'bitwise'
 	MEAN_ABSOLUTE = 'mean_absolute'
 	MEAN_SQUARE   = 'mean_square'
 
 def errorBWE(image: NDArray[np.uint8], template: NDArray[np.uint8]) -> float:
+	template = fitTemplate(template, image.shape)
 	mask  = cv.bitwise_and(image, template)
 	count = cv.countNonZero(mask)
 	error = count / image.size
 	return error
 
 def errorMAE(image: NDArray[np.uint8], template: NDArray[np.uint8]) -> float:
+	template = fitTemplate(template, image.shape)
 	diff  = cv.absdiff(image, template)
 	error = cv.mean(diff)[0] / 255.0
 	return error
 
 def errorMSE(image: NDArray[np.uint8], template: NDArray[np.uint8]) -> float:
+	template = fitTemplate(template, image.shape)
 	diff  = cv.absdiff(image, template)
 	power = cv.pow(diff, 2)
 	error = cv.mean(power)[0] / (255.0 ** 2)
@@ -4,8 +4,13 @@
 import numpy as np
 
 from abc import abstractmethod
+from typing import Any
 
 class Filter:
 	@abstractmethod
 	def apply(self, image: np.ndarray) -> np.ndarray:
 		raise NotImplementedError()
+
+	def params(self) -> dict[str, Any]:
+		# Attributes without the name mangling prefix
+		return {key.rsplit('__', 1)[-1]: value for key, value in vars(self).items()}
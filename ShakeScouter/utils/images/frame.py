@@ -7,17 +7,23 @@ import numpy as np
 from math import ceil, floor
 from numpy.typing import NDArray
 from pathlib import Path
-from time import strftime
-from typing import Optional
 
-from ShakeScouter.constants import screen
-from ShakeScouter.utils import debug_flags
-from ShakeScouter.utils.debug_io import debug_log, debug_save
 from ShakeScouter.utils.images.model import PartInfo, RectF
+from ShakeScouter.utils.images.filters.color import Grayscale
 from ShakeScouter.utils.images.filters.filter import Filter
 
 TELEMETRY_DIR = Path(__file__).resolve().parents[3] / '.telemetry'
 
+def calcPixelRect(rect: RectF, width: int, height: int) -> tuple[int, int, int, int]:
+	left = floor(rect['left'] * width)
+	top = floor(rect['top'] * height)
+	right = ceil(rect['right'] * width)
+	bottom = ceil(rect['bottom'] * height)
+	return left, top, right, bottom
+
+def isLumaOnly(filters: list[Filter]) -> bool:
+	return len(filters) > 0 and isinstance(filters[0], Grayscale)
+
 class Frame:
 	__image: NDArray[np.uint8]
 
@@ -39,26 +45,21 @@ class Frame:
 		return self.__image
 
 	def apply(self, partInfo: PartInfo) -> NDArray[np.uint8]:
-		isWavePart = partInfo is screen.WAVE_PART
-		timestamp = strftime('%Y%m%d-%H%M%S') if isWavePart else None
-		subimage = self.__subimage(partInfo['area'])
-		if isWavePart:
-			Frame.__logWaveDebug('apply_in', subimage, timestamp)
-		filtered = Frame.__filter(subimage, partInfo['filters'])
-		if isWavePart:
-			Frame.__logWaveDebug('apply_out', filtered, timestamp)
+		filters = partInfo['filters']
+		subimage = self._subimage(partInfo['area'], isLumaOnly(filters))
+		filtered = Frame._filter(subimage, filters)
 		return filtered
 
 	def filter(self, filters: list[Filter]) -> NDArray[np.uint8]:
-		image = Frame.__filter(self.__image, filters)
+		image = Frame._filter(self.native, filters)
 		return image
 
-	def subimage(self, rect: RectF) -> 'Frame':
-		subimage = self.__subimage(rect)
+	def subimage(self, rect: RectF, luma: bool = False) -> 'Frame':
+		subimage = self._subimage(rect, luma)
 		newFrame = Frame(raw=subimage)
 		return newFrame
 
-	def __subimage(self, rect: RectF) -> NDArray[np.uint8]:
+	def _subimage(self, rect: RectF, luma: bool = False) -> NDArray[np.uint8]:
 		if rect['left'] < 0 or rect['left'] > 1:
 			raise ValueError('"rect[\'left\']" must be between 0 and 1')
 		if rect['top'] < 0 or rect['top'] > 1:
@@ -68,61 +69,26 @@ class Frame:
 		if rect['bottom'] < 0 or rect['bottom'] > 1:
 			raise ValueError('"rect[\'bottom\']" must be between 0 and 1')
 
-		image = self.__image
-		height, width = image.shape[:2]
-		top = floor(rect['top'] * height)
-		bottom = ceil(rect['bottom'] * height)
-		left = floor(rect['left'] * width)
-		right = ceil(rect['right'] * width)
+		width, height = self._size()
+		left, top, right, bottom = calcPixelRect(rect, width, height)
 
-		subimage = image[top:bottom, left:right]
+		subimage = self._slice(left, top, right, bottom, luma)
 		return subimage
 
+	def _size(self) -> tuple[int, int]:
+		height, width = self.__image.shape[:2]
+		return width, height
+
+	def _slice(self, left: int, top: int, right: int, bottom: int, luma: bool) -> NDArray[np.uint8]:
+		# "luma" allows a single-channel image when the frame holds one natively
+		return self.__image[top:bottom, left:right]
+
 	def update(self, raw: NDArray[np.uint8]):
 		self.__image = raw
 
 	@staticmethod
-	def __filter(src: NDArray[np.uint8], filters: list[Filter]) -> NDArray[np.uint8]:
+	def _filter(src: NDArray[np.uint8], filters: list[Filter]) -> NDArray[np.uint8]:
 		image = src
-		for idx, filterInstance in enumerate(filters):
+		for filterInstance in filters:
 			image = filterInstance.apply(image)
-			if debug_flags.WAVE_DEBUG:
-				valueMin = int(image.min()) if image.size else 0
-				valueMax = int(image.max()) if image.size else 0
-				valueMean = float(image.mean()) if image.size else 0.0
-				if image.size:
-					if image.ndim == 2:
-						nonzero = int(cv.countNonZero(image))
-					else:
-						gray = cv.cvtColor(image, cv.COLOR_BGR2GRAY)
-						nonzero = int(cv.countNonZero(gray))
-				else:
-					nonzero = 0
-				className = filterInstance.__class__.__name__
-				debug_log(f'[DEBUG] filter#{idx} {className}: dtype={image.dtype}, shape={image.shape}, min={valueMin}, max={valueMax}, mean={valueMean}, nonzero={nonzero}')
-				if image.shape[:2] in {(45, 200), (45, 128)}:
-					timestamp = strftime('%Y%m%d-%H%M%S')
-					filename = TELEMETRY_DIR / f'wave_step_{idx:02d}_{className}_{timestamp}.png'
-					debug_save(filename, image)
 		return image
-
-	@staticmethod
-	def __logWaveDebug(label: str, image: NDArray[np.uint8], timestamp: Optional[str]) -> None:
-		if not debug_flags.WAVE_DEBUG:
-			return
-		if timestamp is None:
-			timestamp = strftime('%Y%m%d-%H%M%S')
-		valueMin = int(image.min()) if image.size else 0
-		valueMax = int(image.max()) if image.size else 0
-		valueMean = float(image.mean()) if image.size else 0.0
-		if image.size:
-			if image.ndim == 2:
-				nonzero = int(cv.countNonZero(image))
-			else:
-				gray = cv.cvtColor(image, cv.COLOR_BGR2GRAY)
-				nonzero = int(cv.countNonZero(gray))
-		else:
-			nonzero = 0
-		debug_log(f'[DEBUG] {label} stats: dtype={image.dtype}, shape={image.shape}, min={valueMin}, max={valueMax}, mean={valueMean}, nonzero={nonzero}')
-		filename = TELEMETRY_DIR / f'wave_{label}_{timestamp}.png'
-		debug_save(filename, image)
@@ -0,0 +1,79 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import numpy as np
+
+from numpy.typing import NDArray
+from typing import Any, Callable
+
+from ShakeScouter.utils.images.filters.filter import Filter
+from ShakeScouter.utils.images.filters.inrange import InRange
+from ShakeScouter.utils.images.frame import Frame, isLumaOnly
+from ShakeScouter.utils.images.model import PartInfo
+
+class ImageObserver:
+	def onApply(self, stage: str, partInfo: PartInfo, image: NDArray[np.uint8]) -> None:
+		pass
+
+	def onFilter(self, index: int, filter: Filter, image: NDArray[np.uint8]) -> None:
+		pass
+
+	def onInRange(self, filter: InRange, image: NDArray[np.uint8], mask: NDArray[np.uint8]) -> None:
+		pass
+
+observers: list[ImageObserver] = []
+
+# Production implementations, restored when no observer is left
+originals: dict[str, Callable[..., Any]] = {}
+
+def instrumentedApply(self: Frame, partInfo: PartInfo) -> NDArray[np.uint8]:
+	filters = partInfo['filters']
+	subimage = self._subimage(partInfo['area'], isLumaOnly(filters))
+	for observer in observers:
+		observer.onApply('apply_in', partInfo, subimage)
+	filtered = instrumentedFilter(subimage, filters)
+	for observer in observers:
+		observer.onApply('apply_out', partInfo, filtered)
+	return filtered
+
+def instrumentedFilter(src: NDArray[np.uint8], filters: list[Filter]) -> NDArray[np.uint8]:
+	image = src
+	for index, filterInstance in enumerate(filters):
+		image = filterInstance.apply(image)
+		for observer in observers:
+			observer.onFilter(index, filterInstance, image)
+	return image
+
+def instrumentedInRange(self: InRange, image: NDArray[np.uint8]) -> NDArray[np.uint8]:
+	mask = originals['InRange.apply'](self, image)
+	for observer in observers:
+		observer.onInRange(self, image, mask)
+	return mask
+
+def install() -> None:
+	# Swap in instrumented implementations
+	originals['Frame.apply']  = Frame.apply
+	originals['Frame.filter'] = Frame._filter
+	originals['InRange.apply'] = InRange.apply
+	Frame.apply = instrumentedApply
+	Frame._filter = staticmethod(instrumentedFilter)
+	InRange.apply = instrumentedInRange
+
+def uninstall() -> None:
+	Frame.apply = originals.pop('Frame.apply')
+	Frame._filter = staticmethod(originals.pop('Frame.filter'))
+	InRange.apply = originals.pop('InRange.apply')
+
+def addObserver(observer: ImageObserver) -> None:
+	if observer in observers:
+		return
+	if len(observers) == 0:
+		install()
+	observers.append(observer)
+
+def removeObserver(observer: ImageObserver) -> None:
+	if observer not in observers:
+		return
+	observers.remove(observer)
+	if len(observers) == 0:
+		uninstall()
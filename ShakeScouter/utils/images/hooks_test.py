@@ -0,0 +1,50 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import numpy as np
+
+from unittest import TestCase
+
+from ShakeScouter.constants import screen
+from ShakeScouter.utils.images import Frame
+from ShakeScouter.utils.images.filters import InRange
+from ShakeScouter.utils.images.hooks import addObserver, ImageObserver, removeObserver
+
+class RecordingObserver(ImageObserver):
+	def __init__(self) -> None:
+		self.events: list[tuple] = []
+
+	def onApply(self, stage, partInfo, image) -> None:
+		self.events.append((stage, image.shape))
+
+	def onFilter(self, index, filter, image) -> None:
+		self.events.append((index, type(filter).__name__))
+
+	def onInRange(self, filter, image, mask) -> None:
+		self.events.append(('inrange', mask.shape))
+
+class TestImageHooks(TestCase):
+	def test_observer(self):
+		rng = np.random.default_rng(0)
+		frame = Frame(raw=rng.integers(0, 255, (1080, 1920, 3), dtype=np.uint8))
+		expected = frame.apply(screen.WAVE_PART)
+		apply, filter, inRange = Frame.apply, Frame._filter, InRange.apply
+
+		observer = RecordingObserver()
+		addObserver(observer)
+		try:
+			self.assertIsNot(Frame.apply, apply)
+			np.testing.assert_array_equal(frame.apply(screen.WAVE_PART), expected)
+		finally:
+			removeObserver(observer)
+
+		# Production implementations are back
+		self.assertIs(Frame.apply, apply)
+		self.assertIs(Frame._filter, filter)
+		self.assertIs(InRange.apply, inRange)
+
+		names = [type(f).__name__ for f in screen.WAVE_PART['filters']]
+		self.assertEqual(observer.events[0][0], 'apply_in')
+		self.assertEqual(observer.events[-1], ('apply_out', expected.shape))
+		self.assertEqual([e for e in observer.events if isinstance(e[0], int)], list(enumerate(names)))
+		self.assertEqual(len([e for e in observer.events if e[0] == 'inrange']), names.count('InRange'))
@@ -0,0 +1,66 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import numpy as np
+
+from hashlib import sha256
+from json import dumps, loads
+from pathlib import Path
+from typing import Any, Optional
+
+from ShakeScouter.constants import env, screen
+from ShakeScouter.utils.images.model import PartInfo
+from ShakeScouter.utils.path import fileHash
+
+VERSION = 1
+
+def encode(value: Any) -> Any:
+	if isinstance(value, np.ndarray):
+		return value.tolist()
+	if isinstance(value, np.generic):
+		return value.item()
+	raise TypeError(f'Value is not serializable: {value!r}')
+
+def partKey(part: PartInfo) -> str:
+	# Key of the area and the filter parameters
+	spec = {
+		'area': part['area'],
+		'filters': [{'type': type(f).__name__, **f.params()} for f in part['filters']],
+	}
+	return sha256(dumps(spec, sort_keys=True, default=encode).encode('utf8')).hexdigest()
+
+def loadManifest(filepath: str | Path = env.TEMPLATE_MANIFEST_PATH) -> Optional[dict[str, Any]]:
+	try:
+		with open(filepath, 'r', encoding='utf8') as fh:
+			manifest = loads(fh.read())
+	except FileNotFoundError:
+		return None
+	if manifest.get('version') != VERSION:
+		return None
+	return manifest
+
+def saveManifest(manifest: dict[str, Any], filepath: str | Path = env.TEMPLATE_MANIFEST_PATH) -> None:
+	with open(filepath, 'w', encoding='utf8') as fh:
+		fh.write(dumps({**manifest, 'version': VERSION}, indent='\t', sort_keys=True))
+		fh.write('\n')
+
+def checkTemplates(manifest: dict[str, Any]) -> list[str]:
+	problems: list[str] = []
+	for name, entry in manifest.get('templates', {}).items():
+		# Part changed after the template was built
+		part = getattr(screen, entry['part'], None)
+		if part is None or partKey(part) != entry['partKey']:
+			problems.append(f'Template "{name}" is built with an old {entry["part"]}')
+			continue
+
+		# Template edited or replaced after the build
+		filepath = env.template_path(name)
+		if not filepath.exists():
+			problems.append(f'Template "{name}" is not found')
+		elif fileHash(filepath) != entry['hash']:
+			problems.append(f'Template "{name}" does not match the manifest')
+
+	bundleHash = manifest.get('bundle')
+	if bundleHash is not None and env.TEMPLATE_BUNDLE_PATH.exists() and fileHash(env.TEMPLATE_BUNDLE_PATH) != bundleHash:
+		problems.append('Template bundle does not match the manifest')
+	return problems
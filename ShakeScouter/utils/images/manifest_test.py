@@ -0,0 +1,47 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import numpy as np
+
+from unittest import TestCase
+
+from ShakeScouter.constants import env, screen
+from ShakeScouter.utils.images.filters import Grayscale, InRange, Threshold
+from ShakeScouter.utils.images.manifest import checkTemplates, partKey
+from ShakeScouter.utils.path import fileHash
+from ShakeScouter.utils.images.model import PartInfo, RectF
+
+def createPart(right: float = 0.5, threshold: float = 127) -> PartInfo:
+	return PartInfo(
+		area = RectF(left = 0.0, top = 0.0, right = right, bottom = 0.5),
+		filters = [
+			Grayscale(),
+			InRange(np.array([0, 0, 0]), np.array([180, 64, 255])),
+			Threshold(threshold, 255),
+		],
+	)
+
+class TestTemplateManifest(TestCase):
+	def test_partKey(self):
+		self.assertEqual(partKey(createPart()), partKey(createPart()))
+		self.assertNotEqual(partKey(createPart()), partKey(createPart(right=0.6)))
+		self.assertNotEqual(partKey(createPart()), partKey(createPart(threshold=128)))
+
+	def test_checkTemplates(self):
+		entry = {
+			'part': 'MESSAGE_PART',
+			'partKey': partKey(screen.MESSAGE_PART),
+			'hash': fileHash(env.template_path('start')),
+		}
+		self.assertEqual(checkTemplates({'templates': {'start': entry}}), [])
+
+		problems = checkTemplates({'templates': {
+			'start': {**entry, 'hash': '0' * 64},
+			'logo': {**entry, 'part': 'LOGO_PART'},
+			'unknown': entry,
+		}})
+		self.assertEqual(problems, [
+			'Template "start" does not match the manifest',
+			'Template "logo" is built with an old LOGO_PART',
+			'Template "unknown" is not found',
+		])
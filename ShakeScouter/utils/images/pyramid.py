@@ -0,0 +1,41 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import cv2 as cv
+import numpy as np
+
+from numpy.typing import NDArray
+
+class TemplatePyramid:
+	def __init__(self) -> None:
+		# (id, height, width) -> (source template, scaled template)
+		self.__levels: dict[tuple[int, int, int], tuple[NDArray[np.uint8], NDArray[np.uint8]]] = {}
+
+	def __len__(self) -> int:
+		return len(self.__levels)
+
+	def fit(self, template: NDArray[np.uint8], shape: tuple[int, ...]) -> NDArray[np.uint8]:
+		height, width = shape[:2]
+
+		# Return 1080p template as is
+		if template.shape[0] == height and template.shape[1] == width:
+			return template
+
+		# Keep source template in the cache so that its id is never reused
+		key = (id(template), height, width)
+		level = self.__levels.get(key)
+		if level is None:
+			resized = cv.resize(template, (width, height), interpolation=cv.INTER_AREA)
+			_, binary = cv.threshold(resized, 127, 255, cv.THRESH_BINARY)
+			level = (template, binary)
+			self.__levels[key] = level
+
+		return level[1]
+
+	def clear(self) -> None:
+		self.__levels.clear()
+
+templatePyramid = TemplatePyramid()
+
+def fitTemplate(template: NDArray[np.uint8], shape: tuple[int, ...]) -> NDArray[np.uint8]:
+	return templatePyramid.fit(template, shape)
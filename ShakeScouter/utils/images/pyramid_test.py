@@ -0,0 +1,50 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import cv2 as cv
+import numpy as np
+
+from parameterized import parameterized
+from unittest import TestCase
+
+from ShakeScouter.constants import screen
+from ShakeScouter.utils.images import errorMAE, Frame, TemplatePyramid
+
+RESOLUTIONS = [
+	(1280, 720),
+	(960, 540),
+	(640, 360),
+]
+
+def createImage(text: str) -> np.ndarray:
+	image = np.zeros((1080, 1920, 3), dtype=np.uint8)
+	cv.putText(image, text, (760, 590), cv.FONT_HERSHEY_SIMPLEX, 1.8, (255, 255, 255), 5)
+	return image
+
+class TestTemplatePyramid(TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.__template = Frame(raw=createImage('START')).apply(screen.MESSAGE_PART)
+
+	def test_fitSameShape(self):
+		pyramid = TemplatePyramid()
+		self.assertIs(pyramid.fit(self.__template, self.__template.shape), self.__template)
+		self.assertEqual(len(pyramid), 0)
+
+	def test_fitCache(self):
+		pyramid = TemplatePyramid()
+		a = pyramid.fit(self.__template, (37, 280))
+		b = pyramid.fit(self.__template, (37, 280))
+		self.assertIs(a, b)
+		self.assertEqual(a.shape, (37, 280))
+		self.assertEqual(len(pyramid), 1)
+
+	@parameterized.expand(RESOLUTIONS)
+	def test_errorMAE(self, width: int, height: int):
+		match = cv.resize(createImage('START'), (width, height), interpolation=cv.INTER_AREA)
+		matchImage = Frame(raw=match).apply(screen.MESSAGE_PART)
+		self.assertLessEqual(errorMAE(matchImage, self.__template), 0.1)
+
+		other = cv.resize(createImage('WAIT...'), (width, height), interpolation=cv.INTER_AREA)
+		otherImage = Frame(raw=other).apply(screen.MESSAGE_PART)
+		self.assertGreater(errorMAE(otherImage, self.__template), 0.1)
@@ -0,0 +1,110 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import cv2 as cv
+import numpy as np
+
+from numpy.typing import NDArray
+from typing import Optional
+
+from ShakeScouter.utils.images.frame import calcPixelRect, Frame
+from ShakeScouter.utils.images.model import PartInfo
+
+PixelRect = tuple[int, int, int, int]
+
+def mergeRects(rects: list[PixelRect], margin: int = 0) -> list[PixelRect]:
+	merged = sorted(rects)
+
+	changed = True
+	while changed:
+		changed = False
+		result: list[PixelRect] = []
+		for rect in merged:
+			for i, other in enumerate(result):
+				# Merge overlapping (or nearly touching) rectangles
+				if rect[0] <= other[2] + margin and other[0] <= rect[2] + margin \
+					and rect[1] <= other[3] + margin and other[1] <= rect[3] + margin:
+					result[i] = (
+						min(rect[0], other[0]),
+						min(rect[1], other[1]),
+						max(rect[2], other[2]),
+						max(rect[3], other[3]),
+					)
+					changed = True
+					break
+			else:
+				result.append(rect)
+		merged = result
+
+	return merged
+
+class SparseFrame(Frame):
+	def __init__(self, width: int, height: int, tiles: list[tuple[PixelRect, NDArray[np.uint8]]]) -> None:
+		self.__width  = width
+		self.__height = height
+		self.__tiles  = tiles
+		self.__canvas: Optional[NDArray[np.uint8]] = None
+
+	@property
+	def native(self) -> NDArray[np.uint8]:
+		# Compose a full-size image lazily (debug use only)
+		if self.__canvas is None:
+			shape = (self.__height, self.__width) + self.__tiles[0][1].shape[2:]
+			canvas = np.zeros(shape, dtype=np.uint8)
+			for (left, top, right, bottom), tile in self.__tiles:
+				canvas[top:bottom, left:right] = tile
+			self.__canvas = canvas
+		return self.__canvas
+
+	def update(self, raw: NDArray[np.uint8]):
+		raise TypeError('SparseFrame cannot be updated')
+
+	def _size(self) -> tuple[int, int]:
+		return self.__width, self.__height
+
+	def _slice(self, left: int, top: int, right: int, bottom: int, luma: bool) -> NDArray[np.uint8]:
+		for (tileLeft, tileTop, tileRight, tileBottom), tile in self.__tiles:
+			if tileLeft <= left and tileTop <= top and right <= tileRight and bottom <= tileBottom:
+				return tile[top - tileTop:bottom - tileTop, left - tileLeft:right - tileLeft]
+
+		raise ValueError(f'Area is not captured: {(left, top, right, bottom)}')
+
+class FrameCropper:
+	def __init__(
+		self,
+		parts: list[PartInfo],
+		width: int,
+		height: int,
+		code: Optional[int] = None,
+	) -> None:
+		rects = [calcPixelRect(p['area'], width, height) for p in parts]
+		self.__width  = width
+		self.__height = height
+		self.__rects  = mergeRects(rects)
+		self.__code   = code
+
+	@property
+	def rects(self) -> list[PixelRect]:
+		return self.__rects
+
+	@property
+	def area(self) -> int:
+		return sum((r[2] - r[0]) * (r[3] - r[1]) for r in self.__rects)
+
+	def crop(self, image: NDArray[np.uint8]) -> SparseFrame:
+		height, width = image.shape[:2]
+		if width != self.__width or height != self.__height:
+			raise ValueError(f'Image size is not matched: {width}x{height}')
+
+		tiles: list[tuple[PixelRect, NDArray[np.uint8]]] = []
+		for rect in self.__rects:
+			left, top, right, bottom = rect
+
+			# Copy the tile so that the decode buffer can be reused
+			if self.__code is None:
+				tile = image[top:bottom, left:right].copy()
+			else:
+				tile = cv.cvtColor(image[top:bottom, left:right], self.__code)
+			tiles.append((rect, tile))
+
+		return SparseFrame(width, height, tiles)
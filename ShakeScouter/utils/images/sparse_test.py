@@ -0,0 +1,49 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import numpy as np
+
+from parameterized import parameterized
+from unittest import TestCase
+
+from ShakeScouter.constants import screen
+from ShakeScouter.utils.images import Frame, FrameCropper
+from ShakeScouter.utils.images.sparse import mergeRects
+
+class TestSparseFrame(TestCase):
+	@classmethod
+	def setUpClass(cls):
+		rng = np.random.default_rng(0)
+		cls.__image   = rng.integers(0, 256, (1080, 1920, 3), dtype=np.uint8)
+		cls.__cropper = FrameCropper(screen.ALL_PARTS, 1920, 1080)
+
+	def test_mergeRects(self):
+		rects = mergeRects([
+			(0, 0, 10, 10),
+			(20, 20, 30, 30),
+			(5, 5, 25, 25),
+			(100, 100, 110, 110),
+		])
+		self.assertEqual(rects, [(0, 0, 30, 30), (100, 100, 110, 110)])
+
+	def test_area(self):
+		self.assertLess(self.__cropper.area, 1920 * 1080 // 4)
+
+	@parameterized.expand([[i] for i in range(len(screen.ALL_PARTS))])
+	def test_apply(self, index: int):
+		part = screen.ALL_PARTS[index]
+		expected = Frame(raw=self.__image).apply(part)
+		actual   = self.__cropper.crop(self.__image).apply(part)
+		np.testing.assert_array_equal(actual, expected)
+
+	@parameterized.expand([[i] for i in range(len(screen.ALL_PARTS))])
+	def test_subimage(self, index: int):
+		area = screen.ALL_PARTS[index]['area']
+		expected = Frame(raw=self.__image).subimage(area).native
+		actual   = self.__cropper.crop(self.__image).subimage(area).native
+		np.testing.assert_array_equal(actual, expected)
+
+	def test_notCaptured(self):
+		frame = self.__cropper.crop(self.__image)
+		with self.assertRaises(ValueError):
+			frame.subimage({'left': 0.45, 'top': 0.6, 'right': 0.55, 'bottom': 0.7})
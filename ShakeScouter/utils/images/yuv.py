@@ -0,0 +1,171 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import cv2 as cv
+import numpy as np
+
+from enum import Enum
+from math import ceil, floor
+from numpy.typing import NDArray
+from time import perf_counter
+from typing import Optional
+
+from ShakeScouter.utils.images.frame import calcPixelRect, Frame
+from ShakeScouter.utils.images.model import PartInfo
+from ShakeScouter.utils.images.sparse import mergeRects, PixelRect
+
+# Expand limited range luma (16-235) to full range like BGR2GRAY after YUV2BGR
+LIMITED_TO_FULL = np.clip(np.round((np.arange(256) - 16) * 255 / 219), 0, 255).astype(np.uint8)
+
+class YUVFormat(Enum):
+	YUYV = 'yuyv'
+	NV12 = 'nv12'
+
+	@property
+	def fourcc(self) -> int:
+		match self:
+			case YUVFormat.YUYV:
+				return cv.VideoWriter.fourcc(*'YUYV')
+			case YUVFormat.NV12:
+				return cv.VideoWriter.fourcc(*'NV12')
+
+	@property
+	def code(self) -> int:
+		match self:
+			case YUVFormat.YUYV:
+				return cv.COLOR_YUV2BGR_YUY2
+			case YUVFormat.NV12:
+				return cv.COLOR_YUV2BGR_NV12
+
+	def shape(self, width: int, height: int) -> tuple[int, ...]:
+		match self:
+			case YUVFormat.YUYV:
+				return height, width, 2
+			case YUVFormat.NV12:
+				return height * 3 // 2, width
+
+class YUVFrame(Frame):
+	def __init__(
+		self,
+		width: int,
+		height: int,
+		format: YUVFormat,
+		tiles: list[tuple[PixelRect, NDArray[np.uint8]]],
+	) -> None:
+		self.__width   = width
+		self.__height  = height
+		self.__format  = format
+		self.__tiles   = tiles
+		self.__bgr:  list[Optional[NDArray[np.uint8]]] = [None] * len(tiles)
+		self.__luma: list[Optional[NDArray[np.uint8]]] = [None] * len(tiles)
+		self.__canvas: Optional[NDArray[np.uint8]] = None
+		self.__elapsed = 0.0
+
+	@property
+	def elapsed(self) -> float:
+		return self.__elapsed
+
+	@property
+	def native(self) -> NDArray[np.uint8]:
+		# Compose a full-size BGR image lazily (debug use only)
+		if self.__canvas is None:
+			canvas = np.zeros((self.__height, self.__width, 3), dtype=np.uint8)
+			for i, ((left, top, right, bottom), _) in enumerate(self.__tiles):
+				canvas[top:bottom, left:right] = self.__getBGR(i)
+			self.__canvas = canvas
+		return self.__canvas
+
+	def update(self, raw: NDArray[np.uint8]):
+		raise TypeError('YUVFrame cannot be updated')
+
+	def _size(self) -> tuple[int, int]:
+		return self.__width, self.__height
+
+	def _slice(self, left: int, top: int, right: int, bottom: int, luma: bool) -> NDArray[np.uint8]:
+		for i, ((tileLeft, tileTop, tileRight, tileBottom), _) in enumerate(self.__tiles):
+			if tileLeft <= left and tileTop <= top and right <= tileRight and bottom <= tileBottom:
+				image = self.__getLuma(i) if luma else self.__getBGR(i)
+				return image[top - tileTop:bottom - tileTop, left - tileLeft:right - tileLeft]
+
+		raise ValueError(f'Area is not captured: {(left, top, right, bottom)}')
+
+	def __getLuma(self, index: int) -> NDArray[np.uint8]:
+		luma = self.__luma[index]
+		if luma is None:
+			(_, top, _, bottom), tile = self.__tiles[index]
+			match self.__format:
+				case YUVFormat.YUYV:
+					y = tile[:, :, 0]
+				case YUVFormat.NV12:
+					y = tile[:bottom - top]
+			luma = cv.LUT(y, LIMITED_TO_FULL)
+			self.__luma[index] = luma
+		return luma
+
+	def __getBGR(self, index: int) -> NDArray[np.uint8]:
+		bgr = self.__bgr[index]
+		if bgr is None:
+			start = perf_counter()
+			bgr = cv.cvtColor(self.__tiles[index][1], self.__format.code)
+			self.__elapsed += perf_counter() - start
+			self.__bgr[index] = bgr
+		return bgr
+
+class YUVCropper:
+	def __init__(
+		self,
+		parts: Optional[list[PartInfo]],
+		width: int,
+		height: int,
+		format: YUVFormat,
+	) -> None:
+		if parts is None:
+			rects = [(0, 0, width, height)]
+		else:
+			rects = mergeRects([
+				YUVCropper.__alignRect(calcPixelRect(p['area'], width, height))
+				for p in parts
+			])
+		self.__width  = width
+		self.__height = height
+		self.__format = format
+		self.__rects  = rects
+
+	@property
+	def rects(self) -> list[PixelRect]:
+		return self.__rects
+
+	def crop(self, raw: NDArray[np.uint8]) -> YUVFrame:
+		image = raw.reshape(self.__format.shape(self.__width, self.__height))
+
+		tiles: list[tuple[PixelRect, NDArray[np.uint8]]] = []
+		for rect in self.__rects:
+			left, top, right, bottom = rect
+			match self.__format:
+				case YUVFormat.YUYV:
+					tile = image[top:bottom, left:right].copy()
+				case YUVFormat.NV12:
+					uvTop = self.__height + top // 2
+					uvBottom = self.__height + bottom // 2
+					tile = np.vstack([
+						image[top:bottom, left:right],
+						image[uvTop:uvBottom, left:right],
+					])
+			tiles.append((rect, tile))
+
+		return YUVFrame(self.__width, self.__height, self.__format, tiles)
+
+	def convert(self, raw: NDArray[np.uint8]) -> NDArray[np.uint8]:
+		image = raw.reshape(self.__format.shape(self.__width, self.__height))
+		return cv.cvtColor(image, self.__format.code)
+
+	@staticmethod
+	def __alignRect(rect: PixelRect) -> PixelRect:
+		# Chroma is subsampled by 2, so align to even pixels
+		left, top, right, bottom = rect
+		return (
+			2 * floor(left / 2),
+			2 * floor(top / 2),
+			2 * ceil(right / 2),
+			2 * ceil(bottom / 2),
+		)
@@ -0,0 +1,90 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import cv2 as cv
+import numpy as np
+
+from parameterized import parameterized
+from unittest import TestCase
+
+from ShakeScouter.constants import screen
+from ShakeScouter.utils.images import Frame
+from ShakeScouter.utils.images.filters.color import Grayscale
+from ShakeScouter.utils.images.frame import isLumaOnly
+from ShakeScouter.utils.images.yuv import YUVCropper, YUVFormat
+
+WIDTH  = 1920
+HEIGHT = 1080
+
+def createRaw(format: YUVFormat, neutral: bool) -> np.ndarray:
+	rng = np.random.default_rng(0)
+	shape = format.shape(WIDTH, HEIGHT)
+	if not neutral:
+		return rng.integers(0, 256, shape, dtype=np.uint8)
+
+	# Limited range luma with neutral chroma
+	raw = np.full(shape, 128, dtype=np.uint8)
+	match format:
+		case YUVFormat.YUYV:
+			raw[:, :, 0] = rng.integers(16, 236, (HEIGHT, WIDTH), dtype=np.uint8)
+		case YUVFormat.NV12:
+			raw[:HEIGHT] = rng.integers(16, 236, (HEIGHT, WIDTH), dtype=np.uint8)
+	return raw
+
+def createColorRaw(format: YUVFormat) -> np.ndarray:
+	# Colored pixels that stay within the RGB gamut
+	rng = np.random.default_rng(1)
+	shape = format.shape(WIDTH, HEIGHT)
+	raw = rng.integers(88, 169, shape, dtype=np.uint8)
+	match format:
+		case YUVFormat.YUYV:
+			raw[:, :, 0] = rng.integers(80, 181, (HEIGHT, WIDTH), dtype=np.uint8)
+		case YUVFormat.NV12:
+			raw[:HEIGHT] = rng.integers(80, 181, (HEIGHT, WIDTH), dtype=np.uint8)
+	return raw
+
+CASES = [
+	(format.name, format, crop, index)
+	for format in YUVFormat
+	for crop in [False, True]
+	for index in range(len(screen.ALL_PARTS))
+]
+
+class TestYUVFrame(TestCase):
+	@parameterized.expand(CASES)
+	def test_apply(self, _: str, format: YUVFormat, crop: bool, index: int):
+		part = screen.ALL_PARTS[index]
+		cropper = YUVCropper(screen.ALL_PARTS if crop else None, WIDTH, HEIGHT, format)
+
+		if isLumaOnly(part['filters']):
+			raw = createRaw(format, True)
+			expected = Frame(raw=cropper.convert(raw)).subimage(part['area']).filter(part['filters'][:1])
+			actual   = cropper.crop(raw).subimage(part['area'], luma=True).native
+			self.assertLessEqual(int(cv.absdiff(actual, expected).max()), 1)
+		else:
+			raw = createRaw(format, False)
+			expected = Frame(raw=cropper.convert(raw)).apply(part)
+			actual   = cropper.crop(raw).apply(part)
+			np.testing.assert_array_equal(actual, expected)
+
+	@parameterized.expand([(format.name, format) for format in YUVFormat])
+	def test_lumaColor(self, _: str, format: YUVFormat):
+		raw = createColorRaw(format)
+		cropper = YUVCropper(screen.ALL_PARTS, WIDTH, HEIGHT, format)
+		area = screen.TIMER_PART['area']
+
+		# Luma does not depend on chroma, as BGR2GRAY uses the same weights as BT.601
+		expected = Frame(raw=cropper.convert(raw)).subimage(area).filter([Grayscale()])
+		actual   = cropper.crop(raw).subimage(area, luma=True).native
+		diff = cv.absdiff(actual, expected)
+		self.assertLessEqual(int(diff.max()), 2)
+		self.assertLess(float(diff.mean()), 0.5)
+
+	def test_convertOnlyColorTiles(self):
+		raw = createRaw(YUVFormat.YUYV, False)
+		cropper = YUVCropper(screen.ALL_PARTS, WIDTH, HEIGHT, YUVFormat.YUYV)
+		frame = cropper.crop(raw)
+		frame.apply(screen.TIMER_PART)
+		self.assertEqual(frame.elapsed, 0.0)
+		frame.apply(screen.AMOUNT_PART)
+		self.assertGreater(frame.elapsed, 0.0)
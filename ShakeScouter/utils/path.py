@@ -1,9 +1,15 @@
 # Copyright (C) 2024 mntone
 # Licensed under the GPLv3 license.
 
+from hashlib import sha256
 from os import chdir
 from os.path import dirname, realpath
+from pathlib import Path
 
 def forceCwd(file: str):
 	p = dirname(realpath(file))
 	chdir(p)
+
+def fileHash(filepath: str | Path) -> str:
+	with open(filepath, 'rb') as fh:
+		return sha256(fh.read()).hexdigest()
@@ -0,0 +1,130 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import numpy as np
+
+from collections import deque
+from dataclasses import dataclass
+from numpy.typing import NDArray
+from pathlib import Path
+from time import localtime, strftime
+from typing import Optional
+
+from ShakeScouter.utils.debug_io import debugWriter, DebugWriter
+
+@dataclass(slots=True)
+class RecorderEntry:
+	timestamp: float
+	name: str
+	shape: tuple[int, int]                # shape of the mask
+	mask: Optional[NDArray[np.uint8]]     # bit-packed filtered image
+	crop: Optional[NDArray[np.uint8]]     # unfiltered image the filters read
+
+	@property
+	def image(self) -> Optional[NDArray[np.uint8]]:
+		if self.mask is None:
+			return None
+		count = self.shape[0] * self.shape[1]
+		return np.unpackbits(self.mask, count=count).reshape(self.shape) * np.uint8(255)
+
+class FlightRecorder:
+	DEFAULT_SECONDS = 10.0
+	MAX_ENTRIES     = 1024
+	MAX_DUMPS       = 16  # newest dumps kept in the directory
+
+	def __init__(
+		self,
+		directory: Path,
+		seconds: float = DEFAULT_SECONDS,
+		maxDumps: int = MAX_DUMPS,
+		writer: DebugWriter = debugWriter,
+	) -> None:
+		self.__directory = directory
+		self.__seconds   = seconds
+		self.__maxDumps  = maxDumps
+		self.__writer    = writer
+		self.__entries: deque[RecorderEntry] = deque(maxlen=FlightRecorder.MAX_ENTRIES)
+		self.__dumped    = -np.inf
+
+	@property
+	def entries(self) -> list[RecorderEntry]:
+		return list(self.__entries)
+
+	def record(
+		self,
+		timestamp: float,
+		name: str,
+		mask: Optional[NDArray[np.uint8]] = None,
+		crop: Optional[NDArray[np.uint8]] = None,
+	) -> None:
+		# Keep binary masks as bits, 1/8 of the size
+		packed = None
+		shape = (0, 0)
+		if mask is not None:
+			packed = np.packbits(mask > 0)
+			shape = (mask.shape[0], mask.shape[1])
+		self.__entries.append(RecorderEntry(
+			timestamp,
+			name,
+			shape,
+			packed,
+			None if crop is None else crop.copy(),
+		))
+
+		# Drop entries older than the window
+		while self.__entries[0].timestamp < timestamp - self.__seconds:
+			self.__entries.popleft()
+
+	def dump(self, timestamp: float, reason: str) -> Optional[Path]:
+		# At most one dump per window, since the ring covers it
+		if timestamp < self.__dumped + self.__seconds or len(self.__entries) == 0 or self.__maxDumps <= 0:
+			return None
+
+		# Write on the debug writer thread, or drop when its queue is full
+		filepath = self.__directory / f'flight_{strftime("%Y%m%d-%H%M%S", localtime(timestamp))}_{reason}.npz'
+		if not self.__writer.submit(filepath, list(self.__entries), self.__write, 'flight'):
+			return None
+		self.__dumped = timestamp
+		return filepath
+
+	def join(self) -> None:
+		self.__writer.flush()
+
+	def __write(self, filepath: Path, entries: list[RecorderEntry]) -> None:
+		FlightRecorder.save(filepath, entries)
+
+		# Keep only the newest dumps across sessions
+		dumps = sorted(filepath.parent.glob('flight_*.npz'), key=lambda p: (p.stat().st_mtime_ns, p.name))
+		for old in dumps[:-self.__maxDumps]:
+			old.unlink(missing_ok=True)
+
+	@staticmethod
+	def save(filepath: Path, entries: list[RecorderEntry]) -> None:
+		arrays: dict[str, NDArray] = {
+			'timestamps': np.array([entry.timestamp for entry in entries]),
+			'names': np.array([entry.name for entry in entries]),
+			'shapes': np.array([entry.shape for entry in entries], dtype=np.int32).reshape(-1, 2),
+		}
+		for i, entry in enumerate(entries):
+			if entry.mask is not None:
+				arrays[f'mask_{i}'] = entry.mask
+			if entry.crop is not None:
+				arrays[f'crop_{i}'] = entry.crop
+
+		filepath.parent.mkdir(parents=True, exist_ok=True)
+		np.savez_compressed(filepath, **arrays)
+
+	@staticmethod
+	def load(filepath: Path) -> list[RecorderEntry]:
+		with np.load(filepath) as npz:
+			entries = [
+				RecorderEntry(
+					float(timestamp),
+					str(name),
+					(int(shape[0]), int(shape[1])),
+					npz[f'mask_{i}'] if f'mask_{i}' in npz else None,
+					npz[f'crop_{i}'] if f'crop_{i}' in npz else None,
+				)
+				for i, (timestamp, name, shape) in enumerate(zip(npz['timestamps'], npz['names'], npz['shapes']))
+			]
+		return entries
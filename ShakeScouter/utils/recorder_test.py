@@ -0,0 +1,100 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import numpy as np
+
+from os import utime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Event
+from unittest import TestCase
+
+from ShakeScouter.utils.debug_io import DebugWriter
+from ShakeScouter.utils.recorder import FlightRecorder
+
+class TestFlightRecorder(TestCase):
+	def setUp(self):
+		self.__directory = TemporaryDirectory()
+		self.__path = Path(self.__directory.name)
+
+	def tearDown(self):
+		self.__directory.cleanup()
+
+	def test_window(self):
+		recorder = FlightRecorder(self.__path, seconds=2.0)
+		for i in range(10):
+			recorder.record(i * 0.5, 'timer', np.zeros((4, 8), dtype=np.uint8))
+
+		# 2 seconds of entries at 2 fps
+		self.assertEqual([entry.timestamp for entry in recorder.entries], [2.5, 3.0, 3.5, 4.0, 4.5])
+
+	def test_dump(self):
+		rng = np.random.default_rng(0)
+		mask = np.where(rng.random((45, 123)) < 0.5, 255, 0).astype(np.uint8)
+		crop = rng.integers(0, 255, (45, 123, 3), dtype=np.uint8)
+
+		recorder = FlightRecorder(self.__path)
+		recorder.record(1.0, 'timer', mask, crop)
+		recorder.record(1.0, 'amount', mask)
+		self.assertEqual(recorder.entries[0].mask.nbytes, (45 * 123 + 7) // 8)
+
+		filepath = recorder.dump(1.0, 'timer_none')
+		recorder.join()
+		assert filepath is not None
+		self.assertTrue(filepath.name.endswith('_timer_none.npz'))
+
+		entries = FlightRecorder.load(filepath)
+		self.assertEqual([entry.name for entry in entries], ['timer', 'amount'])
+		np.testing.assert_array_equal(entries[0].image, mask)
+		np.testing.assert_array_equal(entries[0].crop, crop)
+		self.assertIsNone(entries[1].crop)
+
+	def test_rotate(self):
+		recorder = FlightRecorder(self.__path, seconds=1.0, maxDumps=3)
+		stale = self.__path / 'flight_20000101-000000_anomalous.npz'
+		stale.write_bytes(b'')
+		utime(stale, ns=(0, 0))
+
+		# Only the newest dumps are kept
+		filepaths: list[Path] = []
+		for i in range(5):
+			recorder.record(3600.0 * i, 'timer', np.zeros((4, 8), dtype=np.uint8))
+			filepath = recorder.dump(3600.0 * i, 'anomalous')
+			assert filepath is not None
+			filepaths.append(filepath)
+			recorder.join()
+		self.assertEqual(sorted(self.__path.glob('flight_*.npz')), sorted(filepaths[-3:]))
+
+	def test_queueFull(self):
+		writer = DebugWriter(maxQueue=1, rates={'flight': float('inf')})
+		recorder = FlightRecorder(self.__path, seconds=1.0, writer=writer)
+		recorder.record(0.0, 'timer', np.zeros((4, 8), dtype=np.uint8))
+
+		# Block the writer thread and fill the queue
+		started = Event()
+		release = Event()
+		def block(path: Path, payload: list) -> None:
+			started.set()
+			release.wait()
+		writer.submit(self.__path / 'a', [], block, 'a')
+		started.wait()
+		writer.submit(self.__path / 'b', [], block, 'b')
+
+		# Dropped dump does not start the cooldown
+		self.assertIsNone(recorder.dump(0.0, 'anomalous'))
+		release.set()
+		writer.flush()
+		self.assertIsNotNone(recorder.dump(0.0, 'anomalous'))
+		writer.close()
+		self.assertEqual(writer.dropped, {'flight': 1})
+		self.assertEqual(len(list(self.__path.glob('flight_*.npz'))), 1)
+
+	def test_cooldown(self):
+		recorder = FlightRecorder(self.__path, seconds=5.0)
+		self.assertIsNone(recorder.dump(0.0, 'anomalous'))
+
+		recorder.record(1.0, 'timer', np.zeros((4, 8), dtype=np.uint8))
+		self.assertIsNotNone(recorder.dump(1.0, 'anomalous'))
+		self.assertIsNone(recorder.dump(5.5, 'anomalous'))
+		self.assertIsNotNone(recorder.dump(6.0, 'anomalous'))
+		recorder.join()
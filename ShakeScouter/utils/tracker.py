@@ -0,0 +1,105 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import cv2 as cv
+import numpy as np
+
+from numpy.typing import NDArray
+from typing import Optional
+
+from ShakeScouter.utils.anomaly import CounterAnomalyDetector
+
+class TimerTracker:
+	OCR_INTERVAL     = 3.0   # seconds between verifying reads
+	CORRECT_INTERVAL = 6.0   # seconds to trust the prediction after a verifying read
+	CHANGE_RATIO     = 0.02  # ratio of changed pixels when the digits change
+
+	def __init__(self, detector: CounterAnomalyDetector) -> None:
+		self.__detector = detector
+		self.reads       = 0
+		self.predictions = 0
+		self.reset()
+
+	@property
+	def predicted(self) -> bool:
+		return self.__predicted is not None
+
+	def reset(self) -> None:
+		self.__value: Optional[int] = None
+		self.__timestamp = 0.0
+		self.__mask: Optional[NDArray[np.uint8]] = None
+
+		# The current value appeared in (tickLow, tickHigh]
+		self.__tickLow  = 0.0
+		self.__tickHigh = 0.0
+		self.__verified = -np.inf
+
+		# Frame under analysis
+		self.__pendingTimestamp = 0.0
+		self.__pendingMask: Optional[NDArray[np.uint8]] = None
+		self.__predicted: Optional[int] = None
+
+	def __changed(self, mask: NDArray[np.uint8]) -> bool:
+		# Cheap check of the digits instead of OCR
+		if self.__mask is None or self.__mask.shape != mask.shape:
+			return True
+		diff = cv.countNonZero(cv.absdiff(mask, self.__mask))
+		return diff > TimerTracker.CHANGE_RATIO * mask.size
+
+	def __predict(self, timestamp: float, mask: NDArray[np.uint8], limit: float) -> Optional[int]:
+		# Predict only while counting down from a recent read
+		if self.__value is None or self.__detector.state != 'COUNTDOWN' or timestamp - self.__verified >= limit:
+			return None
+
+		# The timer ticks once a second, so the next tick is in (tickLow + 1, tickHigh + 1]
+		if self.__changed(mask):
+			if timestamp <= self.__tickLow + 1 or timestamp > self.__tickLow + 2:
+				return None
+			return self.__value - 1
+		else:
+			if timestamp > self.__tickHigh + 1:
+				return None
+			return self.__value
+
+	def observe(self, timestamp: float, mask: NDArray[np.uint8]) -> Optional[int]:
+		# Return the count if OCR can be skipped
+		self.__pendingTimestamp = timestamp
+		self.__pendingMask = mask
+		self.__predicted = self.__predict(timestamp, mask, TimerTracker.OCR_INTERVAL)
+		if self.__predicted is None:
+			self.reads += 1
+		else:
+			self.predictions += 1
+		return self.__predicted
+
+	def correct(self) -> Optional[int]:
+		# Substitute the prediction for a missing or anomalous read
+		if self.__pendingMask is None:
+			return None
+		return self.__predict(self.__pendingTimestamp, self.__pendingMask, TimerTracker.CORRECT_INTERVAL)
+
+	def accept(self, value: Optional[int], verified: bool) -> None:
+		timestamp = self.__pendingTimestamp
+		if value is None:
+			self.reset()
+			return
+
+		# Narrow down the time of the last tick
+		lastTimestamp = self.__timestamp
+		if self.__value is not None and value == self.__value:
+			self.__tickLow = max(self.__tickLow, timestamp - 1)
+		elif self.__value is not None and value == self.__value - 1:
+			self.__tickLow  = max(lastTimestamp, self.__tickLow + 1)
+			self.__tickHigh = min(timestamp, self.__tickHigh + 1)
+		else:
+			self.__tickLow  = timestamp - 1
+			self.__tickHigh = timestamp
+		if self.__tickLow >= self.__tickHigh:
+			self.__tickLow  = max(lastTimestamp, timestamp - 1)
+			self.__tickHigh = timestamp
+
+		self.__value     = value
+		self.__timestamp = timestamp
+		self.__mask      = self.__pendingMask
+		if verified:
+			self.__verified = timestamp
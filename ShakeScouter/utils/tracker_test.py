@@ -0,0 +1,105 @@
+# Copyright (C) 2024 mntone
+# Licensed under the GPLv3 license.
+
+import numpy as np
+
+from math import floor
+from parameterized import parameterized
+from typing import Callable, Optional
+from unittest import TestCase
+
+from ShakeScouter.utils.anomaly import CounterAnomalyDetector
+from ShakeScouter.utils.tracker import TimerTracker
+
+# Distinct digit images for each count
+RNG = np.random.default_rng(0)
+MASKS = [np.where(RNG.random((60, 120)) < 0.5, 255, 0).astype(np.uint8) for _ in range(101)]
+
+def timer(phase: float, timestamp: float) -> int:
+	# Timer ticks once a second
+	return max(0, 99 - floor(timestamp + phase))
+
+def step(
+	detector: CounterAnomalyDetector,
+	tracker: TimerTracker,
+	timestamp: float,
+	mask: np.ndarray,
+	read: Callable[[], Optional[int]],
+) -> Optional[int]:
+	# Same flow as WaveScene
+	count = tracker.observe(timestamp, mask)
+	if count is None:
+		count = read()
+	if count is not None and not detector.isAnomalous(count, timestamp):
+		tracker.accept(count, not tracker.predicted)
+		return count
+
+	predicted = tracker.correct()
+	if predicted is not None and not detector.isAnomalous(predicted, timestamp):
+		tracker.accept(predicted, False)
+		return predicted
+
+	tracker.accept(None, False)
+	return count
+
+class TestTimerTracker(TestCase):
+	@parameterized.expand([
+		('2fps', 0.5, 0.13),
+		('1fps', 1.0, 0.71),
+		('jitter', 0.5, 0.99),
+	])
+	def test_countdown(self, _: str, interval: float, phase: float):
+		detector = CounterAnomalyDetector()
+		tracker  = TimerTracker(detector)
+		rng = np.random.default_rng(1)
+
+		timestamp = 0.0
+		while timer(phase, timestamp) > 0:
+			expected = timer(phase, timestamp)
+			count = step(detector, tracker, timestamp, MASKS[expected], lambda: expected)
+			self.assertEqual(count, expected, f'at {timestamp}')
+
+			timestamp += interval
+			if _ == 'jitter':
+				timestamp += rng.uniform(-0.05, 0.05)
+
+		# Only verifying reads every few seconds
+		self.assertLess(tracker.reads, 0.5 * (tracker.reads + tracker.predictions))
+
+	def test_correct(self):
+		detector = CounterAnomalyDetector()
+		tracker  = TimerTracker(detector)
+
+		# Misreads of the verifying reads are replaced by the prediction
+		misreads = {1: 77, 3: None, 5: 11}
+		reads: list[int] = []
+		def read() -> Optional[int]:
+			reads.append(expected)
+			return misreads.get(len(reads) - 1, expected)
+
+		for i in range(40):
+			timestamp = 0.5 * i
+			expected = timer(0.25, timestamp)
+			count = step(detector, tracker, timestamp, MASKS[expected], read)
+			self.assertEqual(count, expected, f'at {timestamp}')
+		self.assertGreater(len(reads), 6)
+
+	def test_unexpectedChange(self):
+		detector = CounterAnomalyDetector()
+		tracker  = TimerTracker(detector)
+		step(detector, tracker, 0.0, MASKS[91], lambda: 91)
+		step(detector, tracker, 0.5, MASKS[90], lambda: 90)
+		self.assertEqual(tracker.observe(0.9, MASKS[90]), 90)
+
+		# The digits change before the next tick is due
+		self.assertIsNone(tracker.observe(0.9, MASKS[89]))
+
+	def test_idle(self):
+		detector = CounterAnomalyDetector()
+		tracker  = TimerTracker(detector)
+
+		# Read every frame between waves
+		for i in range(6):
+			self.assertIsNone(tracker.observe(0.5 * i, MASKS[100]))
+			tracker.accept(100, True)
+		self.assertEqual(tracker.reads, 6)